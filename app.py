@@ -1,4 +1,6 @@
-from gudlift_reservation import app
+from gudlift_reservation import create_app
+
+app = create_app()
 
 if __name__ == "__main__":
     app.run(debug=True)
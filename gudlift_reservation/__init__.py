@@ -1 +1 @@
-from .server import app
+from .server import create_app, warm_up
@@ -0,0 +1,148 @@
+import gzip
+import json
+
+from flask import Blueprint, Response, abort, current_app, jsonify, request
+
+from . import metrics
+
+api = Blueprint("api", __name__, url_prefix="/api")
+
+
+def load_repository():
+    """
+    Retourne le dépôt de données de l'application courante, rechargé si nécessaire.
+    """
+    repository = current_app.extensions["gudlft"]["repository"]
+    with metrics.timed("load_data"):
+        repository.refresh()
+    return repository
+
+
+def pagination():
+    """
+    Retourne la page et le nombre d'éléments par page demandés (paramètres page et per_page).
+    """
+    try:
+        page = int(request.args.get("page", 1))
+        per_page = int(request.args.get("per_page", current_app.config["API_PAGE_SIZE"]))
+    except ValueError:
+        abort(400, "page and per_page must be integers")
+    if page < 1 or not 1 <= per_page <= current_app.config["API_MAX_PAGE_SIZE"]:
+        abort(400, f"page must be >= 1 and per_page between 1 and {current_app.config['API_MAX_PAGE_SIZE']}")
+    return page, per_page
+
+
+def paginate(items, key, page, per_page):
+    """
+    Retourne une page d'une liste d'éléments avec sa pagination.
+    """
+    start = (page - 1) * per_page
+    return {
+        key: items[start : start + per_page],
+        "page": page,
+        "per_page": per_page,
+        "total": len(items),
+        "pages": (len(items) + per_page - 1) // per_page,
+    }
+
+
+def conditional_json(etag, build):
+    """
+    Retourne la réponse JSON de build() avec son ETag, ou 304 Not Modified si le client a déjà cette version :
+    les données ne sont alors ni sérialisées ni compressées.
+    Une réponse d'au moins API_GZIP_MIN_SIZE octets est compressée si le client accepte gzip,
+    avec son propre ETag (suffixe -gzip).
+    """
+    compress = "gzip" in request.accept_encodings
+    variants = (f"{etag}-gzip", etag) if compress else (etag,)
+    matched = next((variant for variant in variants if request.if_none_match.contains(variant)), None)
+    if matched is not None:
+        response = Response(status=304)
+        response.set_etag(matched)
+    else:
+        body = json.dumps(build(), ensure_ascii=False).encode()
+        response = Response(body, mimetype="application/json")
+        if compress and len(body) >= current_app.config["API_GZIP_MIN_SIZE"]:
+            response.set_data(gzip.compress(body, compresslevel=6))
+            response.content_encoding = "gzip"
+            etag = f"{etag}-gzip"
+        response.set_etag(etag)
+    response.vary.add("Accept-Encoding")
+    response.cache_control.no_cache = True
+    return response
+
+
+def competition_json(competition, repository):
+    """
+    Retourne les données publiques d'une compétition : places disponibles et réservations par club.
+    """
+    return {
+        "name": competition["name"],
+        "date": competition["date"],
+        "numberOfPlaces": competition["numberOfPlaces"],
+        "past": repository.is_past(competition),
+        "reserved_places": [dict(entry) for entry in competition["reserved_places"]],
+    }
+
+
+@api.errorhandler(400)
+@api.errorhandler(404)
+def json_error(error):
+    """
+    Retourne les erreurs de l'API au format JSON.
+    """
+    return jsonify(error=error.description), error.code
+
+
+@api.route("/competitions")
+def competitions():
+    """
+    Liste paginée des compétitions à venir triées par date, ou de toutes les compétitions avec show_past.
+    """
+    page, per_page = pagination()
+    repository = load_repository()
+    show_past = bool(request.args.get("show_past"))
+    upcoming = repository.upcoming_competitions()
+    listed = repository.competitions if show_past else upcoming
+
+    # le nombre de compétitions à venir change lorsqu'une compétition devient passée :
+    # la liste à venir et le champ "past" de toutes les compétitions changent avec lui
+    etag = f"{repository.instance_id}-{repository.competitions_version}-{len(upcoming)}-{int(show_past)}"
+
+    def build():
+        data = paginate(listed, "competitions", page, per_page)
+        data["competitions"] = [competition_json(competition, repository) for competition in data["competitions"]]
+        return data
+
+    return conditional_json(etag, build)
+
+
+@api.route("/competitions/<name>")
+def competition(name):
+    """
+    Détail d'une compétition.
+    """
+    repository = load_repository()
+    found = repository.competitions_by_name.get(name)
+    if found is None:
+        abort(404, f"Competition {name} not found")
+
+    etag = f"{repository.instance_id}-{repository.competition_versions[name]}-{int(repository.is_past(found))}"
+    return conditional_json(etag, lambda: competition_json(found, repository))
+
+
+@api.route("/clubs")
+def clubs():
+    """
+    Tableau paginé des points des clubs.
+    """
+    page, per_page = pagination()
+    repository = load_repository()
+    etag = f"{repository.instance_id}-{repository.clubs_version}"
+
+    def build():
+        data = paginate(repository.clubs, "clubs", page, per_page)
+        data["clubs"] = [{"name": club["name"], "points": club["points"]} for club in data["clubs"]]
+        return data
+
+    return conditional_json(etag, build)
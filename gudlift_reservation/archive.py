@@ -0,0 +1,153 @@
+import gzip
+import json
+import logging
+import os
+import tempfile
+import threading
+
+from .json_handler import get_data_path
+from .models import to_json
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_DIR = "archive"
+ARCHIVE_PREFIX = "competitions-"
+ARCHIVE_SUFFIX = ".json.gz"
+
+
+def archive_partition(competition):
+    """
+    Retourne la partition d'archive d'une compétition : l'année de sa date.
+    """
+    return competition["date"][:4]
+
+
+class CompetitionArchive:
+    """
+    Archive froide des compétitions passées.
+
+    Les compétitions et leurs places réservées sont enregistrées dans des fichiers JSON compressés,
+    un fichier par année (competitions-2020.json.gz), au même format que competitions.json.
+    L'archive est en lecture seule pour l'application : seules les compétitions passées y sont ajoutées.
+    Le contenu d'un fichier lu est gardé en mémoire tant que le fichier ne change pas.
+    """
+
+    def __init__(self, archive_dir=None):
+        self.archive_dir = archive_dir or get_data_path(ARCHIVE_DIR)
+        self._lock = threading.Lock()
+        self._cache = {}
+
+    def path(self, partition):
+        """
+        Retourne le chemin du fichier d'une partition.
+        """
+        return os.path.join(self.archive_dir, f"{ARCHIVE_PREFIX}{partition}{ARCHIVE_SUFFIX}")
+
+    def partitions(self):
+        """
+        Retourne les partitions archivées, de la plus récente à la plus ancienne.
+        """
+        if not os.path.isdir(self.archive_dir):
+            return []
+        return sorted(
+            (
+                file_name[len(ARCHIVE_PREFIX) : -len(ARCHIVE_SUFFIX)]
+                for file_name in os.listdir(self.archive_dir)
+                if file_name.startswith(ARCHIVE_PREFIX) and file_name.endswith(ARCHIVE_SUFFIX)
+            ),
+            reverse=True,
+        )
+
+    def load(self, partition):
+        """
+        Retourne les compétitions archivées d'une partition, triées par date.
+        """
+        path = self.path(partition)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return []
+
+        signature = stat.st_ino, stat.st_mtime_ns, stat.st_size
+        with self._lock:
+            cached = self._cache.get(partition)
+            if cached is not None and cached[0] == signature:
+                return cached[1]
+
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            competitions = json.load(f)["competitions"]
+        with self._lock:
+            self._cache[partition] = signature, competitions
+        return competitions
+
+    def _write_partition(self, partition, competitions):
+        """
+        Écrit de manière atomique le fichier compressé d'une partition.
+        """
+        os.makedirs(self.archive_dir, exist_ok=True)
+        path = self.path(partition)
+        content = json.dumps({"competitions": competitions}, default=to_json).encode("utf-8")
+        fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=self.archive_dir)
+        try:
+            os.chmod(tmp_path, 0o644)
+            with os.fdopen(fd, "wb") as f:
+                with gzip.GzipFile(fileobj=f, mode="wb") as gz:
+                    gz.write(content)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def add(self, competitions):
+        """
+        Ajoute des compétitions à leurs partitions.
+        Une compétition déjà archivée (même nom dans la partition) est remplacée :
+        une archive interrompue peut être relancée sans doublon.
+
+        Renvoie les partitions modifiées.
+        """
+        by_partition = {}
+        for competition in competitions:
+            by_partition.setdefault(archive_partition(competition), []).append(competition)
+
+        for partition, added in by_partition.items():
+            names = {competition["name"] for competition in added}
+            archived = [competition for competition in self.load(partition) if competition["name"] not in names]
+            self._write_partition(partition, sorted(archived + added, key=lambda competition: competition["date"]))
+        return sorted(by_partition)
+
+
+class ArchiveScheduler:
+    """
+    Archivage périodique des compétitions passées par un thread en arrière-plan.
+    """
+
+    def __init__(self, repository, archive, interval_seconds):
+        self.repository = repository
+        self.archive = archive
+        self.interval = interval_seconds
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="competition-archiver", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _run(self):
+        """
+        Boucle du thread d'archivage.
+        """
+        while not self._stopped.wait(self.interval):
+            try:
+                archived = self.repository.archive_past(self.archive)
+            except Exception:
+                logger.exception("Competition archiving failed")
+                continue
+            if archived:
+                logger.info("%d competition(s) archived", len(archived))
+
+    def stop(self):
+        self._stopped.set()
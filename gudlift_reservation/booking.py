@@ -0,0 +1,194 @@
+from flask import abort
+
+from .metrics import timed
+from .utils import reserv_places_competition, valid_club_and_competition, valid_form_purchase_places
+
+
+class BookingService:
+    """
+    Service de réservation de places.
+
+    La vérification et la réservation sont exécutées de manière atomique sous le verrou exclusif
+    du stockage : deux réservations concurrentes ne peuvent pas dépasser les places disponibles
+    ni perdre une déduction de points. Entre plusieurs processus, ce verrou inter-processus protège
+    le cycle lecture-modification-écriture et les données sont rechargées si un autre processus
+    les a modifiées. Le verrou couvre le rechargement, la validation et l'écriture : les réservations
+    sont donc exécutées l'une après l'autre, y compris dans des compétitions sans club en commun
+    (l'écriture, qui domine la durée d'une réservation, est de toute façon unique : fichiers JSON
+    réécrits ou ajoutés au journal, transaction d'écriture SQLite). Si l'enregistrement d'une réservation
+    échoue, le dépôt l'annule en mémoire (commit_bookings) : une réservation suivante ne l'enregistre pas.
+
+    Avec un cache d'idempotence, le résultat d'une réservation accompagnée d'une clé d'idempotence
+    est enregistré sous le même verrou : la même requête rejouée retrouve ce résultat
+    sans nouvelle validation ni écriture.
+    """
+
+    def __init__(self, repository, idempotency=None):
+        self.repository = repository
+        self.idempotency = idempotency
+
+    def purchase_places(self, form, idempotency_key=None):
+        """
+        Valide le formulaire de réservation puis réserve les places, déduit les points du club
+        et les places de la compétition, et enregistre les données.
+        Avec une clé d'idempotence déjà utilisée pour la même réservation, le résultat enregistré
+        est renvoyé ; pour une autre réservation, la réservation est refusée.
+
+        Renvoie True ou False et le dict de validation de valid_form_purchase_places.
+        """
+        with self.repository.storage.lock():
+            self.repository.refresh()
+
+            if idempotency_key and self.idempotency is not None:
+                request = [form["club"], form["competition"], str(form["places"])]
+                stored = self.idempotency.get(idempotency_key)
+                if stored is not None:
+                    return self._replay(stored, request, form)
+
+            booked, data = self._purchase_places(form)
+
+            if idempotency_key and self.idempotency is not None:
+                self.idempotency.put(
+                    idempotency_key,
+                    {
+                        "request": request,
+                        "booked": booked,
+                        "places_required": data["places_required"],
+                        "error_message": data["error_message"],
+                        "error_type": data["error_type"],
+                    },
+                )
+        return booked, data
+
+    def _replay(self, stored, request, form):
+        """
+        Renvoie le résultat enregistré d'une réservation idempotente, avec le club et la compétition actuels.
+        Si la compétition a été archivée depuis, le club et la compétition de la requête sont validés
+        comme pour une nouvelle requête (400 si la compétition est inconnue) : rien n'est réservé à nouveau.
+        """
+        club_name, competition_name, _ = stored["request"]
+        club = self.repository.clubs_by_name.get(club_name)
+        competition = self.repository.competitions_by_name.get(competition_name)
+        if club is None or competition is None:
+            club, competition = valid_club_and_competition(
+                form["club"], self.repository.clubs_by_name, form["competition"], self.repository.competitions_by_name
+            )
+        data = {
+            "club": club,
+            "competition": competition,
+            "places_required": stored["places_required"],
+            "error_message": stored["error_message"],
+            "error_type": stored["error_type"],
+        }
+        if stored["request"] != request:
+            data["error_message"] = "Idempotency key already used for another booking"
+            return False, data
+        return stored["booked"], data
+
+    def _purchase_places(self, form):
+        """
+        Valide et réserve les places d'un formulaire de réservation.
+        Doit être appelée sous le verrou exclusif du stockage.
+        """
+        # validation du formulaire de reservation
+        with timed("validation"):
+            valid_form, data = valid_form_purchase_places(
+                self.repository.clubs_by_name,
+                self.repository.competitions_by_name,
+                form,
+                self.repository.competition_dates,
+            )
+        if not valid_form:
+            return False, data
+
+        club = data["club"]
+        competition = data["competition"]
+        places_required = data["places_required"]
+
+        # validation de la reservation des places dans une competition
+        if not reserv_places_competition(club, competition, places_required, self.repository.ledger):
+            data["error_message"] = "use no more than 12 places per competition"
+            return False, data
+
+        competition["numberOfPlaces"] -= places_required
+        club["points"] -= places_required
+        self.repository.commit_booking(club, competition, places_required)
+        return True, data
+
+    def purchase_batch(self, club_name, items):
+        """
+        Réserve des places dans plusieurs compétitions pour un club, de manière atomique :
+        toutes les réservations sont appliquées et enregistrées en une seule écriture, ou aucune.
+
+        items est une liste de dict (competition, places) d'une requête JSON : competition doit être
+        une chaîne et places un entier (pas un booléen ni un nombre décimal). Chaque réservation
+        est validée par les règles de purchase_places (valid_form_purchase_places et reserv_places_competition)
+        en tenant compte
+        des réservations précédentes du lot : points du club, places des compétitions et quota de 12 places.
+
+        Renvoie True ou False et le résultat de chaque réservation (competition, places, booked, error_message).
+        """
+        competition_names = [item.get("competition") for item in items]
+        with self.repository.storage.lock():
+            self.repository.refresh()
+            competitions = self.repository.competitions_by_name
+            club = self.repository.clubs_by_name.get(club_name)
+            if club is None:
+                abort(400, "Invalid club")
+
+            # validation du lot sur des copies du club et des compétitions : les données ne sont
+            # modifiées que si toutes les réservations sont valides
+            pending_club = dict(club)
+            pending_competitions = {}
+            results = []
+            bookings = []
+            with timed("validation"):
+                for name, item in zip(competition_names, items):
+                    places = item.get("places")
+                    result = {"competition": name, "places": places, "booked": False, "error_message": ""}
+                    results.append(result)
+                    if not isinstance(name, str) or name not in competitions:
+                        result["error_message"] = "Invalid competition"
+                        continue
+                    # le nombre de places JSON doit être un entier : ni texte, ni booléen, ni décimal tronqué
+                    if not isinstance(places, int) or isinstance(places, bool):
+                        result["error_message"] = "Invalid number"
+                        continue
+
+                    competition = competitions[name]
+                    if name not in pending_competitions:
+                        pending_competitions[name] = dict(
+                            competition, reserved_places=[dict(entry) for entry in competition["reserved_places"]]
+                        )
+                    pending = pending_competitions[name]
+                    valid_form, data = valid_form_purchase_places(
+                        {club_name: pending_club},
+                        {name: pending},
+                        {"club": club_name, "competition": name, "places": places},
+                        self.repository.competition_dates,
+                    )
+                    if valid_form and not reserv_places_competition(pending_club, pending, data["places_required"]):
+                        valid_form = False
+                        data["error_message"] = "use no more than 12 places per competition"
+                    if not valid_form:
+                        result["error_message"] = data["error_message"]
+                        continue
+
+                    places_required = data["places_required"]
+                    result["places"] = places_required
+                    pending["numberOfPlaces"] -= places_required
+                    pending_club["points"] -= places_required
+                    bookings.append((club, competition, places_required))
+
+            if not bookings or len(bookings) < len(items):
+                return False, results
+
+            for _, competition, places_required in bookings:
+                competition["numberOfPlaces"] -= places_required
+                club["points"] -= places_required
+                self.repository.ledger.record(club, competition, places_required)
+            self.repository.commit_bookings(bookings)
+
+        for result in results:
+            result["booked"] = True
+        return True, results
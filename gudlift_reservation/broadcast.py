@@ -0,0 +1,117 @@
+import itertools
+import threading
+from collections import deque
+
+from . import metrics
+
+subscribers_gauge = metrics.registry.gauge("gudlft_broadcast_subscribers", "Live availability feed subscribers.")
+dropped_events = metrics.registry.counter(
+    "gudlft_broadcast_dropped_total", "Events dropped from the queue of a slow live feed subscriber."
+)
+
+
+class Subscription:
+    """
+    File d'événements bornée d'un abonné du hub de diffusion.
+
+    Lorsque la file est pleine, l'événement le plus ancien est supprimé (abonné trop lent) :
+    la mémoire utilisée par un abonné reste bornée, et le nombre d'événements perdus est
+    signalé à l'abonné pour qu'il recharge l'état complet.
+    """
+
+    def __init__(self, max_events):
+        self._events = deque(maxlen=max_events)
+        self._condition = threading.Condition()
+        self.dropped = 0
+        self.closed = False
+
+    def put(self, event):
+        """
+        Ajoute un événement à la file, en supprimant le plus ancien si la file est pleine.
+        """
+        with self._condition:
+            if len(self._events) == self._events.maxlen:
+                self.dropped += 1
+                dropped_events.inc()
+            self._events.append(event)
+            self._condition.notify()
+
+    def get(self, timeout=None):
+        """
+        Attend des événements au plus timeout secondes puis retourne les événements en attente
+        et le nombre d'événements perdus depuis le dernier appel.
+        """
+        with self._condition:
+            if not self._events and not self.closed:
+                self._condition.wait(timeout)
+            events = list(self._events)
+            self._events.clear()
+            dropped, self.dropped = self.dropped, 0
+            return events, dropped
+
+    def close(self):
+        """
+        Ferme la file et réveille l'abonné en attente.
+        """
+        with self._condition:
+            self.closed = True
+            self._condition.notify()
+
+
+class BroadcastHub:
+    """
+    Hub de diffusion des événements du processus vers tous ses abonnés.
+
+    Chaque abonné a sa propre file bornée (max_events) : un abonné lent perd ses événements
+    les plus anciens sans ralentir la publication ni les autres abonnés.
+    Chaque événement reçoit un identifiant croissant.
+    """
+
+    def __init__(self, max_events=100):
+        self.max_events = max_events
+        self._lock = threading.Lock()
+        self._subscriptions = set()
+        self._ids = itertools.count(1)
+
+    def __len__(self):
+        return len(self._subscriptions)
+
+    def subscribe(self):
+        """
+        Crée et retourne l'abonnement d'un nouvel abonné.
+        """
+        subscription = Subscription(self.max_events)
+        with self._lock:
+            self._subscriptions.add(subscription)
+        subscribers_gauge.inc()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """
+        Supprime un abonnement.
+        """
+        with self._lock:
+            if subscription not in self._subscriptions:
+                return
+            self._subscriptions.discard(subscription)
+        subscription.close()
+        subscribers_gauge.dec()
+
+    def publish(self, data):
+        """
+        Publie un événement à tous les abonnés et retourne son identifiant.
+        """
+        with self._lock:
+            event = (next(self._ids), data)
+            for subscription in self._subscriptions:
+                subscription.put(event)
+        return event[0]
+
+    def close(self):
+        """
+        Ferme tous les abonnements : les flux en cours se terminent.
+        """
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            self.unsubscribe(subscription)
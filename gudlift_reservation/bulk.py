@@ -0,0 +1,191 @@
+import csv
+import itertools
+import json
+import os
+import re
+from datetime import datetime
+
+from .models import Club, Competition
+
+FORMATS = ("csv", "ndjson")
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# colonnes des fichiers CSV ; les réservations des compétitions ne sont importées et exportées qu'en NDJSON
+CLUB_FIELDS = ("name", "email", "points")
+COMPETITION_FIELDS = ("name", "date", "numberOfPlaces")
+
+EMAIL_PATTERN = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
+
+
+def file_format(path, format=None):
+    """
+    Retourne le format d'un fichier d'import ou d'export : celui demandé, sinon celui de son extension.
+    """
+    if format:
+        return format
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        return "csv"
+    if extension in (".ndjson", ".jsonl"):
+        return "ndjson"
+    raise ValueError(f"Unknown file format for {path}: use --format csv or ndjson")
+
+
+def read_rows(f, format):
+    """
+    Lit un fichier CSV (ligne d'en-tête) ou NDJSON (un objet JSON par ligne) ligne à ligne.
+
+    Génère le numéro de ligne et les données de chaque enregistrement ; une ligne NDJSON
+    qui n'est pas du JSON valide donne None. Les lignes vides sont ignorées.
+    """
+    if format == "csv":
+        reader = csv.DictReader(f)
+        for row in reader:
+            yield reader.line_num, row
+        return
+
+    for line_number, line in enumerate(f, 1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except ValueError:
+            yield line_number, None
+
+
+def write_rows(f, format, fields, records):
+    """
+    Écrit des enregistrements un par un dans un fichier CSV (colonnes fields) ou NDJSON.
+
+    Renvoie le nombre d'enregistrements écrits.
+    """
+    count = 0
+    if format == "csv":
+        writer = csv.DictWriter(f, fields, extrasaction="ignore", lineterminator="\n")
+        writer.writeheader()
+        for count, record in enumerate(records, 1):
+            writer.writerow(record.to_dict())
+        return count
+
+    for count, record in enumerate(records, 1):
+        f.write(json.dumps(record.to_dict(), ensure_ascii=False))
+        f.write("\n")
+    return count
+
+
+def _check_row(row):
+    """
+    Vérifie qu'une ligne lue est un objet.
+    """
+    if not isinstance(row, dict):
+        raise ValueError("Invalid row: expected an object")
+
+
+def _check_positive(record, key):
+    """
+    Vérifie qu'un champ numérique n'est pas négatif.
+    """
+    if record[key] < 0:
+        raise ValueError(f"Invalid {key}: {record[key]} is negative")
+
+
+def validate_club(row):
+    """
+    Retourne le club d'une ligne importée, ou lève ValueError si un champ est invalide.
+    """
+    _check_row(row)
+    club = Club.from_dict(row)
+    if not EMAIL_PATTERN.fullmatch(club.email):
+        raise ValueError(f"Invalid email: {club.email!r}")
+    _check_positive(club, "points")
+    return club
+
+
+def validate_competition(row):
+    """
+    Retourne la compétition d'une ligne importée, ou lève ValueError si un champ est invalide.
+    La date doit être au format "AAAA-MM-JJ HH:MM:SS" des fichiers de l'application.
+    """
+    _check_row(row)
+    competition = Competition.from_dict(row)
+    try:
+        datetime.strptime(competition.date, DATE_FORMAT)
+    except ValueError:
+        raise ValueError(f"Invalid date: {competition.date!r}") from None
+    _check_positive(competition, "numberOfPlaces")
+    for reservation in competition.reserved_places:
+        _check_positive(reservation, "reserved_places")
+    return competition
+
+
+def import_records(repository, kind, rows, chunk_size=10_000, dry_run=False, on_error=None, on_chunk=None):
+    """
+    Importe les clubs ou les compétitions (kind) de rows, des couples (numéro de ligne, données)
+    lus par read_rows.
+
+    Les lignes sont lues et validées par lots de chunk_size lignes (validate_club ou validate_competition),
+    sans verrou : les réservations continuent pendant la validation d'un gros fichier. Les clubs dont
+    le nom ou l'email existe déjà, et les compétitions dont le nom existe déjà, sont ignorés comme doublons.
+    on_error(numéro de ligne, message) est appelée pour chaque ligne invalide et on_chunk(counts)
+    après chaque lot. Les enregistrements valides sont ensuite ajoutés puis enregistrés en une seule
+    écriture sous le verrou exclusif du stockage, après une nouvelle recherche des doublons ajoutés
+    entre-temps par un autre worker. Avec dry_run, le fichier est seulement validé.
+
+    Renvoie le nombre de lignes lues, importées (à importer pendant la validation),
+    en doublon et invalides (dict counts).
+    """
+    counts = {"read": 0, "imported": 0, "duplicates": 0, "invalid": 0}
+    validate = validate_club if kind == "clubs" else validate_competition
+
+    def known(record):
+        if kind == "clubs":
+            return record.name in repository.clubs_by_name or record.email in repository.clubs_by_email
+        return record.name in repository.competitions_by_name
+
+    # noms et emails des enregistrements valides : les doublons du fichier sont aussi détectés
+    names = set()
+    emails = set()
+    records = []
+
+    rows = iter(rows)
+    repository.refresh()
+    for chunk in iter(lambda: list(itertools.islice(rows, chunk_size)), []):
+        for line_number, row in chunk:
+            counts["read"] += 1
+            try:
+                record = validate(row)
+            except (KeyError, TypeError, ValueError) as error:
+                counts["invalid"] += 1
+                if on_error:
+                    on_error(line_number, f"Missing field: {error}" if isinstance(error, KeyError) else str(error))
+                continue
+
+            if record.name in names or (kind == "clubs" and record.email in emails) or known(record):
+                counts["duplicates"] += 1
+                continue
+            names.add(record.name)
+            if kind == "clubs":
+                emails.add(record.email)
+            records.append(record)
+
+        counts["imported"] = len(records)
+        if on_chunk:
+            on_chunk(counts)
+
+    if dry_run or not records:
+        return counts
+
+    with repository.write_lock():
+        repository.flush()
+        repository.refresh()
+        added = [record for record in records if not known(record)]
+        counts["duplicates"] += len(records) - len(added)
+        counts["imported"] = len(added)
+        if kind == "clubs":
+            for club in added:
+                repository.add_club(club)
+        else:
+            repository.add_competitions(added)
+        if added:
+            repository.save_snapshot()
+    return counts
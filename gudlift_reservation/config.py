@@ -1,2 +1,83 @@
 SECRET_KEY = "something_special"
 SEND_FILE_MAX_AGE_DEFAULT = 3600
+
+# Cache du bytecode des templates Jinja : les templates compilés sont réutilisés
+# par les autres workers et après un redémarrage
+TEMPLATE_CACHE_ENABLED = True
+# dossier du cache (None : dossier template_cache du dossier des données)
+TEMPLATE_CACHE_DIR = None
+
+# Stockage des données : "json" (fichiers clubs.json et competitions.json), "sqlite"
+# ou "memory" (chargé depuis les fichiers JSON, jamais écrit sur le disque, pour les tests)
+STORAGE_BACKEND = "json"
+# dossier des données (None : dossier data du package)
+DATA_DIR = None
+# chemin de la base SQLite (None : gudlft.sqlite3 dans le dossier des données)
+SQLITE_PATH = None
+
+# Persistance des réservations du stockage JSON :
+# "snapshot" réécrit clubs.json et competitions.json à chaque réservation,
+# "journal" ajoute la réservation au journal data/bookings.journal
+PERSISTENCE_MODE = "snapshot"
+# synchronisation du journal sur le disque toutes les N réservations (group commit si N > 1)
+JOURNAL_FSYNC_EVERY = 1
+# taille du journal (octets) au-delà de laquelle il est compacté dans les fichiers JSON
+JOURNAL_COMPACT_SIZE = 1024 * 1024
+
+# Durabilité des réservations :
+# "strict" : chaque réservation est enregistrée sur le disque avant d'être acquittée,
+# "grouped" : la réservation est acquittée une fois appliquée en mémoire et écrite dans le journal,
+# un thread d'écriture la synchronise sur le disque au plus tard après GROUP_COMMIT_INTERVAL_MS
+# millisecondes ou dès que GROUP_COMMIT_MAX_BOOKINGS réservations sont en attente.
+# "grouped" exige le stockage JSON avec PERSISTENCE_MODE = "journal" : le journal rend les réservations
+# acquittées visibles des autres workers (refusé avec SQLite ou le mode "snapshot").
+DURABILITY = "strict"
+GROUP_COMMIT_INTERVAL_MS = 100
+GROUP_COMMIT_MAX_BOOKINGS = 100
+
+# Clés d'idempotence de /purchasePlaces : durée de conservation des résultats (secondes)
+# et nombre maximal de résultats conservés (partagés entre les workers par le stockage)
+IDEMPOTENCY_TTL_SECONDS = 24 * 3600
+IDEMPOTENCY_MAX_KEYS = 10000
+
+# Contrôle d'admission des routes de réservation (/book, /purchasePlaces, /purchaseBatch) :
+# seau à jetons par utilisateur et club (RATE_LIMIT_PER_SECOND requêtes par seconde en moyenne,
+# RATE_LIMIT_BURST d'affilée) et nombre maximal de réservations simultanées par processus
+# (BOOKING_MAX_CONCURRENCY, 0 : sans limite). Les requêtes au-delà reçoivent 429 avec Retry-After.
+# RATE_LIMIT_SHARED partage les seaux entre les workers par la base SQLite : il exige STORAGE_BACKEND = "sqlite"
+# (le stockage "memory" est propre à chaque processus).
+RATE_LIMIT_ENABLED = True
+RATE_LIMIT_PER_SECOND = 2.0
+RATE_LIMIT_BURST = 10
+RATE_LIMIT_SHARED = False
+BOOKING_MAX_CONCURRENCY = 16
+
+# nombre maximal de réservations d'une réservation groupée (/purchaseBatch)
+BATCH_MAX_BOOKINGS = 50
+
+# Archive froide des compétitions passées (fichiers competitions-AAAA.json.gz)
+# dossier de l'archive (None : dossier archive du dossier des données)
+ARCHIVE_DIR = None
+# archivage automatique toutes les N secondes (0 : uniquement avec flask archive-competitions)
+ARCHIVE_INTERVAL_SECONDS = 0
+
+# Profilage des requêtes avec cProfile (profils pstats enregistrés dans PROFILING_DIR)
+PROFILING_ENABLED = False
+# fraction des requêtes profilées (0.01 : une requête sur cent)
+PROFILING_SAMPLE_RATE = 0.0
+# secret de signature de l'en-tête X-Profile-Signature (None : en-tête ignoré)
+PROFILING_SECRET = None
+# dossier des profils (None : dossier profiles du dossier des données) et nombre de profils conservés
+PROFILING_DIR = None
+PROFILING_MAX_FILES = 100
+
+# API JSON (/api) : nombre d'éléments par page par défaut et maximum,
+# taille (octets) à partir de laquelle une réponse est compressée avec gzip
+API_PAGE_SIZE = 50
+API_MAX_PAGE_SIZE = 500
+API_GZIP_MIN_SIZE = 1024
+
+# Flux des places disponibles (/availability) : nombre maximal d'événements en attente par client
+# (les plus anciens sont supprimés pour un client trop lent) et intervalle des messages de maintien (secondes)
+LIVE_FEED_QUEUE_SIZE = 100
+LIVE_FEED_HEARTBEAT_SECONDS = 15
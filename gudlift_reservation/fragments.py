@@ -0,0 +1,42 @@
+from . import metrics
+
+fragment_lookups = metrics.registry.counter(
+    "gudlft_fragment_cache_total", "Rendered fragment cache lookups by result (hit or miss).", ("result",)
+)
+
+
+class FragmentCache:
+    """
+    Cache des fragments HTML rendus, indexés par clé et numéro de version.
+
+    Un fragment est rendu à nouveau lorsque la version de sa clé change : seule la dernière version
+    de chaque clé est conservée, la taille du cache est bornée par le nombre de clés.
+    La version doit être lue avant le rendu et incrémentée après la modification des données :
+    un fragment ne peut pas être enregistré avec des données plus anciennes que sa version.
+    """
+
+    def __init__(self):
+        self._fragments = {}
+
+    def __len__(self):
+        return len(self._fragments)
+
+    def get(self, key, version, render):
+        """
+        Retourne le fragment de la clé pour cette version, rendu par render() s'il n'est pas en cache.
+        """
+        entry = self._fragments.get(key)
+        if entry is not None and entry[0] == version:
+            fragment_lookups.inc("hit")
+            return entry[1]
+
+        fragment_lookups.inc("miss")
+        fragment = render()
+        self._fragments[key] = (version, fragment)
+        return fragment
+
+    def clear(self):
+        """
+        Vide le cache.
+        """
+        self._fragments.clear()
@@ -0,0 +1,69 @@
+import threading
+import time
+from collections import OrderedDict
+
+from . import metrics
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+IDEMPOTENCY_FIELD = "idempotency_key"
+
+idempotency_lookups = metrics.registry.counter(
+    "gudlft_idempotency_total", "Idempotency key lookups by result (hit or miss).", ("result",)
+)
+
+
+class IdempotencyCache:
+    """
+    Résultats des requêtes idempotentes, par clé d'idempotence.
+
+    Les résultats expirent après ttl_seconds secondes. Ils sont gardés dans un cache local borné
+    (max_entries, les moins récemment utilisés sont supprimés) et enregistrés dans le stockage,
+    qui les partage entre les workers : une requête rejouée sur un autre worker retrouve le résultat.
+    Un résultat n'est jamais modifié : le cache local n'a pas besoin d'être invalidé.
+    """
+
+    def __init__(self, storage, ttl_seconds=24 * 3600, max_entries=10000):
+        self.storage = storage
+        self.ttl = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self._lock = threading.Lock()
+        self._results = OrderedDict()
+
+    def _remember(self, key, expires_at, result):
+        """
+        Garde un résultat dans le cache local.
+        """
+        with self._lock:
+            self._results[key] = (expires_at, result)
+            self._results.move_to_end(key)
+            while len(self._results) > self.max_entries:
+                self._results.popitem(last=False)
+
+    def get(self, key, now=None):
+        """
+        Retourne le résultat enregistré pour une clé, ou None s'il est inconnu ou expiré.
+        """
+        now = now or time.time()
+        with self._lock:
+            entry = self._results.get(key)
+            if entry is not None and entry[0] <= now:
+                del self._results[key]
+                entry = None
+            elif entry is not None:
+                self._results.move_to_end(key)
+
+        if entry is None:
+            entry = self.storage.load_result(key, now)
+            if entry is not None:
+                self._remember(key, *entry)
+
+        idempotency_lookups.inc("miss" if entry is None else "hit")
+        return None if entry is None else entry[1]
+
+    def put(self, key, result, now=None):
+        """
+        Enregistre le résultat d'une requête pour une clé.
+        """
+        expires_at = (now or time.time()) + self.ttl
+        self._remember(key, expires_at, result)
+        self.storage.save_result(key, result, expires_at, self.max_entries)
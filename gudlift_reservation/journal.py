@@ -0,0 +1,132 @@
+import json
+import os
+import uuid
+from datetime import datetime
+
+from .json_handler import get_data_path
+
+JOURNAL_FILE = "bookings.journal"
+
+
+class BookingJournal:
+    """
+    Journal des réservations en ajout seul (une ligne JSON par réservation).
+
+    Chaque réservation n'écrit que quelques octets au lieu de réécrire les fichiers
+    clubs.json et competitions.json. Le journal est synchronisé sur le disque (fsync)
+    toutes les fsync_every réservations : 1 pour une synchronisation à chaque réservation,
+    davantage pour regrouper les synchronisations (group commit).
+
+    La première ligne d'un journal vide est un en-tête {"generation": ...} : un identifiant tiré
+    à chaque fois que le journal recommence après une compaction. Les fichiers JSON enregistrent
+    la génération et le nombre de réservations du journal qu'ils intègrent (position()) :
+    une compaction interrompue avant que le journal soit vidé ne fait pas rejouer ces réservations.
+    """
+
+    def __init__(self, file_name=JOURNAL_FILE, fsync_every=1, data_dir=None):
+        self.path = get_data_path(file_name, data_dir)
+        self.fsync_every = max(1, fsync_every)
+        self._unsynced = 0
+
+    def size(self):
+        """
+        Retourne la taille du journal en octets (0 s'il n'existe pas).
+        """
+        try:
+            return os.stat(self.path).st_size
+        except FileNotFoundError:
+            return 0
+
+    def append(self, club_name, competition_name, places, sync=True):
+        """
+        Ajoute une réservation à la fin du journal.
+        Avec sync=False, la synchronisation sur le disque est laissée à sync().
+
+        Renvoie la position de fin du journal après l'écriture.
+        """
+        return self.append_many([(club_name, competition_name, places)], sync)
+
+    def append_many(self, bookings, sync=True):
+        """
+        Ajoute des réservations (nom du club, nom de la compétition, places) en une seule écriture.
+
+        Renvoie la position de fin du journal après l'écriture.
+        """
+        timestamp = datetime.now().isoformat(timespec="seconds")
+        lines = "".join(
+            json.dumps({"club": club_name, "competition": competition_name, "places": places, "timestamp": timestamp})
+            + "\n"
+            for club_name, competition_name, places in bookings
+        )
+        with open(self.path, "a", encoding="utf-8") as f:
+            if f.tell() == 0:
+                lines = json.dumps({"generation": uuid.uuid4().hex}) + "\n" + lines
+            f.write(lines)
+            f.flush()
+            self._unsynced += len(bookings)
+            if sync and self._unsynced >= self.fsync_every:
+                os.fsync(f.fileno())
+                self._unsynced = 0
+            return f.tell()
+
+    def sync(self):
+        """
+        Synchronise sur le disque les réservations pas encore synchronisées.
+        """
+        if self._unsynced and os.path.exists(self.path):
+            with open(self.path, "a", encoding="utf-8") as f:
+                os.fsync(f.fileno())
+        self._unsynced = 0
+
+    def read(self, offset=0):
+        """
+        Lit les réservations du journal à partir d'une position.
+        Une dernière ligne incomplète (écriture en cours) est ignorée.
+
+        Renvoie la liste des réservations lues et la position atteinte.
+        """
+        events = []
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    event = json.loads(line)
+                    if "generation" not in event:
+                        events.append(event)
+                    offset += len(line)
+        except FileNotFoundError:
+            pass
+        return events, offset
+
+    def generation(self):
+        """
+        Retourne l'identifiant de la génération du journal, ou None pour un journal vide
+        ou écrit sans en-tête.
+        """
+        try:
+            with open(self.path, "rb") as f:
+                line = f.readline()
+        except FileNotFoundError:
+            return None
+        if not line.endswith(b"\n"):
+            return None
+        return json.loads(line).get("generation")
+
+    def position(self):
+        """
+        Retourne la génération du journal et son nombre de réservations, enregistrés avec
+        les fichiers JSON qui les intègrent.
+        """
+        events, _ = self.read()
+        return {"generation": self.generation(), "bookings": len(events)}
+
+    def truncate(self):
+        """
+        Vide le journal après sa compaction dans les fichiers JSON.
+        La réservation suivante commence une nouvelle génération.
+        """
+        with open(self.path, "w", encoding="utf-8") as f:
+            os.fsync(f.fileno())
+        self._unsynced = 0
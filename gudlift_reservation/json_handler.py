@@ -1,60 +1,97 @@
 import json
 import os
+import tempfile
 
+from .models import to_json
 
-def load_data(file_name):
+DEFAULT_DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+
+
+def get_data_path(file_name, data_dir=None):
+    """
+    Retourne le chemin complet d'un fichier du dossier data.
+
+    Args:
+        file_name (str): Le nom du fichier.
+        data_dir (str): Le dossier des données, par défaut le dossier data du package.
+
+    Returns:
+        str: Le chemin du fichier.
+    """
+    return os.path.join(data_dir or DEFAULT_DATA_DIR, file_name)
+
+
+def load_data(file_name, data_dir=None):
     """
     Charge les données à partir d'un fichier JSON.
 
     Args:
         file_name (str): Le nom du fichier JSON.
+        data_dir (str): Le dossier des données, par défaut le dossier data du package.
 
     Returns:
         dict: Les données chargées depuis le fichier JSON.
     """
-    current_dir = os.path.dirname(__file__)
-    file_path = os.path.join(current_dir, "data", file_name)
+    file_path = get_data_path(file_name, data_dir)
     with open(file_path, "r", encoding="utf-8") as f:
         return json.load(f)
 
 
-def save_data(data, file_name):
+def save_data(data, file_name, data_dir=None):
     """
     Enregistre les données dans un fichier JSON.
 
+    L'écriture est atomique : les données sont écrites dans un fichier temporaire
+    du même dossier, synchronisées sur le disque puis renommées.
+    Un lecteur d'un autre processus ne voit jamais un fichier à moitié écrit.
+
     Args:
-        data (dict): Les données à enregistrer.
+        data (dict): Les données à enregistrer (dict, listes et enregistrements du module models).
         file_name (str): Le nom du fichier JSON où enregistrer les données.
+        data_dir (str): Le dossier des données, par défaut le dossier data du package.
     """
-    current_dir = os.path.dirname(__file__)
-    file_path = os.path.join(current_dir, "data", file_name)
-    with open(file_path, "w", encoding="utf-8") as f:
-        json.dump(data, f)
+    file_path = get_data_path(file_name, data_dir)
+    # sérialisation en une seule fois : les données ne peuvent pas être modifiées
+    # par un autre thread pendant l'écriture du fichier ; les enregistrements (models) sont convertis en dict
+    content = json.dumps(data, default=to_json)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{file_name}.", suffix=".tmp", dir=os.path.dirname(file_path))
+    try:
+        # conserve les droits du fichier remplacé (mkstemp crée le fichier en 0600)
+        mode = os.stat(file_path).st_mode if os.path.exists(file_path) else 0o644
+        os.chmod(tmp_path, mode & 0o777)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
 
 
-def load_clubs():
+def load_clubs(data_dir=None):
     """
     Retourne la liste des clubs de clubs.json
     """
-    return load_data("clubs.json")["clubs"]
+    return load_data("clubs.json", data_dir)["clubs"]
 
 
-def load_competitions():
+def load_competitions(data_dir=None):
     """
     Retourne la liste des competitions de competitions.json
     """
-    return load_data("competitions.json")["competitions"]
+    return load_data("competitions.json", data_dir)["competitions"]
 
 
-def save_clubs(clubs):
+def save_clubs(clubs, data_dir=None):
     """
     Sauvegarde la liste des clubs en argument dans clubs.json
     """
-    save_data({"clubs": clubs}, "clubs.json")
+    save_data({"clubs": clubs}, "clubs.json", data_dir)
 
 
-def save_competitions(competitions):
+def save_competitions(competitions, data_dir=None):
     """
     Sauvegarde la liste des competitions en argument dans competitions.json
     """
-    save_data({"competitions": competitions}, "competitions.json")
+    save_data({"competitions": competitions}, "competitions.json", data_dir)
@@ -0,0 +1,88 @@
+from .models import Reservation
+
+MAX_PLACES_PER_CLUB = 12
+
+
+class ReservationLedger:
+    """
+    Registre des réservations indexé par compétition puis par nom de club.
+
+    Les entrées du registre sont les réservations (Reservation, ou dict d'un ancien fichier)
+    de la liste reserved_places de chaque compétition : le format enregistré sur le disque reste inchangé.
+    Le total des places réservées par compétition est tenu à jour à chaque réservation.
+    """
+
+    def __init__(self, competitions=()):
+        self._entries = {}
+        self._totals = {}
+        for competition in competitions:
+            self.add_competition(competition)
+
+    def add_competition(self, competition):
+        """
+        Indexe les réservations d'une compétition.
+        """
+        entries = {entry["club_name"]: entry for entry in competition["reserved_places"]}
+        self._entries[competition["name"]] = entries
+        self._totals[competition["name"]] = sum(entry["reserved_places"] for entry in entries.values())
+
+    def reserved(self, competition_name, club_name):
+        """
+        Retourne le nombre de places réservées par un club dans une compétition.
+        """
+        entry = self._entries.get(competition_name, {}).get(club_name)
+        return entry["reserved_places"] if entry else 0
+
+    def total(self, competition_name):
+        """
+        Retourne le nombre total de places réservées dans une compétition.
+        """
+        return self._totals.get(competition_name, 0)
+
+    def remaining_quota(self, competition_name, club_name):
+        """
+        Retourne le nombre de places qu'un club peut encore réserver dans une compétition.
+        """
+        return MAX_PLACES_PER_CLUB - self.reserved(competition_name, club_name)
+
+    def reserve(self, club, competition, places_required):
+        """
+        Réserve des places pour un club dans une compétition si le quota de 12 places
+        par club n'est pas dépassé.
+
+        Renvoie True si la réservation est enregistrée, sinon False.
+        """
+        if places_required > self.remaining_quota(competition["name"], club["name"]):
+            return False
+
+        self.record(club, competition, places_required)
+        return True
+
+    def record(self, club, competition, places):
+        """
+        Enregistre des places réservées par un club dans une compétition sans vérifier le quota
+        (rejeu de réservations déjà validées).
+        """
+        entries = self._entries.setdefault(competition["name"], {})
+        entry = entries.get(club["name"])
+        if entry:
+            entry["reserved_places"] += places
+        else:
+            entry = Reservation(club["name"], places)
+            competition["reserved_places"].append(entry)
+            entries[club["name"]] = entry
+        self._totals[competition["name"]] = self.total(competition["name"]) + places
+
+    def cancel(self, club, competition, places):
+        """
+        Annule des places enregistrées par record (réservation dont l'enregistrement a échoué).
+        L'entrée du club est retirée de reserved_places lorsqu'il n'y a plus de places réservées.
+        """
+        entries = self._entries[competition["name"]]
+        entry = entries[club["name"]]
+        entry["reserved_places"] -= places
+        if not entry["reserved_places"]:
+            reserved_places = competition["reserved_places"]
+            reserved_places[:] = [other for other in reserved_places if other is not entry]
+            del entries[club["name"]]
+        self._totals[competition["name"]] -= places
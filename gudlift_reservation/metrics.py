@@ -0,0 +1,241 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+from flask import before_render_template, g, request, template_rendered
+
+# bornes des histogrammes de durée (secondes)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def format_labels(names, values):
+    """
+    Retourne les labels d'une série au format texte de Prometheus.
+    """
+    if not names:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for value in values)
+    return "{" + ",".join(f'{name}="{value}"' for name, value in zip(names, escaped)) + "}"
+
+
+def format_value(value):
+    """
+    Retourne une valeur au format texte de Prometheus.
+    """
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    """
+    Métrique nommée avec des labels ; chaque combinaison de labels est une série.
+    """
+
+    type = None
+
+    def __init__(self, name, documentation, label_names=()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+        self._series = {}
+
+    def samples(self):
+        """
+        Retourne les échantillons (suffixe, noms et valeurs des labels, valeur) de la métrique.
+        """
+        with self._lock:
+            series = list(self._series.items())
+        return [("", self.label_names, labels, value) for labels, value in series]
+
+    def render(self):
+        """
+        Retourne la métrique au format texte de Prometheus.
+        """
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        for suffix, names, values, value in self.samples():
+            lines.append(f"{self.name}{suffix}{format_labels(names, values)} {format_value(value)}")
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """
+    Compteur croissant.
+    """
+
+    type = "counter"
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._series[labels] = self._series.get(labels, 0) + amount
+
+
+class Gauge(Metric):
+    """
+    Valeur instantanée, qui peut augmenter ou diminuer.
+    """
+
+    type = "gauge"
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._series[labels] = self._series.get(labels, 0) + amount
+
+    def dec(self, *labels, amount=1):
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels, value):
+        with self._lock:
+            self._series[labels] = value
+
+
+class Histogram(Metric):
+    """
+    Histogramme de valeurs réparties dans des intervalles (buckets).
+    Chaque série garde le nombre de valeurs par intervalle, leur somme et leur nombre :
+    une observation coûte une recherche dichotomique et quelques additions.
+    """
+
+    type = "histogram"
+
+    def __init__(self, name, documentation, label_names=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, *labels):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def samples(self):
+        with self._lock:
+            series = [(labels, list(counts), total, count) for labels, (counts, total, count) in self._series.items()]
+
+        samples = []
+        bucket_names = self.label_names + ("le",)
+        for labels, counts, total, count in series:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                samples.append(("_bucket", bucket_names, labels + (format_value(bound),), cumulative))
+            samples.append(("_sum", self.label_names, labels, total))
+            samples.append(("_count", self.label_names, labels, count))
+        return samples
+
+
+class MetricsRegistry:
+    """
+    Registre des métriques exposées au format texte de Prometheus.
+
+    Les collecteurs sont des fonctions appelées à chaque exposition
+    pour mettre à jour des métriques calculées à la demande.
+    """
+
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, documentation, label_names=()):
+        return self.register(Counter(name, documentation, label_names))
+
+    def gauge(self, name, documentation, label_names=()):
+        return self.register(Gauge(name, documentation, label_names))
+
+    def histogram(self, name, documentation, label_names=(), buckets=DEFAULT_BUCKETS):
+        return self.register(Histogram(name, documentation, label_names, buckets))
+
+    def add_collector(self, collector):
+        self._collectors.append(collector)
+
+    def render(self):
+        """
+        Retourne toutes les métriques au format texte de Prometheus.
+        """
+        for collector in self._collectors:
+            collector()
+        return "\n".join(metric.render() for metric in self._metrics) + "\n"
+
+
+registry = MetricsRegistry()
+
+request_duration = registry.histogram(
+    "gudlft_request_duration_seconds", "Request latency by endpoint.", ("endpoint", "method")
+)
+requests_total = registry.counter(
+    "gudlft_requests_total", "Requests by endpoint and status code.", ("endpoint", "method", "status")
+)
+requests_in_flight = registry.gauge("gudlft_requests_in_flight", "Requests being processed.")
+phase_duration = registry.histogram(
+    "gudlft_phase_duration_seconds",
+    "Duration of the internal phases of a request (load_data, validation, persistence, render).",
+    ("phase",),
+)
+
+
+@contextmanager
+def timed(phase):
+    """
+    Mesure la durée d'une phase interne d'une requête.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        phase_duration.observe(time.perf_counter() - start, phase)
+
+
+def init_app(app):
+    """
+    Instrumente les requêtes d'une application Flask : durée par route,
+    nombre de requêtes par code de statut, requêtes en cours et durée du rendu des templates.
+    """
+
+    @app.before_request
+    def start_request_timer():
+        g.metrics_start = time.perf_counter()
+        requests_in_flight.inc()
+
+    @app.after_request
+    def record_request(response):
+        endpoint = request.endpoint or "unknown"
+        request_duration.observe(time.perf_counter() - g.metrics_start, endpoint, request.method)
+        requests_total.inc(endpoint, request.method, str(response.status_code))
+        g.metrics_recorded = True
+        return response
+
+    @app.teardown_request
+    def end_request(exception):
+        # g peut être partagé par plusieurs requêtes d'un même contexte d'application :
+        # les marqueurs de la requête sont retirés
+        start = g.pop("metrics_start", None)
+        if start is None:
+            return
+        requests_in_flight.dec()
+        if not g.pop("metrics_recorded", False):
+            # exception non gérée : la réponse est une erreur 500
+            endpoint = request.endpoint or "unknown"
+            request_duration.observe(time.perf_counter() - start, endpoint, request.method)
+            requests_total.inc(endpoint, request.method, "500")
+
+    def start_render_timer(sender, template, context, **extra):
+        g.metrics_render_start = time.perf_counter()
+
+    def record_render(sender, template, context, **extra):
+        if "metrics_render_start" in g:
+            phase_duration.observe(time.perf_counter() - g.pop("metrics_render_start"), "render")
+
+    before_render_template.connect(start_render_timer, app, weak=False)
+    template_rendered.connect(record_render, app, weak=False)
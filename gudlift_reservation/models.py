@@ -0,0 +1,169 @@
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import ClassVar
+
+
+def _text(data, key):
+    """
+    Retourne un champ texte d'un enregistrement JSON.
+    """
+    value = data[key]
+    if not isinstance(value, str):
+        raise ValueError(f"Invalid {key}: {value!r}")
+    return value
+
+
+def _integer(data, key):
+    """
+    Retourne un champ entier d'un enregistrement JSON ; les anciens fichiers peuvent contenir
+    des nombres écrits en texte ("13"). Un booléen ou un nombre décimal non entier (12.7) est refusé
+    au lieu d'être tronqué.
+    """
+    value = data[key]
+    if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+        raise ValueError(f"Invalid {key}: {value!r}")
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid {key}: {value!r}") from None
+
+
+class Record:
+    """
+    Enregistrement compact (dataclass avec __slots__) accessible comme le dict JSON d'origine.
+
+    Les champs sont lus et modifiés par leur clé JSON (club["points"], competition["numberOfPlaces"]) :
+    le code existant et les templates (club['name']) fonctionnent sans modification.
+    Un enregistrement est égal au dict de ses données JSON.
+    """
+
+    __slots__ = ()
+    # clé JSON -> attribut
+    _attributes: ClassVar[dict] = {}
+
+    @classmethod
+    def coerce(cls, value):
+        """
+        Retourne l'enregistrement, ou l'enregistrement créé depuis un dict JSON.
+        """
+        return value if isinstance(value, cls) else cls.from_dict(value)
+
+    def __getitem__(self, key):
+        return getattr(self, self._attributes[key])
+
+    def __setitem__(self, key, value):
+        setattr(self, self._attributes[key], value)
+
+    def __contains__(self, key):
+        return key in self._attributes
+
+    def get(self, key, default=None):
+        attribute = self._attributes.get(key)
+        return default if attribute is None else getattr(self, attribute)
+
+    def keys(self):
+        return self._attributes.keys()
+
+    def __eq__(self, other):
+        if isinstance(other, Record):
+            other = other.to_dict()
+        elif not isinstance(other, Mapping):
+            return NotImplemented
+        return self.to_dict() == dict(other)
+
+    __hash__ = None
+
+
+@dataclass(slots=True, eq=False)
+class Club(Record):
+    """
+    Club : nom, email et points disponibles.
+    """
+
+    _attributes: ClassVar[dict] = {"name": "name", "email": "email", "points": "points"}
+
+    name: str
+    email: str
+    points: int
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(_text(data, "name"), _text(data, "email"), _integer(data, "points"))
+
+    def to_dict(self):
+        return {"name": self.name, "email": self.email, "points": self.points}
+
+
+@dataclass(slots=True, eq=False)
+class Reservation(Record):
+    """
+    Places réservées par un club dans une compétition.
+    """
+
+    _attributes: ClassVar[dict] = {"club_name": "club_name", "reserved_places": "reserved_places"}
+
+    club_name: str
+    reserved_places: int
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(_text(data, "club_name"), _integer(data, "reserved_places"))
+
+    def to_dict(self):
+        return {"club_name": self.club_name, "reserved_places": self.reserved_places}
+
+
+@dataclass(slots=True, eq=False)
+class Competition(Record):
+    """
+    Compétition : nom, date (texte "AAAA-MM-JJ HH:MM:SS"), places disponibles et réservations par club.
+    """
+
+    _attributes: ClassVar[dict] = {
+        "name": "name",
+        "date": "date",
+        "numberOfPlaces": "number_of_places",
+        "reserved_places": "reserved_places",
+    }
+
+    name: str
+    date: str
+    number_of_places: int
+    reserved_places: list = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Les anciens fichiers peuvent ne pas contenir reserved_places ou contenir plusieurs entrées
+        pour un même club : les entrées sont regroupées par club et le nombre de places converti en entier.
+        """
+        reservations = {}
+        for entry in data.get("reserved_places") or []:
+            reservation = Reservation.from_dict(entry)
+            if reservation.club_name in reservations:
+                reservations[reservation.club_name].reserved_places += reservation.reserved_places
+            else:
+                reservations[reservation.club_name] = reservation
+        return cls(
+            _text(data, "name"),
+            _text(data, "date"),
+            _integer(data, "numberOfPlaces"),
+            list(reservations.values()),
+        )
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "date": self.date,
+            "numberOfPlaces": self.number_of_places,
+            "reserved_places": [reservation.to_dict() for reservation in self.reserved_places],
+        }
+
+
+def to_json(value):
+    """
+    Fonction default de json.dumps : convertit les enregistrements en dict JSON.
+    """
+    if isinstance(value, Record):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
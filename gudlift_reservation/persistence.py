@@ -0,0 +1,172 @@
+import atexit
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class GroupCommitWriter:
+    """
+    Écriture groupée (group commit) des réservations.
+
+    Les réservations sont acquittées dès qu'elles sont appliquées en mémoire et journalisées ;
+    un thread d'écriture les enregistre sur le disque au plus tard interval_ms millisecondes
+    après la première réservation en attente, ou dès que max_bookings réservations sont en attente.
+
+    write_batch(bookings) enregistre un lot de réservations et est appelée sous le verrou
+    retourné par lock().
+    Les métriques (nombre d'écritures, taille des lots, durée des écritures) sont disponibles
+    avec stats().
+    Le thread d'écriture est recréé dans les processus créés par fork (workers gunicorn --preload).
+    """
+
+    def __init__(self, write_batch, lock, interval_ms=100, max_bookings=100):
+        self.write_batch = write_batch
+        self.lock = lock
+        self.interval = interval_ms / 1000
+        self.max_bookings = max(1, max_bookings)
+        self._condition = threading.Condition()
+        self._pending = []
+        self._first_pending_at = None
+        self._stopped = False
+        self._metrics = {
+            "flushes": 0,
+            "bookings": 0,
+            "last_batch_size": 0,
+            "max_batch_size": 0,
+            "flush_seconds_total": 0.0,
+            "last_flush_seconds": 0.0,
+            "max_flush_seconds": 0.0,
+        }
+        self._start()
+        atexit.register(self.stop)
+        os.register_at_fork(after_in_child=self._after_fork)
+
+    def _start(self):
+        """
+        Démarre le thread d'écriture.
+        """
+        self._thread = threading.Thread(target=self._run, name="group-commit-writer", daemon=True)
+        self._thread.start()
+
+    def _after_fork(self):
+        """
+        Recrée le thread d'écriture dans un processus enfant, où seul le thread qui a appelé fork existe.
+        Les réservations en attente copiées depuis le processus parent restent à la charge du parent.
+        """
+        self._condition = threading.Condition()
+        self._pending = []
+        self._first_pending_at = None
+        if not self._stopped:
+            self._start()
+
+    @property
+    def pending(self):
+        """
+        Nombre de réservations en attente d'écriture.
+        """
+        return len(self._pending)
+
+    def submit(self, booking):
+        """
+        Ajoute une réservation aux réservations en attente d'écriture.
+        """
+        with self._condition:
+            if not self._pending:
+                self._first_pending_at = time.monotonic()
+            self._pending.append(booking)
+            self._condition.notify()
+
+    def _take(self):
+        """
+        Retire et retourne les réservations en attente.
+        """
+        with self._condition:
+            batch, self._pending = self._pending, []
+            self._first_pending_at = None
+            return batch
+
+    def flush(self):
+        """
+        Enregistre immédiatement les réservations en attente et met à jour les métriques.
+
+        Renvoie le nombre de réservations enregistrées.
+        """
+        with self.lock():
+            batch = self._take()
+            if not batch:
+                return 0
+
+            start = time.perf_counter()
+            try:
+                self.write_batch(batch)
+            except BaseException:
+                # les réservations restent en attente pour la prochaine écriture
+                with self._condition:
+                    self._pending[:0] = batch
+                    self._first_pending_at = self._first_pending_at or time.monotonic()
+                raise
+            elapsed = time.perf_counter() - start
+
+        with self._condition:
+            metrics = self._metrics
+            metrics["flushes"] += 1
+            metrics["bookings"] += len(batch)
+            metrics["last_batch_size"] = len(batch)
+            metrics["max_batch_size"] = max(metrics["max_batch_size"], len(batch))
+            metrics["flush_seconds_total"] += elapsed
+            metrics["last_flush_seconds"] = elapsed
+            metrics["max_flush_seconds"] = max(metrics["max_flush_seconds"], elapsed)
+        return len(batch)
+
+    def stats(self):
+        """
+        Retourne les métriques des écritures groupées.
+        """
+        with self._condition:
+            stats = dict(self._metrics, pending=len(self._pending))
+        flushes = stats["flushes"]
+        stats["avg_batch_size"] = stats["bookings"] / flushes if flushes else 0.0
+        stats["avg_flush_seconds"] = stats["flush_seconds_total"] / flushes if flushes else 0.0
+        return stats
+
+    def _wait_for_batch(self):
+        """
+        Attend qu'un lot soit prêt à être écrit : délai écoulé, lot complet ou arrêt.
+
+        Renvoie False lorsque le thread doit s'arrêter.
+        """
+        with self._condition:
+            while not self._pending and not self._stopped:
+                self._condition.wait()
+            while self._pending and len(self._pending) < self.max_bookings and not self._stopped:
+                remaining = self._first_pending_at + self.interval - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+            return bool(self._pending) or not self._stopped
+
+    def _run(self):
+        """
+        Boucle du thread d'écriture.
+        """
+        while self._wait_for_batch():
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Group commit flush failed")
+                if self._stopped:
+                    return
+                time.sleep(self.interval)
+
+    def stop(self):
+        """
+        Arrête le thread d'écriture après avoir enregistré les réservations en attente.
+        """
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        self._thread.join()
+        self.flush()
@@ -0,0 +1,126 @@
+import cProfile
+import hashlib
+import hmac
+import os
+import pstats
+import random
+import threading
+import time
+
+from flask import g, request
+
+PROFILE_HEADER = "X-Profile-Signature"
+PROFILE_SUFFIX = ".pstats"
+
+
+def sign(secret, path):
+    """
+    Retourne la signature HMAC-SHA256 d'un chemin, à envoyer dans l'en-tête X-Profile-Signature
+    pour demander le profilage d'une requête.
+    """
+    return hmac.new(secret.encode("utf-8"), path.encode("utf-8"), hashlib.sha256).hexdigest()
+
+
+class RequestProfiler:
+    """
+    Profilage à la demande des requêtes avec cProfile.
+
+    Une fraction sample_rate des requêtes est profilée, ainsi que les requêtes portant
+    une signature valide du chemin dans l'en-tête X-Profile-Signature.
+    Chaque profil est enregistré au format pstats dans le dossier des profils, nommé
+    avec la date, la route et la durée de la requête ; seuls les max_files profils
+    les plus récents sont conservés.
+    Une seule requête est profilée à la fois : cProfile ne supporte pas plusieurs profileurs actifs.
+    """
+
+    def __init__(self, profile_dir, sample_rate=0.0, secret=None, max_files=100):
+        self.profile_dir = profile_dir
+        self.sample_rate = sample_rate
+        self.secret = secret
+        self.max_files = max_files
+        self._active = threading.Lock()
+
+    def init_app(self, app):
+        app.before_request(self.start)
+        app.after_request(self.stop)
+        app.teardown_request(self.release)
+
+    def is_requested(self):
+        """
+        Indique si la requête courante doit être profilée.
+        """
+        signature = request.headers.get(PROFILE_HEADER)
+        if signature and self.secret:
+            return hmac.compare_digest(signature, sign(self.secret, request.path))
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def start(self):
+        if not self.is_requested() or not self._active.acquire(blocking=False):
+            return
+        g.profiler = cProfile.Profile()
+        g.profiler_start = time.perf_counter()
+        g.profiler.enable()
+
+    def stop(self, response):
+        profiler = g.pop("profiler", None)
+        if profiler is None:
+            return response
+        profiler.disable()
+        elapsed_ms = (time.perf_counter() - g.pop("profiler_start")) * 1000
+        try:
+            self.save(profiler, request.endpoint or "unknown", elapsed_ms)
+        finally:
+            self._active.release()
+        return response
+
+    def release(self, exception):
+        """
+        Arrête le profilage d'une requête interrompue par une exception.
+        """
+        profiler = g.pop("profiler", None)
+        if profiler is not None:
+            profiler.disable()
+            g.pop("profiler_start", None)
+            self._active.release()
+
+    def save(self, profiler, endpoint, elapsed_ms):
+        """
+        Enregistre un profil puis supprime les profils les plus anciens.
+        """
+        os.makedirs(self.profile_dir, exist_ok=True)
+        timestamp = time.strftime("%Y%m%d-%H%M%S")
+        file_name = f"{timestamp}-{time.time_ns() % 10**9:09d}-{endpoint}-{elapsed_ms:.0f}ms{PROFILE_SUFFIX}"
+        profiler.dump_stats(os.path.join(self.profile_dir, file_name))
+
+        if self.max_files:
+            for old_file in profile_files(self.profile_dir)[: -self.max_files]:
+                os.unlink(old_file)
+
+
+def profile_files(profile_dir, endpoint=None):
+    """
+    Retourne les fichiers de profils d'un dossier, du plus ancien au plus récent,
+    éventuellement limités à une route.
+    """
+    if not os.path.isdir(profile_dir):
+        return []
+    return [
+        os.path.join(profile_dir, file_name)
+        for file_name in sorted(os.listdir(profile_dir))
+        if file_name.endswith(PROFILE_SUFFIX) and (endpoint is None or f"-{endpoint}-" in file_name)
+    ]
+
+
+def hot_functions(files, top=20):
+    """
+    Agrège des profils et retourne les fonctions les plus coûteuses en temps propre :
+    liste de (fonction, nombre d'appels, temps propre, temps cumulé).
+    """
+    if not files:
+        return []
+    stats = pstats.Stats(*files)
+    rows = [
+        (pstats.func_std_string(function), calls, own_time, cumulative_time)
+        for function, (_, calls, own_time, cumulative_time, _) in stats.stats.items()
+    ]
+    return sorted(rows, key=lambda row: row[2], reverse=True)[:top]
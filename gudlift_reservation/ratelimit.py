@@ -0,0 +1,111 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app, g, request, session
+
+from . import metrics
+from .storage.base import consume_token
+
+# routes de réservation soumises au contrôle d'admission
+BOOKING_ENDPOINTS = frozenset({"main.book", "main.purchase_places", "main.purchase_batch"})
+
+rejected_requests = metrics.registry.counter(
+    "gudlft_rate_limited_total", "Booking requests rejected with 429 by reason (rate or concurrency).", ("reason",)
+)
+
+
+class LocalTokenBuckets:
+    """
+    Seaux à jetons en mémoire, propres au processus.
+    Seuls les max_keys seaux les plus récemment utilisés sont conservés : un seau supprimé
+    est recréé plein.
+    """
+
+    def __init__(self, max_keys=10000):
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._buckets = OrderedDict()
+
+    def take_token(self, key, rate, burst, now):
+        with self._lock:
+            tokens, updated_at = self._buckets.pop(key, (burst, now))
+            tokens, retry_after = consume_token(tokens, updated_at, rate, burst, now)
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return retry_after
+
+
+class BookingLimiter:
+    """
+    Contrôle d'admission des routes de réservation (/book, /purchasePlaces, /purchaseBatch).
+
+    Chaque couple (utilisateur de la session, club) a un seau à jetons : rate requêtes par seconde
+    en moyenne, burst requêtes d'affilée. Le nombre de requêtes de réservation exécutées en même
+    temps par le processus est limité à max_concurrency (0 : sans limite).
+    Une requête au-delà des limites reçoit immédiatement une réponse 429 avec l'en-tête Retry-After,
+    au lieu d'attendre derrière les requêtes en cours : les autres routes restent disponibles.
+
+    Les seaux sont propres au processus, ou partagés entre les workers par buckets
+    (un stockage qui implémente take_token).
+    """
+
+    def __init__(self, rate, burst, max_concurrency=0, buckets=None):
+        self.rate = rate
+        self.burst = burst
+        self.buckets = buckets or LocalTokenBuckets()
+        self._slots = threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+
+    def init_app(self, app):
+        app.before_request(self.admit)
+        app.teardown_request(self.release)
+
+    def key(self):
+        """
+        Retourne la clé du seau à jetons de la requête : utilisateur de la session et club demandé.
+        Un club inconnu n'est pas utilisé dans la clé, pour que le nombre de seaux reste borné.
+        """
+        if request.endpoint == "main.book":
+            club = request.view_args.get("club")
+        elif request.endpoint == "main.purchase_places":
+            club = request.form.get("club")
+        else:
+            payload = request.get_json(silent=True)
+            club = payload.get("club") if isinstance(payload, dict) else None
+        if not isinstance(club, str) or club not in current_app.extensions["gudlft"]["repository"].clubs_by_name:
+            club = ""
+        return f"{session.get('user_id', '')}|{club}"
+
+    def admit(self):
+        if request.endpoint not in BOOKING_ENDPOINTS:
+            return None
+
+        retry_after = self.buckets.take_token(self.key(), self.rate, self.burst, time.time())
+        if retry_after:
+            return self.reject("rate", retry_after)
+
+        if self._slots is not None:
+            if not self._slots.acquire(blocking=False):
+                return self.reject("concurrency", 1)
+            g.booking_slot = True
+        return None
+
+    def reject(self, reason, retry_after):
+        """
+        Retourne la réponse 429 d'une requête refusée.
+        """
+        rejected_requests.inc(reason)
+        return (
+            "Too many booking requests, please retry later.",
+            429,
+            {"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
+
+    def release(self, exception):
+        """
+        Libère la place de la requête de réservation, même interrompue par une exception.
+        """
+        if g.pop("booking_slot", False):
+            self._slots.release()
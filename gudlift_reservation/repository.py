@@ -0,0 +1,485 @@
+import itertools
+import os
+import threading
+import uuid
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from .ledger import ReservationLedger
+from .metrics import timed
+from .models import Club, Competition
+from .persistence import GroupCommitWriter
+from .storage import JsonStorage
+from .utils import parse_date
+
+
+def build_index(items, key):
+    """
+    Construit un index (dict) des éléments selon la valeur d'une clé.
+    En cas de doublon, le premier élément rencontré est conservé.
+    """
+    index = {}
+    for item in items:
+        index.setdefault(item[key], item)
+    return index
+
+
+class DataRepository:
+    """
+    Dépôt de données en mémoire partagé par tout le processus.
+
+    Les clubs et les compétitions sont chargés une seule fois depuis le stockage
+    (fichiers JSON par défaut) puis servis depuis la mémoire, sous forme d'enregistrements
+    compacts validés au chargement (Club, Competition et Reservation du module models).
+    Les modifications sont enregistrées immédiatement dans le stockage (write-through).
+    Des données modifiées dans le stockage (fichier édité à la main ou remplacé par
+    un autre processus, base modifiée par un autre processus) sont rechargées :
+    chaque processus garde une vue cohérente.
+
+    Des index (email et nom des clubs, nom des compétitions) sont construits au chargement
+    et maintenus à jour pour des recherches en temps constant, ainsi qu'un registre
+    des réservations par club pour chaque compétition.
+    Les dates des compétitions sont converties une seule fois au chargement et les compétitions
+    triées par date : les compétitions à venir sont obtenues par recherche dichotomique.
+    Chaque compétition a un numéro de version, changé à chaque réservation, qui sert de clé
+    au cache des fragments de la page welcome et d'ETag à l'API, comme la version de l'ensemble
+    des compétitions (competitions_version). De même, la version des clubs (clubs_version)
+    change avec les points des clubs : elle sert de clé au cache de la page d'accueil et d'ETag.
+
+    Avec un journal des réservations, une réservation n'est plus enregistrée en réécrivant
+    les fichiers JSON mais ajoutée au journal : l'état est reconstruit à partir des fichiers JSON
+    (dernier instantané) puis du rejeu du journal, jusqu'à la compaction du journal dans les fichiers.
+
+    Avec la durabilité "grouped", une réservation est acquittée dès qu'elle est appliquée en mémoire
+    et écrite dans le journal ; sa synchronisation sur le disque est groupée par un thread d'écriture
+    (group commit). Elle exige un journal : sans journal, une réservation acquittée ne serait visible
+    d'aucun autre processus avant l'écriture groupée, qui pourrait alors surréserver une compétition.
+    Avec la durabilité "strict", chaque réservation est enregistrée avant d'être acquittée.
+
+    Le verrou du stockage est toujours acquis avant le verrou du dépôt.
+    """
+
+    def __init__(
+        self,
+        storage=None,
+        compact_size=None,
+        durability="strict",
+        group_commit_interval_ms=100,
+        group_commit_max_bookings=100,
+    ):
+        self._lock = threading.RLock()
+        self._versions = itertools.count(1)
+        # identifiant du dépôt : les versions d'un autre processus ne sont pas comparables
+        self._new_instance_id()
+        os.register_at_fork(after_in_child=self._new_instance_id)
+        self._listeners = []
+        self.storage = storage or JsonStorage()
+        self.compact_size = compact_size
+        self._signature = None
+        self._journal_offset = 0
+        self.set_clubs([])
+        self.set_competitions([])
+
+        self.writer = None
+        if durability == "grouped":
+            if self.journal is None:
+                raise ValueError('Grouped durability requires the booking journal (PERSISTENCE_MODE = "journal")')
+            self.writer = GroupCommitWriter(
+                self._write_batch, self.write_lock, group_commit_interval_ms, group_commit_max_bookings
+            )
+        elif durability != "strict":
+            raise ValueError(f"Unknown durability level: {durability}")
+
+    def _new_instance_id(self):
+        """
+        Tire l'identifiant du dépôt, utilisé avec les versions dans les ETag. Il est tiré à nouveau
+        dans un processus créé par fork (workers gunicorn --preload) : les versions de chaque worker
+        avancent séparément et une même version y désigne des données différentes.
+        """
+        self.instance_id = uuid.uuid4().hex
+
+    @contextmanager
+    def write_lock(self):
+        """
+        Verrou exclusif du stockage puis verrou du dépôt, pour enregistrer des données.
+        """
+        with self.storage.lock(), self._lock:
+            yield
+
+    @property
+    def journal(self):
+        """
+        Journal des réservations du stockage, ou None.
+        """
+        return self.storage.journal
+
+    def set_clubs(self, clubs):
+        """
+        Remplace la liste des clubs en mémoire et reconstruit leurs index.
+        Les clubs donnés sous forme de dict JSON sont convertis en Club.
+        """
+        clubs = [Club.coerce(club) for club in clubs]
+        with self._lock:
+            self.clubs = clubs
+            self.clubs_by_email = build_index(clubs, "email")
+            self.clubs_by_name = build_index(clubs, "name")
+            self.touch_clubs()
+
+    def set_competitions(self, competitions):
+        """
+        Remplace la liste des compétitions en mémoire et reconstruit leur index
+        et le registre des réservations.
+        Les compétitions données sous forme de dict JSON sont converties en Competition.
+        """
+        competitions = [Competition.coerce(competition) for competition in competitions]
+        with self._lock:
+            self.competitions = competitions
+            self.competitions_by_name = build_index(competitions, "name")
+            self.ledger = ReservationLedger(self.competitions_by_name.values())
+            self.competition_versions = {name: next(self._versions) for name in self.competitions_by_name}
+            self.competitions_version = next(self._versions)
+            self.competition_dates = {
+                name: parse_date(competition["date"]) for name, competition in self.competitions_by_name.items()
+            }
+            self._schedule = sorted(self.competitions_by_name.values(), key=self._competition_date)
+            self._schedule_dates = [self._competition_date(competition) for competition in self._schedule]
+
+    def add_club(self, club):
+        """
+        Ajoute un club en mémoire et met à jour les index.
+
+        Renvoie le club ajouté.
+        """
+        club = Club.coerce(club)
+        with self._lock:
+            self.clubs.append(club)
+            self.clubs_by_email.setdefault(club["email"], club)
+            self.clubs_by_name.setdefault(club["name"], club)
+            self.touch_clubs()
+        return club
+
+    def add_competition(self, competition):
+        """
+        Ajoute une compétition en mémoire et met à jour l'index et le registre des réservations.
+
+        Renvoie la compétition ajoutée.
+        """
+        competition = Competition.coerce(competition)
+        with self._lock:
+            self.competitions.append(competition)
+            if self.competitions_by_name.setdefault(competition["name"], competition) is competition:
+                self.ledger.add_competition(competition)
+                self.touch_competition(competition)
+                date = parse_date(competition["date"])
+                self.competition_dates[competition["name"]] = date
+                index = bisect_left(self._schedule_dates, date)
+                self._schedule_dates.insert(index, date)
+                self._schedule.insert(index, competition)
+        return competition
+
+    def add_competitions(self, competitions):
+        """
+        Ajoute des compétitions en mémoire en une fois (import par lots) : les compétitions ajoutées
+        sont fusionnées au calendrier trié par date, au lieu d'y être insérées une à une.
+        Comme avec add_competition, une compétition dont le nom existe déjà n'est pas indexée.
+
+        Renvoie les compétitions ajoutées à l'index et au calendrier.
+        """
+        competitions = [Competition.coerce(competition) for competition in competitions]
+        with self._lock:
+            added = []
+            for competition in competitions:
+                self.competitions.append(competition)
+                if self.competitions_by_name.setdefault(competition["name"], competition) is competition:
+                    self.ledger.add_competition(competition)
+                    self.touch_competition(competition)
+                    self.competition_dates[competition["name"]] = parse_date(competition["date"])
+                    added.append(competition)
+            if added:
+                self._schedule = sorted(self._schedule + added, key=self._competition_date)
+                self._schedule_dates = [self._competition_date(competition) for competition in self._schedule]
+        return added
+
+    def touch_clubs(self):
+        """
+        Change la version des clubs et leur date de modification après la modification de leurs points.
+        """
+        self.clubs_version = next(self._versions)
+        self.clubs_modified_at = datetime.now(timezone.utc).replace(microsecond=0)
+
+    def touch_competition(self, competition):
+        """
+        Change la version d'une compétition après la modification de ses places :
+        les fragments rendus avec l'ancienne version ne sont plus utilisés.
+        La version de l'ensemble des compétitions (competitions_version) change avec elle.
+        """
+        self.competitions_version = self.competition_versions[competition["name"]] = next(self._versions)
+
+    def add_listener(self, listener):
+        """
+        Ajoute une fonction appelée avec (club, competition, places) après chaque réservation
+        appliquée en mémoire, acquittée par ce processus ou rejouée depuis le journal.
+        Elle est appelée sous le verrou du dépôt et doit être rapide.
+        """
+        self._listeners.append(listener)
+
+    def _booked(self, club, competition, places):
+        """
+        Change les versions du club et de la compétition réservée et prévient les listeners.
+        """
+        self.touch_competition(competition)
+        self.touch_clubs()
+        for listener in self._listeners:
+            listener(club, competition, places)
+
+    def get_club_by_email(self, email):
+        """
+        Retourne le club correspondant à l'email ou None.
+        """
+        return self.clubs_by_email.get(email)
+
+    def _competition_date(self, competition):
+        """
+        Retourne la date convertie d'une compétition.
+        """
+        return self.competition_dates[competition["name"]]
+
+    def is_past(self, competition, now=None):
+        """
+        Indique si la date d'une compétition est passée.
+        """
+        return self._competition_date(competition) < (now or datetime.now())
+
+    def upcoming_competitions(self, now=None):
+        """
+        Retourne les compétitions à venir triées par date.
+        """
+        return self._schedule[bisect_left(self._schedule_dates, now or datetime.now()) :]
+
+    def past_competitions(self, now=None):
+        """
+        Retourne les compétitions passées triées par date.
+        """
+        return self._schedule[: bisect_left(self._schedule_dates, now or datetime.now())]
+
+    def _is_stale(self):
+        """
+        Indique si le stockage ou le journal a changé depuis le dernier chargement.
+        """
+        if self.storage.signature() != self._signature:
+            return True
+        return self.journal is not None and self.journal.size() != self._journal_offset
+
+    def refresh(self):
+        """
+        Recharge les clubs et les compétitions si le stockage a changé,
+        puis rejoue les réservations du journal qui n'ont pas encore été appliquées.
+        Le rechargement se fait sous le verrou partagé du stockage pour lire
+        un état cohérent pendant qu'un autre processus enregistre une réservation.
+        En écriture groupée, les réservations en attente sont d'abord enregistrées
+        sous le verrou exclusif pour ne pas être perdues par le rechargement.
+        """
+        if not self._is_stale():
+            return
+
+        with self.storage.lock(shared=self.writer is None), self._lock:
+            if self.writer is not None:
+                self.writer.flush()
+            if not self._is_stale():
+                return
+
+            signature = self.storage.signature()
+            folded = {"clubs": 0, "competitions": 0}
+            if signature != self._signature:
+                self.set_clubs(self.storage.load_clubs())
+                self.set_competitions(self.storage.load_competitions())
+                self._signature = signature
+                self._journal_offset = 0
+                folded = self.storage.folded_bookings()
+
+            if self.journal is not None:
+                events, self._journal_offset = self.journal.read(self._journal_offset)
+                for index, event in enumerate(events):
+                    self._apply_booking(
+                        event["club"],
+                        event["competition"],
+                        event["places"],
+                        club_folded=index < folded["clubs"],
+                        competition_folded=index < folded["competitions"],
+                    )
+
+    def _apply_booking(self, club_name, competition_name, places, club_folded=False, competition_folded=False):
+        """
+        Applique en mémoire une réservation rejouée depuis le journal.
+        Après une compaction interrompue, une réservation déjà intégrée au fichier des clubs
+        ou des compétitions n'y est pas appliquée une seconde fois.
+        """
+        club = self.clubs_by_name.get(club_name)
+        competition = self.competitions_by_name.get(competition_name)
+        if club is None or competition is None or (club_folded and competition_folded):
+            return
+        if not club_folded:
+            club["points"] -= places
+        if not competition_folded:
+            competition["numberOfPlaces"] -= places
+            self.ledger.record(club, competition, places)
+        self._booked(club, competition, places)
+
+    def get_data(self):
+        """
+        Retourne les clubs et les compétitions en mémoire, rechargés si nécessaire.
+        """
+        self.refresh()
+        return self.clubs, self.competitions
+
+    def _mark_synced(self):
+        """
+        Mémorise la version du stockage après une écriture de ce processus
+        pour ne pas recharger inutilement les données.
+        Doit être appelée sous le verrou exclusif du stockage, après refresh() : aucune réservation
+        d'un autre worker ne peut alors précéder celles de ce processus à la fin du journal.
+        """
+        self._signature = self.storage.signature()
+        if self.journal is not None:
+            self._journal_offset = self.journal.size()
+
+    def save(self):
+        """
+        Enregistre les clubs et les compétitions en mémoire dans le stockage.
+        """
+        with self._lock, timed("persistence"):
+            self.storage.save_clubs(self.clubs)
+            self.storage.save_competitions(self.competitions)
+            self._signature = self.storage.signature()
+
+    def save_snapshot(self):
+        """
+        Enregistre les clubs et les compétitions en mémoire, réservations journalisées comprises,
+        puis vide le journal des réservations qui y sont intégrées.
+        Chaque fichier enregistre la position du journal qu'il intègre : après une interruption
+        entre les deux fichiers ou avant que le journal soit vidé, refresh() ne rejoue pas
+        une seconde fois les réservations déjà intégrées.
+        Doit être appelée sous le verrou exclusif du stockage, après refresh().
+        """
+        if self.journal is not None:
+            self.journal.sync()
+        self.save()
+        if self.journal is not None:
+            self.journal.truncate()
+            self._journal_offset = 0
+
+    def commit_booking(self, club, competition, places):
+        """
+        Enregistre une réservation déjà appliquée en mémoire.
+        Doit être appelée sous le verrou exclusif du stockage.
+        """
+        self.commit_bookings([(club, competition, places)])
+
+    def commit_bookings(self, bookings):
+        """
+        Enregistre des réservations (club, compétition, places) déjà appliquées en mémoire,
+        en une seule écriture du stockage.
+        En écriture groupée, les réservations sont écrites dans le journal puis leur synchronisation
+        sur le disque est confiée au thread d'écriture.
+        Avec un journal, celui-ci est compacté lorsqu'il dépasse compact_size octets.
+        Si l'enregistrement échoue, les réservations sont annulées en mémoire (points, places
+        et registre) avant de propager l'erreur : la mémoire reste identique au stockage.
+        Les listeners ne sont prévenus qu'après l'enregistrement.
+        Doit être appelée sous le verrou exclusif du stockage.
+        """
+        with self._lock:
+            try:
+                with timed("persistence"):
+                    if self.writer is not None:
+                        for club, competition, places in bookings:
+                            self.storage.log_booking(club, competition, places)
+                    else:
+                        self.storage.commit_bookings(bookings, self.clubs, self.competitions)
+            except BaseException:
+                self._cancel(bookings)
+                raise
+
+            self._mark_synced()
+            for club, competition, places in bookings:
+                self._booked(club, competition, places)
+            if self.writer is not None:
+                for booking in bookings:
+                    self.writer.submit(booking)
+            elif self.journal is not None and self.compact_size and self._journal_offset >= self.compact_size:
+                self.compact()
+
+    def _cancel(self, bookings):
+        """
+        Annule en mémoire des réservations dont l'enregistrement a échoué.
+        Les réservations déjà écrites dans le journal avant l'échec y sont rejouées au prochain refresh().
+        Les versions changent : une page ou un fragment rendu pendant l'écriture, avec les places
+        et les points déduits, n'est plus servi depuis le cache.
+        """
+        for club, competition, places in reversed(bookings):
+            club["points"] += places
+            competition["numberOfPlaces"] += places
+            self.ledger.cancel(club, competition, places)
+            self.touch_competition(competition)
+        if bookings:
+            self.touch_clubs()
+
+    def _write_batch(self, batch):
+        """
+        Synchronise sur le disque un lot de réservations journalisées du thread d'écriture groupée.
+        Appelée sous le verrou exclusif du stockage et le verrou du dépôt.
+        La position lue dans le journal n'avance pas : les réservations journalisées depuis
+        par un autre worker sont rejouées au prochain refresh().
+        """
+        with timed("group_commit"):
+            self.storage.sync()
+
+    def flush(self):
+        """
+        Enregistre immédiatement les réservations en attente d'écriture groupée.
+        """
+        if self.writer is not None:
+            self.writer.flush()
+
+    def archive_past(self, archive, now=None):
+        """
+        Déplace les compétitions passées et leurs places réservées dans l'archive froide
+        puis enregistre les compétitions restantes : le jeu de données chaud reste borné.
+        Avec un journal, les réservations journalisées sont intégrées aux fichiers JSON.
+
+        Renvoie les compétitions archivées.
+        """
+        with self.write_lock():
+            self.flush()
+            self.refresh()
+            past = self.past_competitions(now)
+            if not past:
+                return []
+
+            # l'archive est écrite avant les données chaudes : une archive interrompue
+            # laisse les compétitions dans les données chaudes et peut être relancée
+            archive.add(past)
+            names = {competition["name"] for competition in past}
+            self.set_competitions(
+                [competition for competition in self.competitions if competition["name"] not in names]
+            )
+            self.save_snapshot()
+            return past
+
+    def compact(self):
+        """
+        Intègre le journal des réservations dans les fichiers JSON puis vide le journal.
+
+        Renvoie le nombre de réservations intégrées.
+        """
+        if self.journal is None:
+            return 0
+
+        with self.write_lock():
+            self.flush()
+            self.refresh()
+            events, _ = self.journal.read()
+            if not events:
+                return 0
+            self.save_snapshot()
+            return len(events)
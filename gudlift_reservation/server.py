@@ -1,38 +1,263 @@
-from flask import (Flask, flash, redirect, render_template, request, session,
-                   url_for)
+import json
+import os
+from collections import namedtuple
+
+import click
+from flask import (Blueprint, Flask, Response, abort, current_app, flash,
+                   has_app_context, jsonify, make_response, redirect,
+                   render_template, request, session, url_for)
+from jinja2 import FileSystemBytecodeCache
+
+from . import metrics
+from .api import api
+from .archive import ARCHIVE_DIR, ArchiveScheduler, CompetitionArchive
+from .booking import BookingService
+from .broadcast import BroadcastHub
+from .bulk import (CLUB_FIELDS, COMPETITION_FIELDS, FORMATS, file_format,
+                   import_records, read_rows, write_rows)
+from .fragments import FragmentCache
+from .idempotency import IDEMPOTENCY_FIELD, IDEMPOTENCY_HEADER, IdempotencyCache
+from .journal import BookingJournal
+from .json_handler import get_data_path
+from .profiling import RequestProfiler, hot_functions, profile_files
+from .ratelimit import BookingLimiter
+from .repository import DataRepository
+from .storage import SQLITE_FILE, JsonStorage, SqliteStorage, create_storage
+from .utils import valid_club_and_competition
+
+main = Blueprint("main", __name__, cli_group=None)
+
+# templates compilés et pages appelées par warm_up
+WARM_UP_TEMPLATES = ("index.html", "login.html", "welcome.html", "booking.html")
+
+
+def create_app(config=None):
+    """
+    Crée une application avec sa configuration, son dépôt de données et son archive.
+
+    La configuration de config.py est surchargée par les variables d'environnement GUDLFT_*
+    (ex. GUDLFT_DATA_DIR) puis par le dict config. Chaque application a son propre dépôt :
+    avec STORAGE_BACKEND = "memory", les données sont chargées depuis le dossier des données
+    puis ne sont plus jamais écrites sur le disque.
+    """
+    app = Flask(__name__)
+    app.config.from_object("gudlift_reservation.config")
+    app.config.from_prefixed_env("GUDLFT")
+    app.config.update(config or {})
+    metrics.init_app(app)
+
+    if app.config["TEMPLATE_CACHE_ENABLED"]:
+        cache_dir = app.config["TEMPLATE_CACHE_DIR"] or get_data_path("template_cache", app.config["DATA_DIR"])
+        os.makedirs(cache_dir, exist_ok=True)
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache(cache_dir)
+
+    if app.config["PROFILING_ENABLED"]:
+        RequestProfiler(
+            profile_dir(app.config),
+            sample_rate=app.config["PROFILING_SAMPLE_RATE"],
+            secret=app.config["PROFILING_SECRET"],
+            max_files=app.config["PROFILING_MAX_FILES"],
+        ).init_app(app)
+
+    # dépôt de données en mémoire, chargé une seule fois au démarrage
+    repository = DataRepository(
+        create_storage(app.config),
+        compact_size=app.config["JOURNAL_COMPACT_SIZE"],
+        durability=app.config["DURABILITY"],
+        group_commit_interval_ms=app.config["GROUP_COMMIT_INTERVAL_MS"],
+        group_commit_max_bookings=app.config["GROUP_COMMIT_MAX_BOOKINGS"],
+    )
+    repository.refresh()
+
+    # archive froide des compétitions passées, consultable en lecture seule
+    archive = CompetitionArchive(app.config["ARCHIVE_DIR"] or get_data_path(ARCHIVE_DIR, app.config["DATA_DIR"]))
+    if app.config["ARCHIVE_INTERVAL_SECONDS"]:
+        ArchiveScheduler(repository, archive, app.config["ARCHIVE_INTERVAL_SECONDS"]).start()
+
+    # diffusion des places disponibles après chaque réservation (flux /availability)
+    hub = BroadcastHub(app.config["LIVE_FEED_QUEUE_SIZE"])
+    repository.add_listener(
+        lambda club, competition, places: hub.publish(availability_delta(repository, club, competition))
+    )
+
+    app.extensions["gudlft"] = {
+        "repository": repository,
+        "hub": hub,
+        "booking_service": BookingService(
+            repository,
+            IdempotencyCache(
+                repository.storage,
+                ttl_seconds=app.config["IDEMPOTENCY_TTL_SECONDS"],
+                max_entries=app.config["IDEMPOTENCY_MAX_KEYS"],
+            ),
+        ),
+        "archive": archive,
+        "fragments": FragmentCache(),
+        "pages": FragmentCache(),
+    }
+    if app.config["RATE_LIMIT_ENABLED"]:
+        # seuls les seaux de la base SQLite sont partagés entre les workers
+        if app.config["RATE_LIMIT_SHARED"] and app.config["STORAGE_BACKEND"] != "sqlite":
+            raise ValueError("RATE_LIMIT_SHARED requires the sqlite storage backend")
+        BookingLimiter(
+            app.config["RATE_LIMIT_PER_SECOND"],
+            app.config["RATE_LIMIT_BURST"],
+            max_concurrency=app.config["BOOKING_MAX_CONCURRENCY"],
+            buckets=repository.storage if app.config["RATE_LIMIT_SHARED"] else None,
+        ).init_app(app)
+
+    app.register_blueprint(main)
+    app.register_blueprint(api)
+    return app
+
+
+def warm_up(app):
+    """
+    Prépare une application avant ses premières requêtes, par exemple avant le fork des workers
+    avec gunicorn --preload : les données et leurs index sont déjà chargés par create_app,
+    les templates sont compilés (et enregistrés dans le cache du bytecode), puis chaque page
+    est demandée une fois pour initialiser les vues.
+    Les requêtes de préchauffage ne modifient aucune donnée.
+    """
+    for template in WARM_UP_TEMPLATES:
+        app.jinja_env.get_template(template)
+
+    repository = app.extensions["gudlft"]["repository"]
+    client = app.test_client()
+    client.get("/")
+    client.get("/login")
+    if repository.clubs:
+        club = repository.clubs[0]
+        client.post("/showSummary", data={"email": club["email"]})
+        competitions = repository.upcoming_competitions()
+        if competitions:
+            with app.test_request_context():
+                path = url_for("main.book", competition=competitions[0]["name"], club=club["name"])
+            client.get(path)
+    return app
+
+
+def availability_delta(repository, club, competition):
+    """
+    Retourne le changement de disponibilité d'une compétition après une réservation d'un club :
+    places restantes et places réservées par le club.
+    """
+    return {
+        "competition": competition["name"],
+        "numberOfPlaces": competition["numberOfPlaces"],
+        "club": club["name"],
+        "reserved_places": repository.ledger.reserved(competition["name"], club["name"]),
+    }
+
+
+def get_repository():
+    """
+    Retourne le dépôt de données de l'application courante.
+    """
+    return current_app.extensions["gudlft"]["repository"]
+
+
+def get_archive():
+    """
+    Retourne l'archive des compétitions de l'application courante.
+    """
+    return current_app.extensions["gudlft"]["archive"]
 
-from .json_handler import (load_clubs, load_competitions, save_clubs,
-                           save_competitions)
-from .utils import (reserv_places_competition, valid_club_and_competition,
-                    valid_form_purchase_places, verif_date_in_past)
 
-app = Flask(__name__)
-app.config.from_object("gudlift_reservation.config")
+def profile_dir(config):
+    """
+    Retourne le dossier des profils des requêtes.
+    """
+    return config["PROFILING_DIR"] or get_data_path("profiles", config["DATA_DIR"])
 
 
 def load_data():
     """
-    Charge et retourne les clubs et les compétitions
+    Retourne les clubs et les compétitions depuis le dépôt en mémoire
+    """
+    with metrics.timed("load_data"):
+        return get_repository().get_data()
+
+
+group_commit_stats = metrics.registry.gauge(
+    "gudlft_group_commit", "Group commit writer statistics (flushes, batch sizes, flush durations).", ("stat",)
+)
+
+
+def collect_group_commit_stats():
+    """
+    Met à jour les statistiques du thread d'écriture groupée de l'application courante.
+    """
+    if not has_app_context():
+        return
+    writer = get_repository().writer
+    if writer is not None:
+        for stat, value in writer.stats().items():
+            group_commit_stats.set(stat, value=value)
+
+
+metrics.registry.add_collector(collect_group_commit_stats)
+
+
+def listed_competitions(values):
+    """
+    Retourne les compétitions affichées sur la page welcome : les compétitions à venir,
+    ou toutes les compétitions si show_past est demandé.
     """
-    competitions = load_competitions()
-    clubs = load_clubs()
-    return clubs, competitions
+    repository = get_repository()
+    if values.get("show_past"):
+        return repository.competitions
+    return repository.upcoming_competitions()
 
 
 welcome_template = "welcome.html"
 
+CompetitionFragment = namedtuple("CompetitionFragment", ("summary", "reserved_places"))
 
-@app.route("/")
-def index():
+
+@main.app_template_global()
+def competition_fragment(competition):
     """
-    Vue pour la page d'accueil
+    Retourne les fragments HTML d'une compétition de la page welcome (résumé et places réservées),
+    rendus une seule fois par version de la compétition.
+    Le lien de réservation, propre au club connecté, est rendu par welcome.html entre ces fragments.
     """
-    clubs, _ = load_data()
+    repository = get_repository()
+    macros = current_app.jinja_env.get_template("competition_fragments.html").module
 
-    return render_template("index.html", clubs=clubs)
+    def render():
+        return CompetitionFragment(macros.summary(competition), macros.reserved_places(competition))
 
+    name = competition["name"]
+    if repository.competitions_by_name.get(name) is not competition:
+        return render()
+    return current_app.extensions["gudlft"]["fragments"].get(name, repository.competition_versions[name], render)
 
-@app.route("/login")
+
+@main.route("/")
+def index():
+    """
+    Vue pour la page d'accueil
+    La page est rendue une seule fois par version des clubs et mise en cache ;
+    l'ETag et Last-Modified dérivés de cette version permettent de répondre 304 Not Modified
+    à un client dont la page est à jour.
+    """
+    load_data()
+    repository = get_repository()
+    # la version est lue avant le rendu : la page en cache n'est jamais plus ancienne que sa version
+    version = repository.clubs_version
+
+    page = current_app.extensions["gudlft"]["pages"].get(
+        "index", version, lambda: render_template("index.html", clubs=repository.clubs)
+    )
+    response = make_response(page)
+    response.set_etag(f"{repository.instance_id}-{version}")
+    response.last_modified = repository.clubs_modified_at
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+
+@main.route("/login")
 def login():
     """
     Vue pour la page de login
@@ -40,65 +265,64 @@ def login():
     return render_template("login.html")
 
 
-@app.route("/showSummary", methods=["POST"])
+@main.route("/showSummary", methods=["POST"])
 def show_summary():
     """
     Vue pour la page welcome
     Vérifie si l'email est présent et correspond à un club.
+    Seules les compétitions à venir sont affichées, sauf si show_past est demandé.
     """
-    clubs, competitions = load_data()
+    load_data()
 
     email = request.form["email"]
 
     if not email:
         flash("No email provided", "error")
-        return redirect(url_for("login"))
+        return redirect(url_for("main.login"))
 
-    try:
-        club = next(club for club in clubs if club["email"] == email)
-    except StopIteration:
+    club = get_repository().get_club_by_email(email)
+    if club is None:
         flash(f"Club with this email {email} not found", "error")
-        return redirect(url_for("login"))
+        return redirect(url_for("main.login"))
 
     session["user_id"] = email
 
-    return render_template(welcome_template, club=club, competitions=competitions)
+    return render_template(
+        welcome_template,
+        club=club,
+        competitions=listed_competitions(request.form),
+        show_past=bool(request.form.get("show_past")),
+    )
 
 
-@app.route("/book/<competition>/<club>")
+@main.route("/book/<competition>/<club>")
 def book(competition, club):
     """
     Vue pour la page de réservation pour une compétition et un club donné.
     Vérifie si la compétition et le club sont valides.
     Verifie si la date de competition n'est pas deja passée
     """
-    clubs, competitions = load_data()
+    load_data()
+    repository = get_repository()
 
     # validation du club et de la competition
-    found_club, found_competition = valid_club_and_competition(club, clubs, competition, competitions)
+    found_club, found_competition = valid_club_and_competition(
+        club, repository.clubs_by_name, competition, repository.competitions_by_name
+    )
 
     # calcul du nombre max de places reservables pour l'interface utilisateur
-    if found_competition["reserved_places"]:
-        club_entry = next((entry for entry in found_competition["reserved_places"] if entry["club_name"] == found_club["name"]), None)
-        if club_entry:
-            max_reserved_places = 12 - club_entry['reserved_places']
-        else:
-            max_reserved_places = 12
-    else:
-        max_reserved_places = 12
-        
+    max_reserved_places = repository.ledger.remaining_quota(found_competition["name"], found_club["name"])
     max_places = min(found_club["points"], found_competition["numberOfPlaces"], max_reserved_places)
 
-
     # Vérifie si la date de la compétition est déjà passée
-    if verif_date_in_past(found_competition["date"]):
+    if repository.is_past(found_competition):
         flash("Competition date has already passed", "error")
-        return render_template(welcome_template, club=found_club, competitions=competitions)
+        return render_template(welcome_template, club=found_club, competitions=listed_competitions(request.args))
 
     return render_template("booking.html", club=found_club, competition=found_competition, max_places=max_places)
 
 
-@app.route("/purchasePlaces", methods=["POST"])
+@main.route("/purchasePlaces", methods=["POST"])
 def purchase_places():
     """
     Vue pour la réservation de places pour une compétition par un club donné.
@@ -107,47 +331,287 @@ def purchase_places():
     Si le club a suffisamment de points, les places sont réservées et les points du club et les
     places de la compétition sont mis à jour et les donnees sont enregistrées.
     Vérifie qu'un club ne réserve pas plus de 12 places par compétition.
+    La validation et la réservation sont exécutées de manière atomique par le service de réservation.
+    Une clé d'idempotence (en-tête Idempotency-Key ou champ idempotency_key) permet de rejouer
+    la requête sans réserver deux fois : le résultat de la première requête est renvoyé.
     """
-    clubs, competitions = load_data()
-    form = request.form
+    load_data()
 
-    # validation du formulaire de reservation
-    valid_form, data = valid_form_purchase_places(clubs, competitions, form)
+    # validation et reservation atomiques des places
+    idempotency_key = request.headers.get(IDEMPOTENCY_HEADER) or request.form.get(IDEMPOTENCY_FIELD)
+    booked, data = current_app.extensions["gudlft"]["booking_service"].purchase_places(
+        request.form, idempotency_key
+    )
     club = data["club"]
     competition = data["competition"]
-    if valid_form:
-        places_required = data["places_required"]
-    else:
+    if not booked:
         flash(data["error_message"], data["error_type"])
-        return redirect(url_for("book", competition=competition["name"], club=club["name"]))
-
-    # validation de la reservation des places dans une competition
-    result_reserv_places = reserv_places_competition(club, competition, places_required)
-    # si la reservation s'est bien passée on enregistre les donnees
-    if result_reserv_places:
-        competition["numberOfPlaces"] -= places_required
-        club["points"] -= places_required
-        save_clubs(clubs)
-        save_competitions(competitions)
-        flash("Great-booking complete!")
-    else:
-        flash("use no more than 12 places per competition", "error")
-        return redirect(
-            url_for(
-                "book",
-                competition=competition["name"],
-                club=club["name"],
-            )
-        )
+        return redirect(url_for("main.book", competition=competition["name"], club=club["name"]))
+
+    flash("Great-booking complete!")
+    return render_template(welcome_template, club=club, competitions=listed_competitions(request.form))
+
 
-    return render_template(welcome_template, club=club, competitions=competitions)
+@main.route("/purchaseBatch", methods=["POST"])
+def purchase_batch():
+    """
+    Vue pour la réservation de places dans plusieurs compétitions par un club en une seule requête JSON :
+    {"club": nom du club, "bookings": [{"competition": nom de la compétition, "places": nombre de places}, ...]}.
+    Toutes les réservations sont validées avec les règles de purchase_places puis enregistrées en une seule
+    écriture, ou aucune n'est enregistrée. La réponse donne le résultat de chaque réservation (400 si refusé).
+    """
+    payload = request.get_json(silent=True)
+    items = payload.get("bookings") if isinstance(payload, dict) else None
+    if not isinstance(items, list) or not items or not all(isinstance(item, dict) for item in items):
+        return jsonify(error="Expected a club and a non-empty list of bookings"), 400
+    if len(items) > current_app.config["BATCH_MAX_BOOKINGS"]:
+        return jsonify(error=f"No more than {current_app.config['BATCH_MAX_BOOKINGS']} bookings per batch"), 400
+
+    load_data()
+    club_name = payload.get("club")
+    club = get_repository().clubs_by_name.get(club_name) if isinstance(club_name, str) else None
+    if club is None:
+        return jsonify(error="Invalid club"), 400
+
+    # validation et reservation atomiques du lot
+    booked, results = current_app.extensions["gudlft"]["booking_service"].purchase_batch(club["name"], items)
+    return jsonify(booked=booked, club=club["name"], points=club["points"], results=results), 200 if booked else 400
+
+
+@main.route("/history")
+def history():
+    """
+    Vue en lecture seule des compétitions archivées, par année.
+    Affiche l'année demandée (paramètre year) ou la plus récente.
+    """
+    archive = get_archive()
+    partitions = archive.partitions()
+    year = request.args.get("year") or (partitions[0] if partitions else None)
+    if year is not None and year not in partitions:
+        abort(404)
+
+    competitions = archive.load(year) if year else []
+    return render_template("history.html", partitions=partitions, year=year, competitions=competitions)
+
+
+@main.route("/availability")
+def availability():
+    """
+    Flux Server-Sent Events des changements de places disponibles, un événement "availability"
+    par réservation. Un événement "overflow" signale des événements perdus par un client trop lent,
+    qui doit alors recharger les compétitions (/api/competitions).
+    Un commentaire est envoyé toutes les LIVE_FEED_HEARTBEAT_SECONDS secondes sans événement.
+    Le flux est propre au processus : les réservations d'un autre worker ne sont diffusées que lorsqu'elles
+    sont rejouées depuis le journal, pas après un rechargement complet des données.
+    Chaque client occupe un thread pendant toute sa connexion.
+    """
+    hub = current_app.extensions["gudlft"]["hub"]
+    heartbeat = current_app.config["LIVE_FEED_HEARTBEAT_SECONDS"]
+
+    def stream():
+        # abonnement au démarrage du flux : une réponse jamais parcourue (client déconnecté avant
+        # le premier envoi, erreur d'un after_request) ne laisse pas d'abonnement sans désabonnement
+        subscription = hub.subscribe()
+        try:
+            yield "retry: 3000\n\n"
+            while not subscription.closed:
+                events, dropped = subscription.get(heartbeat)
+                if dropped:
+                    yield f"event: overflow\ndata: {json.dumps({'dropped': dropped})}\n\n"
+                for event_id, data in events:
+                    yield f"id: {event_id}\nevent: availability\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+                if not events and not dropped:
+                    yield ": keep-alive\n\n"
+        finally:
+            hub.unsubscribe(subscription)
+
+    response = Response(stream(), mimetype="text/event-stream")
+    response.cache_control.no_cache = True
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
+
+
+@main.route("/metrics")
+def metrics_view():
+    """
+    Vue des métriques de l'application au format texte de Prometheus.
+    """
+    return Response(metrics.registry.render(), content_type=metrics.CONTENT_TYPE)
 
 
-@app.route("/logout")
+@main.route("/logout")
 def logout():
     """
     Vue pour la page Logout
     Déconnecte l'utilisateur et redirige vers la page d'accueil.
     """
     session.clear()
-    return redirect(url_for("index"))
+    return redirect(url_for("main.index"))
+
+
+def json_repository():
+    """
+    Retourne un dépôt des fichiers JSON du dossier des données, journal des réservations compris.
+    """
+    data_dir = current_app.config["DATA_DIR"]
+    return DataRepository(JsonStorage(data_dir, BookingJournal(data_dir=data_dir)))
+
+
+@main.cli.command("compact-journal")
+def compact_journal():
+    """
+    Intègre le journal des réservations dans clubs.json et competitions.json puis le vide.
+    """
+    count = json_repository().compact()
+    click.echo(f"{count} booking(s) compacted into clubs.json and competitions.json")
+
+
+@main.cli.command("import-json")
+@click.option("--sqlite-path", default=None, help="SQLite database path (defaults to SQLITE_PATH).")
+def import_json(sqlite_path):
+    """
+    Importe clubs.json, competitions.json et le journal des réservations dans la base SQLite.
+    """
+    source = json_repository()
+    source.refresh()
+
+    target = SqliteStorage(
+        sqlite_path
+        or current_app.config["SQLITE_PATH"]
+        or get_data_path(SQLITE_FILE, current_app.config["DATA_DIR"])
+    )
+    target.save_clubs(source.clubs)
+    target.save_competitions(source.competitions)
+    click.echo(
+        f"{len(source.clubs)} club(s) and {len(source.competitions)} competition(s) imported into {target.path}"
+    )
+
+
+@main.cli.command("archive-competitions")
+def archive_competitions():
+    """
+    Déplace les compétitions passées et leurs places réservées dans l'archive froide.
+    """
+    archive = get_archive()
+    archived = get_repository().archive_past(archive)
+    click.echo(f"{len(archived)} competition(s) archived into {archive.archive_dir}")
+
+
+def bulk_import(kind, path, format, chunk_size, dry_run):
+    """
+    Importe par lots les clubs ou les compétitions d'un fichier CSV ou NDJSON ("-" : entrée standard)
+    en affichant la progression après chaque lot et les lignes invalides.
+    """
+    try:
+        format = file_format(path, format)
+    except ValueError as error:
+        raise click.UsageError(str(error))
+
+    def report_error(line_number, message):
+        click.echo(f"{path}:{line_number}: {message}", err=True)
+
+    def report_chunk(counts):
+        click.echo(
+            f"{counts['read']} row(s) read: {counts['imported']} {kind} to import, "
+            f"{counts['duplicates']} duplicate(s), {counts['invalid']} invalid"
+        )
+
+    with click.open_file(path, encoding="utf-8") as f:
+        counts = import_records(
+            get_repository(), kind, read_rows(f, format), chunk_size, dry_run, report_error, report_chunk
+        )
+    action = "validated" if dry_run else "imported"
+    click.echo(
+        f"{counts['imported']} {kind} {action}, {counts['duplicates']} duplicate(s), {counts['invalid']} invalid"
+    )
+
+
+def bulk_export(kind, path, format, fields):
+    """
+    Exporte un par un les clubs ou les compétitions dans un fichier CSV ou NDJSON ("-" : sortie standard).
+    """
+    try:
+        format = file_format(path, format)
+    except ValueError as error:
+        raise click.UsageError(str(error))
+
+    repository = get_repository()
+    repository.refresh()
+    with click.open_file(path, "w", encoding="utf-8", atomic=path != "-") as f:
+        count = write_rows(f, format, fields, getattr(repository, kind))
+    click.echo(f"{count} {kind} exported", err=True)
+
+
+def bulk_options(function):
+    """
+    Options communes des commandes d'import et d'export.
+    """
+    function = click.option(
+        "--format", type=click.Choice(FORMATS), default=None, help="File format (defaults to the file extension)."
+    )(function)
+    return click.argument("path", type=click.Path(dir_okay=False, allow_dash=True))(function)
+
+
+def import_options(function):
+    """
+    Options des commandes d'import.
+    """
+    function = click.option("--dry-run", is_flag=True, help="Only validate the file, import nothing.")(function)
+    function = click.option(
+        "--chunk-size", default=10_000, show_default=True, type=click.IntRange(min=1), help="Rows per chunk."
+    )(function)
+    return bulk_options(function)
+
+
+@main.cli.command("import-clubs")
+@import_options
+def import_clubs(path, format, chunk_size, dry_run):
+    """
+    Importe des clubs d'un fichier CSV (colonnes name, email, points) ou NDJSON, par lots.
+    Les clubs dont le nom ou l'email existe déjà sont ignorés.
+    """
+    bulk_import("clubs", path, format, chunk_size, dry_run)
+
+
+@main.cli.command("import-competitions")
+@import_options
+def import_competitions(path, format, chunk_size, dry_run):
+    """
+    Importe des compétitions d'un fichier CSV (colonnes name, date, numberOfPlaces) ou NDJSON
+    (avec leurs reserved_places), par lots. Les compétitions dont le nom existe déjà sont ignorées.
+    """
+    bulk_import("competitions", path, format, chunk_size, dry_run)
+
+
+@main.cli.command("export-clubs")
+@bulk_options
+def export_clubs(path, format):
+    """
+    Exporte les clubs dans un fichier CSV ou NDJSON.
+    """
+    bulk_export("clubs", path, format, CLUB_FIELDS)
+
+
+@main.cli.command("export-competitions")
+@bulk_options
+def export_competitions(path, format):
+    """
+    Exporte les compétitions dans un fichier CSV (sans leurs places réservées) ou NDJSON.
+    """
+    bulk_export("competitions", path, format, COMPETITION_FIELDS)
+
+
+@main.cli.command("profile-report")
+@click.option("--top", default=20, show_default=True, help="Number of functions to show.")
+@click.option(
+    "--route", default=None, help="Only aggregate the profiles of this endpoint (e.g. main.purchase_places)."
+)
+def profile_report(top, route):
+    """
+    Agrège les profils enregistrés et affiche les fonctions les plus coûteuses.
+    """
+    directory = profile_dir(current_app.config)
+    files = profile_files(directory, route)
+    click.echo(f"{len(files)} profile(s) in {directory}")
+    for function, calls, own_time, cumulative_time in hot_functions(files, top):
+        click.echo(f"{own_time:10.6f}s {cumulative_time:10.6f}s {calls:8d}  {function}")
@@ -0,0 +1,32 @@
+from ..journal import BookingJournal
+from ..json_handler import get_data_path, load_clubs, load_competitions
+from .base import Storage, file_lock
+from .json_storage import JsonStorage
+from .memory_storage import MemoryStorage
+from .sqlite_storage import SQLITE_FILE, SqliteStorage
+
+
+def create_storage(config):
+    """
+    Crée le stockage des données sélectionné par la configuration (STORAGE_BACKEND).
+    Le stockage "memory" est initialisé avec les fichiers JSON du dossier des données.
+    """
+    data_dir = config.get("DATA_DIR")
+    backend = config.get("STORAGE_BACKEND", "json")
+
+    if backend == "sqlite":
+        return SqliteStorage(config.get("SQLITE_PATH") or get_data_path(SQLITE_FILE, data_dir))
+
+    if backend == "json":
+        journal = None
+        if config.get("PERSISTENCE_MODE") == "journal":
+            journal = BookingJournal(fsync_every=config.get("JOURNAL_FSYNC_EVERY", 1), data_dir=data_dir)
+        return JsonStorage(data_dir, journal)
+
+    if backend == "memory":
+        return MemoryStorage(load_clubs(data_dir), load_competitions(data_dir))
+
+    raise ValueError(f"Unknown storage backend: {backend}")
+
+
+__all__ = ["Storage", "JsonStorage", "MemoryStorage", "SqliteStorage", "create_storage", "file_lock"]
@@ -0,0 +1,152 @@
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - plateformes sans fcntl (Windows)
+    fcntl = None
+
+_lock_state = threading.local()
+
+
+def consume_token(tokens, updated_at, rate, burst, now):
+    """
+    Seau à jetons : ajoute les jetons accumulés depuis updated_at (rate jetons par seconde,
+    au plus burst) puis consomme un jeton s'il y en a un.
+
+    Renvoie le nombre de jetons restants et le délai (secondes) avant le prochain jeton
+    si aucun jeton n'est disponible, sinon 0.
+    """
+    tokens = min(burst, tokens + max(0.0, now - updated_at) * rate)
+    if tokens >= 1:
+        return tokens - 1, 0.0
+    return tokens, (1 - tokens) / rate
+
+
+@contextmanager
+def file_lock(path, shared=False):
+    """
+    Verrou consultatif (fcntl) sur un fichier, partagé entre les processus.
+    Un verrou exclusif protège les cycles lecture-modification-écriture des réservations,
+    un verrou partagé le rechargement des données.
+    Un thread qui détient déjà un verrou peut le redemander sans blocage.
+    Sans fcntl, le verrou n'a pas d'effet.
+    """
+    if fcntl is None or getattr(_lock_state, "held", False):
+        yield
+        return
+
+    with open(path, "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        _lock_state.held = True
+        try:
+            yield
+        finally:
+            _lock_state.held = False
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+class Storage:
+    """
+    Interface des stockages de clubs et de compétitions.
+
+    signature() retourne un marqueur peu coûteux qui change lorsque les données sont
+    modifiées par un autre processus, pour invalider les données en mémoire.
+    journal est le journal des réservations à rejouer, ou None.
+    """
+
+    journal = None
+
+    def load_clubs(self):
+        """
+        Retourne la liste des clubs.
+        """
+        raise NotImplementedError
+
+    def load_competitions(self):
+        """
+        Retourne la liste des compétitions avec leurs places réservées.
+        """
+        raise NotImplementedError
+
+    def save_clubs(self, clubs):
+        """
+        Remplace tous les clubs enregistrés.
+        """
+        raise NotImplementedError
+
+    def save_competitions(self, competitions):
+        """
+        Remplace toutes les compétitions enregistrées.
+        """
+        raise NotImplementedError
+
+    def commit_booking(self, club, competition, places, clubs, competitions):
+        """
+        Enregistre une réservation déjà appliquée en mémoire : points du club,
+        places de la compétition et places réservées par le club.
+        clubs et competitions sont l'ensemble des données en mémoire.
+        """
+        raise NotImplementedError
+
+    def log_booking(self, club, competition, places):
+        """
+        Écrit une réservation dans le journal sans attendre sa synchronisation sur le disque
+        (écriture groupée, qui exige un journal).
+
+        Renvoie True si la réservation est écrite, False sans journal.
+        """
+        return False
+
+    def commit_bookings(self, bookings, clubs, competitions):
+        """
+        Enregistre un lot de réservations (club, compétition, places) déjà appliquées en mémoire.
+        """
+        for club, competition, places in bookings:
+            self.commit_booking(club, competition, places, clubs, competitions)
+
+    def sync(self):
+        """
+        Synchronise sur le disque les réservations écrites par log_booking.
+        """
+
+    def folded_bookings(self):
+        """
+        Retourne, pour les clubs et pour les compétitions chargés, le nombre de premières réservations
+        du journal déjà intégrées aux données (compaction interrompue avant que le journal soit vidé).
+        """
+        return {"clubs": 0, "competitions": 0}
+
+    def load_result(self, key, now):
+        """
+        Retourne (expiration, résultat) du résultat enregistré d'une requête idempotente
+        encore valide à l'instant now (secondes depuis l'epoch), ou None.
+        Sans stockage partagé des résultats, les résultats restent propres à chaque processus.
+        """
+        return None
+
+    def save_result(self, key, result, expires_at, max_results):
+        """
+        Enregistre le résultat (dict sérialisable en JSON) d'une requête idempotente jusqu'à expires_at,
+        en supprimant les résultats expirés et les plus anciens au-delà de max_results.
+        """
+
+    def take_token(self, key, rate, burst, now):
+        """
+        Consomme un jeton du seau à jetons d'une clé, partagé entre les processus (voir consume_token).
+
+        Renvoie 0 si un jeton est consommé, sinon le délai (secondes) avant le prochain jeton.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not share rate limits")
+
+    def signature(self):
+        """
+        Retourne le marqueur de version des données enregistrées.
+        """
+        raise NotImplementedError
+
+    def lock(self, shared=False):
+        """
+        Retourne le verrou inter-processus des données.
+        """
+        raise NotImplementedError
@@ -0,0 +1,156 @@
+import hashlib
+import os
+import time
+
+from .. import json_handler
+from .base import Storage, file_lock
+
+CLUBS_FILE = "clubs.json"
+COMPETITIONS_FILE = "competitions.json"
+LOCK_FILE = ".data.lock"
+RESULTS_DIR = "idempotency"
+
+
+class JsonStorage(Storage):
+    """
+    Stockage dans les fichiers clubs.json et competitions.json d'un dossier de données.
+
+    Sans journal, chaque réservation (ou chaque lot de réservations en écriture groupée)
+    réécrit les deux fichiers ; avec un journal, la réservation est ajoutée au journal.
+
+    Les résultats des requêtes idempotentes sont enregistrés un par fichier dans le dossier
+    idempotency, avec leur expiration comme date de modification : les résultats expirés
+    et les plus anciens sont supprimés périodiquement.
+    """
+
+    def __init__(self, data_dir=None, journal=None):
+        self.data_dir = data_dir
+        self.journal = journal
+        self._saved_results = 0
+        # position du journal intégrée à chaque fichier lors de son dernier chargement
+        self._folded = {"clubs": None, "competitions": None}
+
+    def _load(self, file_name, key):
+        """
+        Charge la liste d'un fichier de données et mémorise la position du journal qu'il intègre.
+        """
+        data = json_handler.load_data(file_name, self.data_dir)
+        self._folded[key] = data.get("journal")
+        return data[key]
+
+    def _save(self, file_name, key, records):
+        """
+        Enregistre la liste d'un fichier de données ; avec un journal, la position du journal
+        est enregistrée dans le même fichier (écriture atomique) : elle y est intégrée.
+        """
+        data = {key: records}
+        if self.journal is not None:
+            data["journal"] = self.journal.position()
+        json_handler.save_data(data, file_name, self.data_dir)
+
+    def load_clubs(self):
+        return self._load(CLUBS_FILE, "clubs")
+
+    def load_competitions(self):
+        return self._load(COMPETITIONS_FILE, "competitions")
+
+    def save_clubs(self, clubs):
+        self._save(CLUBS_FILE, "clubs", clubs)
+
+    def save_competitions(self, competitions):
+        self._save(COMPETITIONS_FILE, "competitions", competitions)
+
+    def folded_bookings(self):
+        generation = self.journal.generation() if self.journal is not None else None
+        return {
+            key: position["bookings"] if position and position["generation"] == generation else 0
+            for key, position in self._folded.items()
+        }
+
+    def commit_booking(self, club, competition, places, clubs, competitions):
+        if self.journal is not None:
+            self.journal.append(club["name"], competition["name"], places)
+            return
+        self.save_clubs(clubs)
+        self.save_competitions(competitions)
+
+    def log_booking(self, club, competition, places):
+        if self.journal is None:
+            return False
+        self.journal.append(club["name"], competition["name"], places, sync=False)
+        return True
+
+    def commit_bookings(self, bookings, clubs, competitions):
+        if not bookings:
+            return
+        if self.journal is not None:
+            self.journal.append_many(
+                [(club["name"], competition["name"], places) for club, competition, places in bookings]
+            )
+            return
+        self.save_clubs(clubs)
+        self.save_competitions(competitions)
+
+    def sync(self):
+        if self.journal is not None:
+            self.journal.sync()
+
+    def _results_dir(self):
+        return json_handler.get_data_path(RESULTS_DIR, self.data_dir)
+
+    def _result_file(self, key):
+        return f"{hashlib.sha256(key.encode()).hexdigest()}.json"
+
+    def load_result(self, key, now):
+        try:
+            entry = json_handler.load_data(self._result_file(key), self._results_dir())
+        except (FileNotFoundError, ValueError):
+            return None
+        if entry["key"] != key or entry["expires_at"] <= now:
+            return None
+        return entry["expires_at"], entry["result"]
+
+    def save_result(self, key, result, expires_at, max_results):
+        results_dir = self._results_dir()
+        os.makedirs(results_dir, exist_ok=True)
+        file_name = self._result_file(key)
+        json_handler.save_data({"key": key, "result": result, "expires_at": expires_at}, file_name, results_dir)
+        os.utime(os.path.join(results_dir, file_name), (expires_at, expires_at))
+
+        # nettoyage périodique : un parcours du dossier tous les max_results / 10 enregistrements
+        self._saved_results += 1
+        if self._saved_results % max(1, max_results // 10) == 0:
+            self._purge_results(results_dir, max_results)
+
+    def _purge_results(self, results_dir, max_results):
+        """
+        Supprime les résultats expirés puis les plus anciens au-delà de max_results.
+        """
+        now = time.time()
+        entries = []
+        with os.scandir(results_dir) as scan:
+            for entry in scan:
+                if entry.name.endswith(".json"):
+                    entries.append((entry.stat().st_mtime, entry.path))
+        entries.sort()
+        expired = sum(1 for expires_at, _ in entries if expires_at <= now)
+        for _, path in entries[: max(expired, len(entries) - max_results)]:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+
+    def _file_signature(self, file_name):
+        """
+        Retourne la signature (inode, date de modification, taille) d'un fichier de données.
+        Un fichier remplacé par un autre processus change d'inode : la signature suffit
+        à invalider les données en mémoire sans relire le fichier à chaque requête.
+        """
+        stat = os.stat(json_handler.get_data_path(file_name, self.data_dir))
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def signature(self):
+        return self._file_signature(CLUBS_FILE), self._file_signature(COMPETITIONS_FILE)
+
+    def lock(self, shared=False):
+        return file_lock(json_handler.get_data_path(LOCK_FILE, self.data_dir), shared)
@@ -0,0 +1,103 @@
+import copy
+import itertools
+import threading
+from collections import OrderedDict
+
+from ..models import Record
+from .base import Storage, consume_token
+
+
+def as_data(item):
+    """
+    Retourne le dict JSON d'un enregistrement, ou le dict donné.
+    """
+    return item.to_dict() if isinstance(item, Record) else item
+
+
+class MemoryStorage(Storage):
+    """
+    Stockage en mémoire, propre à une instance de l'application.
+
+    Les données ne sont jamais écrites sur le disque : chaque application de test a son propre
+    stockage isolé, et les tests peuvent s'exécuter en parallèle sans fichiers partagés.
+    Les données chargées sont des copies, comme après la lecture d'un fichier.
+    Les enregistrements (models) sont conservés sous forme de dict JSON.
+    """
+
+    # numéros de version uniques entre les stockages en mémoire d'un même processus
+    _versions = itertools.count(1)
+
+    def __init__(self, clubs=(), competitions=()):
+        self._lock = threading.RLock()
+        self._clubs = {}
+        self._competitions = {}
+        self._version = None
+        self._results = OrderedDict()
+        self._buckets = {}
+        self.save_clubs(list(clubs))
+        self.save_competitions(list(competitions))
+
+    def load_clubs(self):
+        with self._lock:
+            return copy.deepcopy(list(self._clubs.values()))
+
+    def load_competitions(self):
+        with self._lock:
+            return copy.deepcopy(list(self._competitions.values()))
+
+    def save_clubs(self, clubs):
+        with self._lock:
+            self._clubs = {}
+            for club in copy.deepcopy([as_data(club) for club in clubs]):
+                self._clubs.setdefault(club["name"], club)
+            self._version = next(self._versions)
+
+    def save_competitions(self, competitions):
+        with self._lock:
+            self._competitions = {}
+            for competition in copy.deepcopy([as_data(competition) for competition in competitions]):
+                self._competitions.setdefault(competition["name"], competition)
+            self._version = next(self._versions)
+
+    def commit_booking(self, club, competition, places, clubs, competitions):
+        self.commit_bookings([(club, competition, places)], clubs, competitions)
+
+    def commit_bookings(self, bookings, clubs, competitions):
+        with self._lock:
+            for club, competition, places in bookings:
+                self._clubs[club["name"]]["points"] -= places
+                stored = self._competitions[competition["name"]]
+                stored["numberOfPlaces"] -= places
+                reserved_places = stored.setdefault("reserved_places", [])
+                for entry in reserved_places:
+                    if entry["club_name"] == club["name"]:
+                        entry["reserved_places"] += places
+                        break
+                else:
+                    reserved_places.append({"club_name": club["name"], "reserved_places": places})
+            self._version = next(self._versions)
+
+    def load_result(self, key, now):
+        with self._lock:
+            entry = self._results.get(key)
+            return entry if entry is not None and entry[0] > now else None
+
+    def save_result(self, key, result, expires_at, max_results):
+        with self._lock:
+            self._results.pop(key, None)
+            self._results[key] = (expires_at, copy.deepcopy(result))
+            while len(self._results) > max_results:
+                self._results.popitem(last=False)
+
+    def take_token(self, key, rate, burst, now):
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (burst, now))
+            tokens, retry_after = consume_token(tokens, updated_at, rate, burst, now)
+            self._buckets[key] = (tokens, now)
+            return retry_after
+
+    def signature(self):
+        return self._version
+
+    def lock(self, shared=False):
+        return self._lock
@@ -0,0 +1,229 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from .base import Storage, consume_token, file_lock
+
+SQLITE_FILE = "gudlft.sqlite3"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS clubs (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    email TEXT NOT NULL,
+    points INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_clubs_email ON clubs (email);
+
+CREATE TABLE IF NOT EXISTS competitions (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    date TEXT NOT NULL,
+    number_of_places INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_competitions_date ON competitions (date);
+
+CREATE TABLE IF NOT EXISTS reservations (
+    id INTEGER PRIMARY KEY,
+    competition_name TEXT NOT NULL,
+    club_name TEXT NOT NULL,
+    reserved_places INTEGER NOT NULL,
+    UNIQUE (competition_name, club_name)
+);
+
+CREATE TABLE IF NOT EXISTS idempotency_results (
+    key TEXT PRIMARY KEY,
+    result TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_idempotency_results_expires_at ON idempotency_results (expires_at);
+"""
+
+# seaux à jetons de la limitation de débit, dans une base séparée : leurs écritures
+# ne changent pas PRAGMA data_version de la base des données et ne provoquent pas de rechargement
+RATE_LIMITS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rate_limits (
+    key TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+class SqliteStorage(Storage):
+    """
+    Stockage dans une base SQLite en mode WAL.
+
+    Les colonnes email et nom des clubs, nom et date des compétitions sont indexées.
+    Une réservation (ou un lot de réservations en écriture groupée) met à jour les points,
+    les places et la ligne de réservation dans une seule transaction.
+    Chaque processus utilise une seule connexion : PRAGMA data_version ne change
+    alors que lorsqu'un autre processus modifie la base.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._connection_lock = threading.RLock()
+        self._connection_pid = None
+        self._connection_obj = None
+        self._limits_pid = None
+        self._limits_obj = None
+
+    def _connect(self, path, schema):
+        """
+        Ouvre une connexion en mode WAL et crée le schéma.
+        """
+        connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA busy_timeout=5000")
+        connection.executescript(schema)
+        return connection
+
+    def _connection(self):
+        """
+        Retourne la connexion du processus courant, créée à la première utilisation
+        et recréée après un fork.
+        """
+        if self._connection_pid != os.getpid():
+            self._connection_obj = self._connect(self.path, SCHEMA)
+            self._connection_pid = os.getpid()
+        return self._connection_obj
+
+    def _limits_connection(self):
+        """
+        Retourne la connexion du processus courant à la base des seaux à jetons (fichier .ratelimits).
+        """
+        if self._limits_pid != os.getpid():
+            self._limits_obj = self._connect(f"{self.path}.ratelimits", RATE_LIMITS_SCHEMA)
+            self._limits_pid = os.getpid()
+        return self._limits_obj
+
+    @contextmanager
+    def _transaction(self, connect=None):
+        """
+        Exécute des requêtes dans une transaction d'écriture, annulée en cas d'erreur.
+        connect retourne la connexion à utiliser, par défaut celle de la base des données.
+        """
+        with self._connection_lock:
+            connection = (connect or self._connection)()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+    def load_clubs(self):
+        with self._connection_lock:
+            rows = self._connection().execute("SELECT name, email, points FROM clubs ORDER BY id").fetchall()
+        return [{"name": name, "email": email, "points": points} for name, email, points in rows]
+
+    def load_competitions(self):
+        with self._connection_lock:
+            connection = self._connection()
+            rows = connection.execute("SELECT name, date, number_of_places FROM competitions ORDER BY id").fetchall()
+            reservations = connection.execute(
+                "SELECT competition_name, club_name, reserved_places FROM reservations ORDER BY id"
+            ).fetchall()
+
+        competitions = {
+            name: {"name": name, "date": date, "numberOfPlaces": places, "reserved_places": []}
+            for name, date, places in rows
+        }
+        for competition_name, club_name, reserved_places in reservations:
+            if competition_name in competitions:
+                competitions[competition_name]["reserved_places"].append(
+                    {"club_name": club_name, "reserved_places": reserved_places}
+                )
+        return list(competitions.values())
+
+    def save_clubs(self, clubs):
+        with self._transaction() as connection:
+            connection.execute("DELETE FROM clubs")
+            connection.executemany(
+                "INSERT INTO clubs (name, email, points) VALUES (?, ?, ?) ON CONFLICT (name) DO NOTHING",
+                [(club["name"], club["email"], club["points"]) for club in clubs],
+            )
+
+    def save_competitions(self, competitions):
+        with self._transaction() as connection:
+            connection.execute("DELETE FROM reservations")
+            connection.execute("DELETE FROM competitions")
+            saved = set()
+            for competition in competitions:
+                if competition["name"] in saved:
+                    continue
+                saved.add(competition["name"])
+                connection.execute(
+                    "INSERT INTO competitions (name, date, number_of_places) VALUES (?, ?, ?)",
+                    (competition["name"], competition["date"], competition["numberOfPlaces"]),
+                )
+                connection.executemany(
+                    "INSERT INTO reservations (competition_name, club_name, reserved_places) VALUES (?, ?, ?)",
+                    [
+                        (competition["name"], entry["club_name"], entry["reserved_places"])
+                        for entry in competition.get("reserved_places") or []
+                    ],
+                )
+
+    def commit_booking(self, club, competition, places, clubs, competitions):
+        self.commit_bookings([(club, competition, places)], clubs, competitions)
+
+    def commit_bookings(self, bookings, clubs, competitions):
+        with self._transaction() as connection:
+            for club, competition, places in bookings:
+                connection.execute("UPDATE clubs SET points = points - ? WHERE name = ?", (places, club["name"]))
+                connection.execute(
+                    "UPDATE competitions SET number_of_places = number_of_places - ? WHERE name = ?",
+                    (places, competition["name"]),
+                )
+                connection.execute(
+                    "INSERT INTO reservations (competition_name, club_name, reserved_places) VALUES (?, ?, ?) "
+                    "ON CONFLICT (competition_name, club_name) "
+                    "DO UPDATE SET reserved_places = reserved_places + excluded.reserved_places",
+                    (competition["name"], club["name"], places),
+                )
+
+    def load_result(self, key, now):
+        with self._connection_lock:
+            row = (
+                self._connection()
+                .execute(
+                    "SELECT expires_at, result FROM idempotency_results WHERE key = ? AND expires_at > ?", (key, now)
+                )
+                .fetchone()
+            )
+        return (row[0], json.loads(row[1])) if row else None
+
+    def save_result(self, key, result, expires_at, max_results):
+        with self._transaction() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO idempotency_results (key, result, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(result), expires_at),
+            )
+            connection.execute("DELETE FROM idempotency_results WHERE expires_at <= ?", (time.time(),))
+            connection.execute(
+                "DELETE FROM idempotency_results WHERE key IN "
+                "(SELECT key FROM idempotency_results ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+                (max_results,),
+            )
+
+    def take_token(self, key, rate, burst, now):
+        with self._transaction(self._limits_connection) as connection:
+            row = connection.execute("SELECT tokens, updated_at FROM rate_limits WHERE key = ?", (key,)).fetchone()
+            tokens, retry_after = consume_token(*(row or (burst, now)), rate, burst, now)
+            connection.execute(
+                "INSERT OR REPLACE INTO rate_limits (key, tokens, updated_at) VALUES (?, ?, ?)", (key, tokens, now)
+            )
+        return retry_after
+
+    def signature(self):
+        with self._connection_lock:
+            return self._connection_pid, self._connection().execute("PRAGMA data_version").fetchone()[0]
+
+    def lock(self, shared=False):
+        return file_lock(f"{self.path}.lock", shared)
@@ -1,83 +1,68 @@
-from gudlift_reservation import app
+import copy
+
+import pytest
+
 from gudlift_reservation.json_handler import (load_clubs, load_competitions,
                                               save_clubs, save_competitions)
+from gudlift_reservation.server import create_app
 
 
 class TestSetup:
     """
-    Configuration des tests,  création des données de tests et nettoyage aprés les tests.
+    Configuration des tests, création des données de tests et isolation de chaque test.
+
+    Chaque test a son propre dossier de données (copie des fichiers json du dépôt et données de tests)
+    et sa propre application avec un stockage en mémoire initialisé depuis ce dossier.
+    Les fichiers json du dépôt ne sont jamais modifiés : les tests peuvent s'exécuter en parallèle.
     """
 
+    # données de tests
+    test_clubs_data = [
+        {"name": "Club_test", "email": "club_test@email.fr", "points": 15},
+        {"name": "Club_test_2", "email": "club_test_2@email.fr", "points": 10},
+    ]
+
+    test_competitions_data = [
+        {
+            "name": "Competition_test",
+            "date": "2030-03-27 10:00:00",
+            "numberOfPlaces": 10,
+            "reserved_places": [],
+        },
+        {
+            "name": "Competition_test_2",
+            "date": "2030-03-27 10:00:00",
+            "numberOfPlaces": 15,
+            "reserved_places": [],
+        },
+    ]
+
     @classmethod
     def setup_class(cls):
         """
         Méthode de configuration de classe exécutée une seule fois avant tous les tests.
-        Initialise un client de test Flask.
-        Ajoute les données de tests clubs et competitions
-        Cree une sauvegarde des données initiales.
-        """
-        app.testing = True
-        cls.client = app.test_client()
-        cls.clubs = load_clubs()
-        cls.competitions = load_competitions()
-
-        # données de tests
-        cls.test_clubs_data = [
-            {"name": "Club_test", "email": "club_test@email.fr", "points": 15},
-            {"name": "Club_test_2", "email": "club_test_2@email.fr", "points": 10},
-        ]
-
-        cls.test_competitions_data = [
-            {
-                "name": "Competition_test",
-                "date": "2030-03-27 10:00:00",
-                "numberOfPlaces": 10,
-                "reserved_places": [],
-            },
-            {
-                "name": "Competition_test_2",
-                "date": "2030-03-27 10:00:00",
-                "numberOfPlaces": 15,
-                "reserved_places": [],
-            },
-        ]
-
-        # Ajoute les données de tests
-        cls.clubs.extend(cls.test_clubs_data)
-        save_clubs(cls.clubs)
-        cls.competitions.extend(cls.test_competitions_data)
-        save_competitions(cls.competitions)
-
-        # Crée une sauvegarde
-        cls.clubs_save = load_clubs()
-        cls.competitions_save = load_competitions()
-
-    def setup_method(self):
-        """
-        Méthode de configuration executée au début de chaque test
-        Charge les données des clubs et des compétitions.
+        Charge les données du dépôt complétées des données de tests.
         """
-        self.clubs = load_clubs()
-        self.competitions = load_competitions()
+        cls.initial_clubs = load_clubs() + cls.test_clubs_data
+        cls.initial_competitions = load_competitions() + cls.test_competitions_data
 
-    def teardown_method(self):
-        """
-        Méthode de configuration executée a la fin de chaque test
-        Rétablit les données de tests initiales.
-        """
-        save_clubs(self.clubs_save)
-        save_competitions(self.competitions_save)
-
-    @classmethod
-    def teardown_class(cls):
+    @pytest.fixture(autouse=True)
+    def isolated_store(self, tmp_path):
         """
-        Méthode de configuration executée a la fin de tous les tests.
-        Rétablit les fichiers json d'origine, en supprimant les données de tests.
+        Fixture exécutée pour chaque test.
+        Écrit les données de tests dans un dossier temporaire et crée une application de test
+        avec un stockage en mémoire isolé. Les données sont chargées dans self.clubs et self.competitions.
         """
-        for club in cls.test_clubs_data:
-            cls.clubs_save.remove(club)
-        save_clubs(cls.clubs_save)
+        self.data_dir = str(tmp_path)
+        save_clubs(copy.deepcopy(self.initial_clubs), self.data_dir)
+        save_competitions(copy.deepcopy(self.initial_competitions), self.data_dir)
 
-        for competition in cls.test_competitions_data:
-            cls.competitions_save.remove(competition)
-        save_competitions(cls.competitions_save)
+        self.app = create_app({"TESTING": True, "DATA_DIR": self.data_dir, "STORAGE_BACKEND": "memory"})
+        self.client = self.app.test_client()
+        self.repository = self.app.extensions["gudlft"]["repository"]
+        self.storage = self.repository.storage
+        self.clubs = load_clubs(self.data_dir)
+        self.competitions = load_competitions(self.data_dir)
+        yield
+        if self.repository.writer is not None:
+            self.repository.writer.stop()
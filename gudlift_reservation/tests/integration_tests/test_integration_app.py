@@ -1,9 +1,6 @@
 import pytest
 from flask import session
 
-from gudlift_reservation.json_handler import (load_clubs, load_competitions,
-                                              save_competitions)
-
 from .. import TestSetup
 
 
@@ -51,8 +48,8 @@ class TestIntegrationApp(TestSetup):
             assert session.get("user_id") == email
 
             # données apres la requete
-            self.clubs = load_clubs()
-            self.competitions = load_competitions()
+            self.clubs = self.storage.load_clubs()
+            self.competitions = self.storage.load_competitions()
             club = next(club for club in self.clubs if club["name"] == club_name)
             competition = next(comp for comp in self.competitions if comp["name"] == competition_name)
 
@@ -0,0 +1,20 @@
+"""
+Génération de jeux de données synthétiques pour les tests de performances.
+"""
+
+
+def make_clubs(size, points=15):
+    """
+    Retourne une liste de clubs synthétiques.
+    """
+    return [{"name": f"Club {i}", "email": f"club{i}@example.com", "points": points} for i in range(size)]
+
+
+def make_competitions(size, date="2030-10-22 13:30:00", places=25):
+    """
+    Retourne une liste de compétitions synthétiques.
+    """
+    return [
+        {"name": f"Competition {i}", "date": date, "numberOfPlaces": places, "reserved_places": []}
+        for i in range(size)
+    ]
@@ -1,32 +1,263 @@
-from locust import HttpUser, between, task
+"""
+Scénarios de charge locust.
 
+Par défaut, le fichier génère un jeu de données (clubs et compétitions à venir) dans un dossier
+temporaire et démarre l'application dans le processus de locust : aucun serveur n'est nécessaire.
 
-class PerfTest(HttpUser):
+    locust --headless -u 50 -r 10 -t 1m
+
+Avec --no-serve, les scénarios visent le serveur --host ; avec --seed-dir, le jeu de données
+est généré dans le dossier des données de ce serveur (GUDLFT_DATA_DIR), qui le recharge.
+
+À la fin du test, le code de sortie est non nul si le 95e centile des temps de réponse dépasse
+--slo-p95-ms (--slo-read-p95-ms pour / et /login), si le taux d'erreur dépasse --slo-error-rate
+ou si la compétition disputée a vendu plus de places qu'elle n'en avait.
+Les réponses 429 du contrôle d'admission des réservations ne sont pas des erreurs.
+"""
+
+import json
+import os
+import random
+import tempfile
+import threading
+
+from locust import HttpUser, between, events, task
+
+# compétition disputée par tous les utilisateurs du scénario de contention
+CONTENDED_COMPETITION = "Competition 0"
+CONTENDED_PLACES = 100
+
+# messages de refus attendus d'une réservation (règles métier, pas des erreurs)
+REJECTIONS = (
+    "use no more than 12 places per competition",
+    "insufficient places in the competition",
+    "insufficient number of points",
+)
+
+# routes de lecture qui doivent rester rapides pendant un pic de réservations
+READ_ROUTES = ("/", "/login")
+
+
+@events.init_command_line_parser.add_listener
+def add_arguments(parser):
+    parser.add_argument("--clubs", type=int, default=1000, help="Number of generated clubs")
+    parser.add_argument("--competitions", type=int, default=50, help="Number of generated future competitions")
+    parser.add_argument("--seed-dir", default=None, help="Data directory to seed (defaults to a temporary one)")
+    parser.add_argument("--no-serve", action="store_true", help="Do not start the app, use --host instead")
+    parser.add_argument("--slo-p95-ms", type=float, default=500, help="Maximum p95 response time (ms)")
+    parser.add_argument("--slo-error-rate", type=float, default=0.01, help="Maximum error rate")
+    parser.add_argument("--no-etag", action="store_true", help="Poll the points board without If-None-Match")
+    parser.add_argument(
+        "--slo-read-p95-ms", type=float, default=200, help="Maximum p95 response time of / and /login (ms)"
+    )
+
+
+def seed(data_dir, clubs, competitions):
+    """
+    Écrit les clubs et les compétitions du test de charge dans data_dir, sans importer l'application,
+    pour qu'ils soient lus par create_app du serveur démarré ou visé par --no-serve.
+    La compétition disputée a peu de places pour que les réservations se la disputent.
+    """
+    generated = {
+        "clubs.json": {
+            "clubs": [{"name": f"Club {i}", "email": f"club{i}@example.com", "points": 10**6} for i in range(clubs)]
+        },
+        "competitions.json": {
+            "competitions": [
+                {
+                    "name": f"Competition {i}",
+                    "date": "2030-10-22 13:30:00",
+                    "numberOfPlaces": CONTENDED_PLACES if f"Competition {i}" == CONTENDED_COMPETITION else 10**6,
+                    "reserved_places": [],
+                }
+                for i in range(competitions)
+            ]
+        },
+    }
+    os.makedirs(data_dir, exist_ok=True)
+    for file_name, data in generated.items():
+        with open(os.path.join(data_dir, file_name), "w", encoding="utf-8") as f:
+            json.dump(data, f)
+
+
+def serve(environment):
+    """
+    Démarre l'application dans un thread du processus de locust.
+    Le dossier des données est lu dans GUDLFT_DATA_DIR à la création de l'application.
+    """
+    from werkzeug.serving import make_server
+
+    from gudlift_reservation import create_app, warm_up
+
+    server = make_server("127.0.0.1", 0, warm_up(create_app()), threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    environment.host = f"http://127.0.0.1:{server.server_port}"
+    for user_class in environment.user_classes:
+        user_class.host = environment.host
+
+
+@events.init.add_listener
+def on_init(environment, **kwargs):
+    options = environment.parsed_options
+    if options is None:
+        return
+    serve_app = not options.no_serve
+    if options.seed_dir or serve_app:
+        environment.seed_dir = options.seed_dir or tempfile.mkdtemp(prefix="gudlft-locust-")
+        seed(environment.seed_dir, options.clubs, options.competitions)
+        os.environ["GUDLFT_DATA_DIR"] = environment.seed_dir
+    if serve_app:
+        serve(environment)
+
+
+@events.quitting.add_listener
+def check_slo(environment, **kwargs):
+    """
+    Vérifie les objectifs de latence et de taux d'erreur, et l'absence de surréservation.
+    """
+    options = environment.parsed_options
+    if options is None:
+        return
+    total = environment.stats.total
+    p95 = total.get_response_time_percentile(0.95) or 0
+    failures = []
+    if p95 > options.slo_p95_ms:
+        failures.append(f"p95 {p95:.0f} ms > {options.slo_p95_ms:.0f} ms")
+    if total.fail_ratio > options.slo_error_rate:
+        failures.append(f"error rate {total.fail_ratio:.2%} > {options.slo_error_rate:.2%}")
+    # les routes de lecture restent rapides pendant le pic de réservations
+    for name in READ_ROUTES:
+        entry = environment.stats.entries.get((name, "GET"))
+        read_p95 = entry.get_response_time_percentile(0.95) if entry and entry.num_requests else 0
+        if read_p95 > options.slo_read_p95_ms:
+            failures.append(f"{name} p95 {read_p95:.0f} ms > {options.slo_read_p95_ms:.0f} ms")
+
+    seed_dir = getattr(environment, "seed_dir", None)
+    if seed_dir:
+        with open(os.path.join(seed_dir, "competitions.json"), encoding="utf-8") as f:
+            competitions = json.load(f)["competitions"]
+        competition = next(c for c in competitions if c["name"] == CONTENDED_COMPETITION)
+        reserved = sum(entry["reserved_places"] for entry in competition["reserved_places"])
+        if competition["numberOfPlaces"] < 0 or reserved + competition["numberOfPlaces"] != CONTENDED_PLACES:
+            failures.append(
+                f"{CONTENDED_COMPETITION} oversold: {reserved} reserved, {competition['numberOfPlaces']} left"
+            )
+
+    for failure in failures:
+        print(f"SLO failed: {failure}")
+    if failures:
+        environment.process_exit_code = 1
+
+
+class ClubUser(HttpUser):
+    """
+    Secrétaire d'un club : connexion, résumé, réservation dans une compétition à venir, résumé.
+    """
+
+    abstract = True
     wait_time = between(1, 2)
 
-    @task
-    def index(self):
-        self.client.get("/")
+    def on_start(self):
+        options = self.environment.parsed_options
+        club_id = random.randrange(options.clubs)
+        self.club_name = f"Club {club_id}"
+        self.email = f"club{club_id}@example.com"
+
+    def choose_competition(self):
+        return f"Competition {random.randrange(self.environment.parsed_options.competitions)}"
+
+    def summary(self):
+        self.client.post("/showSummary", data={"email": self.email}, name="/showSummary")
+
+    def purchase(self, competition_name, places):
+        with self.client.post(
+            "/purchasePlaces",
+            data={"club": self.club_name, "competition": competition_name, "places": places},
+            name="/purchasePlaces",
+            catch_response=True,
+        ) as response:
+            # 429 : réservation refusée par le contrôle d'admission, à réessayer plus tard
+            if response.status_code == 429:
+                response.success()
+            elif "Great-booking complete!" in response.text or any(message in response.text for message in REJECTIONS):
+                response.success()
+            else:
+                response.failure("booking neither completed nor rejected by a business rule")
 
     @task
-    def login(self):
+    def journey(self):
+        competition_name = self.choose_competition()
         self.client.get("/login")
+        self.summary()
+        with self.client.get(
+            f"/book/{competition_name}/{self.club_name}", name="/book/[competition]/[club]", catch_response=True
+        ) as response:
+            if response.status_code == 429:
+                response.success()
+        self.purchase(competition_name, random.randint(1, 3))
+        self.summary()
 
-    @task
-    def show_summary(self):
-        self.client.post("/showSummary", data={"email": "john@simplylift.co"})
+
+class BookingUser(ClubUser):
+    """
+    Réservations réparties sur toutes les compétitions à venir.
+    """
+
+    weight = 4
+
+
+class ContentionUser(ClubUser):
+    """
+    Réservations de tous les utilisateurs dans la même compétition.
+    """
+
+    weight = 1
+    wait_time = between(0.1, 0.5)
+
+    def choose_competition(self):
+        return CONTENDED_COMPETITION
+
+
+class SpikeUser(ClubUser):
+    """
+    Pic de réservations à l'ouverture d'une compétition disputée : réservations sans attente.
+    Les requêtes au-delà des limites reçoivent 429 ; les routes de lecture doivent rester rapides
+    (--slo-read-p95-ms).
+    """
+
+    weight = 2
+    wait_time = between(0, 0.05)
+
+    def choose_competition(self):
+        return CONTENDED_COMPETITION
 
     @task
-    def purchase_places(self):
-        self.client.post(
-            "/purchasePlaces",
-            data={
-                "competition": "Spring Festival",
-                "club": "Simply pytestLift",
-                "places": 1,
-            },
-        )
+    def journey(self):
+        self.purchase(self.choose_competition(), 1)
+
+
+class BoardUser(HttpUser):
+    """
+    Visiteur qui consulte régulièrement le tableau des points des clubs (page d'accueil).
+    La page est redemandée avec son ETag : tant que les points ne changent pas, le serveur répond 304.
+    Avec --no-etag, la page complète est demandée à chaque fois, pour comparer les débits.
+    """
+
+    weight = 2
+    wait_time = between(0.5, 1)
+
+    def on_start(self):
+        self.etag = None
 
     @task
-    def logout(self):
-        self.client.get("/logout")
+    def board(self):
+        use_etag = self.etag and not self.environment.parsed_options.no_etag
+        headers = {"If-None-Match": self.etag} if use_etag else {}
+        with self.client.get("/", headers=headers, name="/", catch_response=True) as response:
+            if response.status_code == 200:
+                self.etag = response.headers.get("ETag")
+                response.success()
+            elif response.status_code == 304:
+                response.success()
+            else:
+                response.failure(f"unexpected status {response.status_code}")
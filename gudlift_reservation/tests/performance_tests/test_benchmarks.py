@@ -0,0 +1,216 @@
+"""
+Micro-benchmarks des fonctions de utils et json_handler et des routes de l'application.
+
+Les benchmarks sont longs (jusqu'à 1 000 000 de clubs et de compétitions) et ne sont exécutés
+que si la variable d'environnement GUDLFT_BENCHMARK est définie :
+
+    GUDLFT_BENCHMARK=1 pytest gudlift_reservation/tests/performance_tests/test_benchmarks.py -s
+
+Variables d'environnement :
+    GUDLFT_BENCHMARK_SIZES : tailles des jeux de données (par défaut 10,1000,100000,1000000)
+    GUDLFT_BENCHMARK_BASELINE : fichier des résultats de référence (par défaut benchmark_baseline.json)
+    GUDLFT_BENCHMARK_THRESHOLD : régression tolérée par rapport à la référence (par défaut 0.5, soit +50 %)
+    GUDLFT_BENCHMARK_SAVE : enregistre les résultats comme nouvelle référence
+
+Un benchmark absent de la référence y est ajouté ; un benchmark plus lent que la référence
+au-delà du seuil échoue.
+"""
+
+import itertools
+import json
+import os
+import random
+import timeit
+
+import pytest
+
+from gudlift_reservation import json_handler
+from gudlift_reservation.server import create_app
+from gudlift_reservation.utils import (reserv_places_competition, valid_club_and_competition,
+                                       valid_form_purchase_places, verif_date_in_past)
+
+from .datasets import make_clubs, make_competitions
+
+pytestmark = pytest.mark.skipif(not os.environ.get("GUDLFT_BENCHMARK"), reason="set GUDLFT_BENCHMARK to run")
+
+SIZES = [int(size) for size in os.environ.get("GUDLFT_BENCHMARK_SIZES", "10,1000,100000,1000000").split(",")]
+BASELINE_FILE = os.environ.get(
+    "GUDLFT_BENCHMARK_BASELINE", os.path.join(os.path.dirname(__file__), "benchmark_baseline.json")
+)
+THRESHOLD = float(os.environ.get("GUDLFT_BENCHMARK_THRESHOLD", "0.5"))
+SAVE_BASELINE = bool(os.environ.get("GUDLFT_BENCHMARK_SAVE"))
+
+# nombre d'appels distincts par mesure des fonctions rapides
+CALLS = 1000
+
+
+def measure(function, repeat=3):
+    """
+    Retourne la meilleure durée (en secondes) d'un appel de la fonction.
+    Le nombre d'appels par mesure est choisi pour durer au moins 0,2 seconde.
+    """
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+@pytest.fixture(scope="module")
+def baseline():
+    """
+    Résultats de référence, enregistrés à la fin des benchmarks.
+    """
+    reference = {}
+    if os.path.exists(BASELINE_FILE):
+        with open(BASELINE_FILE, encoding="utf-8") as f:
+            reference = json.load(f)
+    results = {}
+
+    def check(name, size, seconds):
+        key = f"{name}[{size}]"
+        results[key] = seconds
+        print(f"\n{key:<40} {seconds * 1e6:12.2f} us", end="")
+        if key in reference and not SAVE_BASELINE:
+            assert seconds <= reference[key] * (1 + THRESHOLD), (
+                f"{key} regressed: {seconds * 1e6:.2f} us > {reference[key] * 1e6:.2f} us + {THRESHOLD:.0%}"
+            )
+
+    yield check
+
+    if SAVE_BASELINE:
+        reference.update(results)
+    else:
+        for key, seconds in results.items():
+            reference.setdefault(key, seconds)
+    with open(BASELINE_FILE, "w", encoding="utf-8") as f:
+        json.dump(reference, f, indent=4, sort_keys=True)
+
+
+@pytest.fixture(scope="module", params=SIZES)
+def dataset(request, tmp_path_factory):
+    """
+    Jeu de données synthétique de size clubs et size compétitions, chargé dans une application
+    dont les données sont enregistrées dans un dossier temporaire avec un journal des réservations.
+    """
+    size = request.param
+    data_dir = str(tmp_path_factory.mktemp(f"benchmark-{size}"))
+    json_handler.save_clubs(make_clubs(size, points=10**9), data_dir)
+    json_handler.save_competitions(make_competitions(size, places=10**9), data_dir)
+
+    app = create_app(
+        {"TESTING": True, "DATA_DIR": data_dir, "PERSISTENCE_MODE": "journal", "RATE_LIMIT_ENABLED": False}
+    )
+    data_repository = app.extensions["gudlft"]["repository"]
+
+    rng = random.Random(size)
+    pairs = [(f"Club {rng.randrange(size)}", f"Competition {rng.randrange(size)}") for _ in range(CALLS)]
+    return size, data_dir, data_repository, pairs, app
+
+
+def test_valid_club_and_competition(baseline, dataset):
+    """
+    Mesure la validation du club et de la compétition par les index.
+    """
+    size, _, data_repository, pairs, _ = dataset
+
+    def run():
+        for club_name, competition_name in pairs:
+            valid_club_and_competition(
+                club_name, data_repository.clubs_by_name, competition_name, data_repository.competitions_by_name
+            )
+
+    baseline("valid_club_and_competition", size, measure(run) / CALLS)
+
+
+def test_reserv_places_competition(baseline, dataset):
+    """
+    Mesure la réservation de places avec le registre des réservations.
+    """
+    size, _, data_repository, pairs, _ = dataset
+    bookings = [
+        (data_repository.clubs_by_name[club_name], data_repository.competitions_by_name[competition_name])
+        for club_name, competition_name in pairs
+    ]
+
+    def run():
+        for club, competition in bookings:
+            reserv_places_competition(club, competition, 1, data_repository.ledger)
+        # annule les réservations pour ne pas atteindre la limite de places par club
+        for club, competition in bookings:
+            data_repository.ledger.record(club, competition, -1)
+
+    baseline("reserv_places_competition", size, measure(run) / CALLS)
+
+
+def test_valid_form_purchase_places(baseline, dataset):
+    """
+    Mesure la validation du formulaire de réservation.
+    """
+    size, _, data_repository, pairs, _ = dataset
+    forms = [
+        {"club": club_name, "competition": competition_name, "places": "1"} for club_name, competition_name in pairs
+    ]
+
+    def run():
+        for form in forms:
+            valid_form_purchase_places(
+                data_repository.clubs_by_name,
+                data_repository.competitions_by_name,
+                form,
+                data_repository.competition_dates,
+            )
+
+    baseline("valid_form_purchase_places", size, measure(run) / CALLS)
+
+
+@pytest.mark.parametrize("parsed", [False, True], ids=["string", "datetime"])
+def test_verif_date_in_past(baseline, dataset, parsed):
+    """
+    Mesure la vérification de la date d'une compétition, convertie ou non.
+    """
+    size, _, data_repository, pairs, _ = dataset
+    dates = [
+        data_repository.competition_dates[name] if parsed else data_repository.competitions_by_name[name]["date"]
+        for _, name in pairs
+    ]
+
+    def run():
+        for date in dates:
+            verif_date_in_past(date)
+
+    baseline(f"verif_date_in_past_{'datetime' if parsed else 'string'}", size, measure(run) / CALLS)
+
+
+def test_load_and_save_data(baseline, dataset):
+    """
+    Mesure la lecture et l'écriture du fichier des clubs.
+    """
+    size, data_dir, _, _, _ = dataset
+    data = json_handler.load_data("clubs.json", data_dir)
+
+    baseline("load_data", size, measure(lambda: json_handler.load_data("clubs.json", data_dir)))
+    baseline("save_data", size, measure(lambda: json_handler.save_data(data, "clubs.json", data_dir)))
+
+
+@pytest.mark.parametrize("route", ["book", "purchase_places", "show_summary"])
+def test_route(baseline, dataset, route):
+    """
+    Mesure le traitement complet d'une requête par le client de test Flask.
+    """
+    size, _, data_repository, pairs, app = dataset
+    client = app.test_client()
+    club_name, competition_name = pairs[0]
+    # chaque réservation porte sur un couple différent pour ne pas atteindre la limite de places par club
+    forms = itertools.cycle(
+        {"club": club_name, "competition": competition_name, "places": 1} for club_name, competition_name in pairs
+    )
+    requests = {
+        "book": lambda: client.get(f"/book/{competition_name}/{club_name}"),
+        "purchase_places": lambda: client.post("/purchasePlaces", data=next(forms)),
+        "show_summary": lambda: client.post(
+            "/showSummary", data={"email": data_repository.clubs_by_name[club_name]["email"]}
+        ),
+    }
+    assert requests[route]().status_code == 200
+
+    baseline(f"route_{route}", size, measure(requests[route]))
+
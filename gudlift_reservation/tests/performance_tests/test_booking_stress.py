@@ -0,0 +1,194 @@
+import multiprocessing
+import random
+import sys
+import threading
+import time
+
+from gudlift_reservation.json_handler import load_clubs, load_competitions, save_clubs, save_competitions
+from gudlift_reservation.server import create_app
+
+from .. import TestSetup
+from .datasets import make_clubs
+
+THREADS = 8
+PROCESSES = 4
+ATTEMPTS_PER_THREAD = 40
+COMPETITION_PLACES = 100
+STRESS_CLUBS = 20
+
+
+class TestBookingStress(TestSetup):
+    """
+    Test de charge du service de réservation avec des requêtes concurrentes.
+    """
+
+    def test_concurrent_bookings_never_oversell(self):
+        """
+        Plusieurs threads réservent en parallèle des places dans la même compétition.
+        Vérifie qu'aucune place n'est vendue en trop, qu'aucune déduction de points n'est perdue
+        et que le quota de 12 places par club est respecté.
+        """
+        stress_clubs = make_clubs(STRESS_CLUBS, points=30)
+        stress_competition = {
+            "name": "Competition_stress",
+            "date": "2030-03-27 10:00:00",
+            "numberOfPlaces": COMPETITION_PLACES,
+            "reserved_places": [],
+        }
+        save_clubs(self.clubs + stress_clubs, self.data_dir)
+        save_competitions(self.competitions + [stress_competition], self.data_dir)
+        # application avec le stockage JSON du dossier de données du test, sans limitation de débit
+        app = create_app({"TESTING": True, "DATA_DIR": self.data_dir, "RATE_LIMIT_ENABLED": False})
+
+        booked = []
+        booked_lock = threading.Lock()
+
+        def worker(seed):
+            rng = random.Random(seed)
+            client = app.test_client()
+            for _ in range(ATTEMPTS_PER_THREAD):
+                club = rng.choice(stress_clubs)
+                places = rng.randint(1, 3)
+                response = client.post(
+                    "/purchasePlaces",
+                    data={"competition": stress_competition["name"], "club": club["name"], "places": places},
+                )
+                if response.status_code == 200:
+                    with booked_lock:
+                        booked.append((club["name"], places))
+
+        threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(THREADS)]
+        # changements de thread très fréquents pour provoquer les situations de concurrence
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            start = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - start
+        finally:
+            sys.setswitchinterval(switch_interval)
+
+        requests_count = THREADS * ATTEMPTS_PER_THREAD
+        print(f"\n{len(booked)} bookings / {requests_count} requests : {len(booked) / elapsed:.0f} bookings/sec")
+
+        clubs = {club["name"]: club for club in load_clubs(self.data_dir)}
+        competition = next(
+            comp for comp in load_competitions(self.data_dir) if comp["name"] == stress_competition["name"]
+        )
+        booked_places = sum(places for _, places in booked)
+
+        # aucune place vendue en trop
+        assert competition["numberOfPlaces"] >= 0
+        assert competition["numberOfPlaces"] == COMPETITION_PLACES - booked_places
+        assert sum(entry["reserved_places"] for entry in competition["reserved_places"]) == booked_places
+
+        # aucune déduction de points perdue et quota par club respecté
+        for entry in competition["reserved_places"]:
+            assert entry["reserved_places"] <= 12
+            club_booked = sum(places for name, places in booked if name == entry["club_name"])
+            assert entry["reserved_places"] == club_booked
+            assert clubs[entry["club_name"]]["points"] == 30 - club_booked
+
+    def test_unrelated_bookings_are_serialized(self):
+        """
+        Deux threads réservent en même temps dans deux compétitions sans club en commun.
+        Vérifie que les réservations sont exécutées l'une après l'autre sous le verrou exclusif du stockage
+        (jamais deux écritures en même temps) et qu'elles réussissent toutes les deux.
+        """
+        app = create_app({"TESTING": True, "DATA_DIR": self.data_dir, "RATE_LIMIT_ENABLED": False})
+        storage = app.extensions["gudlft"]["repository"].storage
+        service = app.extensions["gudlft"]["booking_service"]
+        active = []
+        overlaps = []
+        commit_bookings = storage.commit_bookings
+
+        def slow_commit(*args):
+            active.append(None)
+            overlaps.append(len(active))
+            time.sleep(0.05)
+            commit_bookings(*args)
+            active.pop()
+
+        storage.commit_bookings = slow_commit
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda form: results.append(service.purchase_places(form)[0]),
+                args=({"club": club, "competition": competition, "places": 1},),
+            )
+            for club, competition in (("Club_test", "Competition_test"), ("Club_test_2", "Competition_test_2"))
+        ]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == [True, True]
+        assert overlaps == [1, 1]
+        assert time.perf_counter() - start >= 0.1
+
+    def test_multi_process_bookings_never_oversell(self):
+        """
+        Plusieurs processus (comme des workers gunicorn) réservent en parallèle dans la même compétition.
+        Vérifie que les écritures atomiques et le verrou fcntl empêchent toute vente en trop
+        et toute perte de mise à jour entre processus.
+        """
+        stress_clubs = make_clubs(STRESS_CLUBS, points=30)
+        stress_competition = {
+            "name": "Competition_stress",
+            "date": "2030-03-27 10:00:00",
+            "numberOfPlaces": COMPETITION_PLACES,
+            "reserved_places": [],
+        }
+        save_clubs(self.clubs + stress_clubs, self.data_dir)
+        save_competitions(self.competitions + [stress_competition], self.data_dir)
+
+        context = multiprocessing.get_context("fork")
+        results = context.Queue()
+        processes = [
+            context.Process(
+                target=book_in_process,
+                args=(seed, self.data_dir, stress_clubs, stress_competition["name"], results),
+            )
+            for seed in range(PROCESSES)
+        ]
+        for process in processes:
+            process.start()
+        booked = [booking for _ in processes for booking in results.get(timeout=60)]
+        for process in processes:
+            process.join()
+
+        clubs = {club["name"]: club for club in load_clubs(self.data_dir)}
+        competition = next(
+            comp for comp in load_competitions(self.data_dir) if comp["name"] == stress_competition["name"]
+        )
+        booked_places = sum(places for _, places in booked)
+
+        assert competition["numberOfPlaces"] >= 0
+        assert competition["numberOfPlaces"] == COMPETITION_PLACES - booked_places
+        for entry in competition["reserved_places"]:
+            club_booked = sum(places for name, places in booked if name == entry["club_name"])
+            assert entry["reserved_places"] == club_booked
+            assert clubs[entry["club_name"]]["points"] == 30 - club_booked
+
+
+def book_in_process(seed, data_dir, stress_clubs, competition_name, results):
+    """
+    Réserve des places depuis un processus séparé et renvoie les réservations réussies.
+    """
+    rng = random.Random(seed)
+    client = create_app({"TESTING": True, "DATA_DIR": data_dir, "RATE_LIMIT_ENABLED": False}).test_client()
+    booked = []
+    for _ in range(ATTEMPTS_PER_THREAD):
+        club = rng.choice(stress_clubs)
+        places = rng.randint(1, 3)
+        response = client.post(
+            "/purchasePlaces", data={"competition": competition_name, "club": club["name"], "places": places}
+        )
+        if response.status_code == 200:
+            booked.append((club["name"], places))
+    results.put(booked)
@@ -0,0 +1,77 @@
+"""
+Benchmark de la latence des recherches par index (email de club, nom de club et de compétition).
+
+Le benchmark crée jusqu'à 1 000 000 de clubs et de compétitions et n'est exécuté que si la variable
+d'environnement GUDLFT_BENCHMARK est définie :
+
+    GUDLFT_BENCHMARK=1 pytest gudlift_reservation/tests/performance_tests/test_index_benchmark.py -s
+"""
+
+import os
+import random
+import timeit
+
+import pytest
+
+from gudlift_reservation.repository import DataRepository
+from gudlift_reservation.utils import valid_club_and_competition
+
+from .datasets import make_clubs, make_competitions
+
+pytestmark = pytest.mark.skipif(not os.environ.get("GUDLFT_BENCHMARK"), reason="set GUDLFT_BENCHMARK to run")
+
+SIZES = (100, 10_000, 1_000_000)
+LOOKUPS = 10_000
+
+# écart maximal toléré entre la latence la plus lente et la plus rapide :
+# la taille des données est multipliée par 10 000, seuls les défauts de cache
+# processeur doivent faire varier la latence d'une recherche par index
+MAX_LATENCY_RATIO = 25
+
+
+def best_latency(function, keys):
+    """
+    Retourne la meilleure latence moyenne (en secondes) d'une recherche sur plusieurs essais.
+    """
+    timer = timeit.Timer(lambda: [function(key) for key in keys])
+    return min(timer.repeat(repeat=5, number=1)) / len(keys)
+
+
+@pytest.fixture(scope="module")
+def latencies():
+    """
+    Mesure la latence des recherches par index pour chaque taille de jeu de données.
+    """
+    results = {}
+    for size in SIZES:
+        data_repository = DataRepository()
+        data_repository.set_clubs(make_clubs(size))
+        data_repository.set_competitions(make_competitions(size))
+
+        rng = random.Random(size)
+        emails = [f"club{rng.randrange(size)}@example.com" for _ in range(LOOKUPS)]
+        names = [(f"Club {rng.randrange(size)}", f"Competition {rng.randrange(size)}") for _ in range(LOOKUPS)]
+
+        results[size] = {
+            "email": best_latency(data_repository.get_club_by_email, emails),
+            "name": best_latency(
+                lambda pair: valid_club_and_competition(
+                    pair[0], data_repository.clubs_by_name, pair[1], data_repository.competitions_by_name
+                ),
+                names,
+            ),
+        }
+
+    print()
+    for size, result in results.items():
+        print(f"{size:>9} records : email {result['email'] * 1e9:7.0f} ns - names {result['name'] * 1e9:7.0f} ns")
+    return results
+
+
+@pytest.mark.parametrize("lookup", ["email", "name"])
+def test_lookup_latency_is_flat(latencies, lookup):
+    """
+    Vérifie que la latence des recherches reste stable de 100 à 1 000 000 d'enregistrements.
+    """
+    values = [latencies[size][lookup] for size in SIZES]
+    assert max(values) / min(values) < MAX_LATENCY_RATIO
@@ -0,0 +1,56 @@
+"""
+Benchmark de l'empreinte mémoire des clubs et compétitions : dict JSON et enregistrements compacts (models).
+
+Le benchmark alloue jusqu'à 1 000 000 d'enregistrements et n'est exécuté que si la variable
+d'environnement GUDLFT_BENCHMARK est définie :
+
+    GUDLFT_BENCHMARK=1 pytest gudlift_reservation/tests/performance_tests/test_memory_benchmark.py -s
+
+GUDLFT_BENCHMARK_SIZES : tailles des jeux de données (par défaut 10,1000,100000,1000000)
+"""
+
+import copy
+import gc
+import os
+import tracemalloc
+
+import pytest
+
+from gudlift_reservation.models import Club, Competition
+
+from .datasets import make_clubs, make_competitions
+
+pytestmark = pytest.mark.skipif(not os.environ.get("GUDLFT_BENCHMARK"), reason="set GUDLFT_BENCHMARK to run")
+
+SIZES = [int(size) for size in os.environ.get("GUDLFT_BENCHMARK_SIZES", "10,1000,100000,1000000").split(",")]
+
+
+def footprint(build):
+    """
+    Retourne la mémoire (en octets) allouée par build() et toujours utilisée par son résultat.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = build()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return size
+
+
+@pytest.mark.parametrize("size", SIZES)
+@pytest.mark.parametrize("model, make", [(Club, make_clubs), (Competition, make_competitions)])
+def test_records_smaller_than_dicts(model, make, size):
+    """
+    Vérifie que les enregistrements compacts occupent moins de mémoire par enregistrement que les dict.
+    Les chaînes (noms, emails, dates) sont partagées entre les deux représentations :
+    seule la structure des enregistrements est mesurée.
+    """
+    data = make(size)
+    dicts = footprint(lambda: [copy.deepcopy(item) for item in data])
+    records = footprint(lambda: [model.from_dict(item) for item in data])
+
+    print(f"\n{model.__name__:>11} x {size:>9} : dict {dicts / size:6.0f} B - record {records / size:6.0f} B")
+    assert records < dicts
@@ -0,0 +1,118 @@
+import gzip
+import json
+from datetime import datetime
+
+import pytest
+
+from .. import TestSetup
+
+
+class TestApi(TestSetup):
+    """
+    Classe de tests de l'API JSON en lecture seule.
+    """
+
+    def test_competitions(self):
+        """
+        Vérifie la liste paginée des compétitions à venir, avec leurs places et réservations par club.
+        """
+        response = self.client.get("/api/competitions?per_page=1")
+        assert response.status_code == 200
+        data = response.get_json()
+        upcoming = self.repository.upcoming_competitions()
+        assert data["total"] == len(upcoming)
+        assert data["pages"] == len(upcoming)
+        assert len(data["competitions"]) == 1
+        assert set(data["competitions"][0]) == {"name", "date", "numberOfPlaces", "past", "reserved_places"}
+        assert not data["competitions"][0]["past"]
+
+        data = self.client.get("/api/competitions?show_past=1&per_page=500").get_json()
+        assert data["total"] == len(self.repository.competitions)
+
+    @pytest.mark.parametrize("query", ["page=0", "per_page=0", "per_page=100000", "page=x"])
+    def test_invalid_pagination(self, query):
+        """
+        Vérifie qu'une pagination invalide renvoie une erreur 400 au format JSON.
+        """
+        response = self.client.get(f"/api/competitions?{query}")
+        assert response.status_code == 400
+        assert "error" in response.get_json()
+
+    def test_competition(self):
+        """
+        Vérifie le détail d'une compétition, mis à jour après une réservation, et l'erreur 404.
+        """
+        self.client.post("/purchasePlaces", data={"club": "Club_test", "competition": "Competition_test", "places": 2})
+
+        data = self.client.get("/api/competitions/Competition_test").get_json()
+        assert data["numberOfPlaces"] == 8
+        assert data["reserved_places"] == [{"club_name": "Club_test", "reserved_places": 2}]
+
+        response = self.client.get("/api/competitions/Unknown")
+        assert response.status_code == 404
+        assert response.get_json() == {"error": "Competition Unknown not found"}
+
+    def test_clubs(self):
+        """
+        Vérifie le tableau des points des clubs, sans les emails.
+        """
+        data = self.client.get(f"/api/clubs?per_page={len(self.clubs)}").get_json()
+        assert data["total"] == len(self.clubs)
+        assert {"name": "Club_test", "points": 15} in data["clubs"]
+
+    def test_etag(self):
+        """
+        Vérifie la réponse 304 tant que les données ne changent pas,
+        puis une nouvelle version après une réservation.
+        """
+        for url in ("/api/competitions", "/api/competitions/Competition_test", "/api/clubs"):
+            etag, _ = self.client.get(url).get_etag()
+            response = self.client.get(url, headers={"If-None-Match": f'"{etag}"'})
+            assert response.status_code == 304
+
+            self.client.post(
+                "/purchasePlaces", data={"club": "Club_test", "competition": "Competition_test", "places": 1}
+            )
+            response = self.client.get(url, headers={"If-None-Match": f'"{etag}"'})
+            assert response.status_code == 200
+            assert response.get_etag()[0] != etag
+
+    @pytest.mark.parametrize("show_past", ["", "&show_past=1"])
+    def test_etag_changes_when_competition_passes(self, monkeypatch, show_past):
+        """
+        Vérifie que l'ETag de la liste change lorsqu'une compétition devient passée, avec ou sans show_past :
+        le champ "past" n'est pas servi périmé par une réponse 304.
+        """
+        url = f"/api/competitions?per_page=500{show_past}"
+        etag, _ = self.client.get(url).get_etag()
+
+        class Later(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return datetime(2030, 3, 28)
+
+        monkeypatch.setattr("gudlift_reservation.repository.datetime", Later)
+        response = self.client.get(url, headers={"If-None-Match": f'"{etag}"'})
+        assert response.status_code == 200
+        if show_past:
+            listed = {competition["name"]: competition for competition in response.get_json()["competitions"]}
+            assert listed["Competition_test"]["past"] is True
+
+    def test_gzip(self):
+        """
+        Vérifie que les réponses volumineuses sont compressées si le client accepte gzip.
+        """
+        self.app.config["API_GZIP_MIN_SIZE"] = 100
+        response = self.client.get("/api/clubs", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["Vary"]
+        assert json.loads(gzip.decompress(response.data))["total"] == len(self.clubs)
+
+        etag, _ = response.get_etag()
+        response = self.client.get("/api/clubs", headers={"Accept-Encoding": "gzip", "If-None-Match": f'"{etag}"'})
+        assert response.status_code == 304
+
+        self.app.config["API_GZIP_MIN_SIZE"] = 10**6
+        response = self.client.get("/api/clubs", headers={"Accept-Encoding": "gzip"})
+        assert "Content-Encoding" not in response.headers
+        assert response.get_etag()[0] != etag
@@ -0,0 +1,93 @@
+from datetime import datetime
+
+import pytest
+
+from gudlift_reservation.archive import CompetitionArchive
+from gudlift_reservation.journal import BookingJournal
+from gudlift_reservation.json_handler import load_competitions, save_clubs, save_competitions
+from gudlift_reservation.repository import DataRepository
+from gudlift_reservation.server import create_app
+from gudlift_reservation.storage import JsonStorage
+
+from .. import TestSetup
+
+
+class TestArchive(TestSetup):
+    """
+    Classe de tests de l'archive froide des compétitions passées.
+    """
+
+    @pytest.fixture
+    def data_dir(self):
+        """
+        Dossier de données du test complété d'une compétition passée avec des places réservées.
+        """
+        competitions = self.competitions + [
+            {
+                "name": "Old Cup",
+                "date": "2019-05-01 10:00:00",
+                "numberOfPlaces": 5,
+                "reserved_places": [{"club_name": "Club_test", "reserved_places": 3}],
+            }
+        ]
+        save_clubs(self.clubs, self.data_dir)
+        save_competitions(competitions, self.data_dir)
+        return self.data_dir
+
+    def test_archive_past_competitions(self, data_dir):
+        """
+        Vérifie que les compétitions passées sont déplacées dans des fichiers compressés par année
+        avec leurs places réservées, et que les compétitions à venir restent dans les données chaudes.
+        """
+        archive = CompetitionArchive(f"{data_dir}/archive")
+        data_repository = DataRepository(JsonStorage(data_dir))
+
+        archived = data_repository.archive_past(archive)
+
+        assert {competition["name"] for competition in archived} == {"Spring Festival", "Old Cup"}
+        assert archive.partitions() == ["2020", "2019"]
+        assert archive.load("2019")[0]["reserved_places"] == [{"club_name": "Club_test", "reserved_places": 3}]
+        assert [competition["name"] for competition in archive.load("2020")] == ["Spring Festival"]
+
+        hot_names = [competition["name"] for competition in load_competitions(data_dir)]
+        assert "Spring Festival" not in hot_names
+        assert "Competition_test" in hot_names
+        assert "Spring Festival" not in data_repository.competitions_by_name
+
+        # une nouvelle archive ne déplace rien
+        assert data_repository.archive_past(archive) == []
+
+    def test_archive_integrates_journal(self, data_dir):
+        """
+        Vérifie que les réservations journalisées sont intégrées aux données avant l'archivage.
+        """
+        journal = BookingJournal(data_dir=data_dir)
+        journal.append("Club_test", "Competition_test", 2)
+        data_repository = DataRepository(JsonStorage(data_dir, journal))
+
+        data_repository.archive_past(CompetitionArchive(f"{data_dir}/archive"), now=datetime(2025, 1, 1))
+
+        assert journal.size() == 0
+        competition = next(c for c in load_competitions(data_dir) if c["name"] == "Competition_test")
+        assert competition["numberOfPlaces"] == 8
+
+    def test_history_view_and_cli(self, data_dir):
+        """
+        Vérifie la commande archive-competitions et la vue en lecture seule de l'historique.
+        """
+        app = create_app({"TESTING": True, "DATA_DIR": data_dir})
+
+        result = app.test_cli_runner().invoke(args=["archive-competitions"])
+        assert result.exit_code == 0
+        assert "2 competition(s) archived" in result.output
+
+        client = app.test_client()
+        response = client.get("/history")
+        assert response.status_code == 200
+        assert b"Spring Festival" in response.data
+
+        response = client.get("/history?year=2019")
+        assert b"Old Cup" in response.data
+        assert b"Spring Festival" not in response.data
+
+        assert client.get("/history?year=1999").status_code == 404
@@ -0,0 +1,115 @@
+import pytest
+
+from .. import TestSetup
+
+
+class TestBatchBooking(TestSetup):
+    """
+    Classe de tests de la réservation groupée dans plusieurs compétitions.
+    """
+
+    def purchase_batch(self, bookings, club="Club_test"):
+        """
+        Envoie une réservation groupée pour un club.
+        """
+        return self.client.post("/purchaseBatch", json={"club": club, "bookings": bookings})
+
+    def stored(self):
+        """
+        Retourne les points de Club_test et les places des compétitions de tests enregistrés.
+        """
+        clubs = {club["name"]: club for club in self.storage.load_clubs()}
+        competitions = {competition["name"]: competition for competition in self.storage.load_competitions()}
+        return (
+            clubs["Club_test"]["points"],
+            competitions["Competition_test"]["numberOfPlaces"],
+            competitions["Competition_test_2"]["numberOfPlaces"],
+        )
+
+    def test_batch_booked(self):
+        """
+        Vérifie que toutes les réservations du lot sont appliquées et enregistrées en une seule écriture.
+        """
+        writes = []
+        commit_bookings = self.storage.commit_bookings
+        self.storage.commit_bookings = lambda *args: writes.append(args) or commit_bookings(*args)
+
+        response = self.purchase_batch(
+            [{"competition": "Competition_test", "places": 5}, {"competition": "Competition_test_2", "places": 6}]
+        )
+
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data["booked"] and data["points"] == 4
+        assert [result["places"] for result in data["results"]] == [5, 6]
+        assert all(result["booked"] for result in data["results"])
+        assert self.stored() == (4, 5, 9)
+        assert len(writes) == 1
+        assert self.repository.ledger.reserved("Competition_test_2", "Club_test") == 6
+
+    @pytest.mark.parametrize(
+        "bookings, failed_index, error_message",
+        [
+            # les points du club sont décomptés sur l'ensemble du lot
+            (
+                [{"competition": "Competition_test", "places": 8}, {"competition": "Competition_test_2", "places": 8}],
+                1,
+                "insufficient number of points",
+            ),
+            # le quota de 12 places est vérifié sur l'ensemble du lot
+            (
+                [
+                    {"competition": "Competition_test_2", "places": 7},
+                    {"competition": "Competition_test_2", "places": 6},
+                ],
+                1,
+                "use no more than 12 places per competition",
+            ),
+            ([{"competition": "Competition_test", "places": 0}], 0, "Number of places required must be positive"),
+            ([{"competition": "Competition_test", "places": 2}, {"competition": "Unknown", "places": 1}], 1, None),
+            # types JSON invalides : refusés par réservation, sans erreur 500
+            ([{"competition": "Competition_test"}], 0, "Invalid number"),
+            ([{"competition": "Competition_test", "places": None}], 0, "Invalid number"),
+            ([{"competition": "Competition_test", "places": [2]}], 0, "Invalid number"),
+            ([{"competition": "Competition_test", "places": "2"}], 0, "Invalid number"),
+            ([{"competition": "Competition_test", "places": 2.7}], 0, "Invalid number"),
+            ([{"competition": "Competition_test", "places": True}], 0, "Invalid number"),
+            ([{"competition": ["Competition_test"], "places": 1}], 0, None),
+            ([{"places": 1}], 0, None),
+        ],
+    )
+    def test_batch_rejected(self, bookings, failed_index, error_message):
+        """
+        Vérifie qu'aucune réservation n'est appliquée si une réservation du lot est invalide.
+        """
+        before = self.stored()
+        response = self.purchase_batch(bookings)
+
+        assert response.status_code == 400
+        data = response.get_json()
+        assert not data["booked"] and data["points"] == 15
+        results = data["results"]
+        assert results[failed_index]["error_message"] == (error_message or "Invalid competition")
+        assert not any(result["booked"] for result in results)
+        assert self.stored() == before
+        assert self.repository.ledger.reserved("Competition_test", "Club_test") == 0
+
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            None,
+            {"club": "Club_test"},
+            {"club": "Club_test", "bookings": []},
+            {"club": "Unknown", "bookings": [{"competition": "Competition_test", "places": 1}]},
+            {"club": ["Club_test"], "bookings": [{"competition": "Competition_test", "places": 1}]},
+            {"club": None, "bookings": [{"competition": "Competition_test", "places": 1}]},
+            {"club": "Club_test", "bookings": [{"competition": "Competition_test", "places": 1}] * 51},
+        ],
+    )
+    def test_invalid_payload(self, payload):
+        """
+        Vérifie les erreurs 400 d'une requête invalide.
+        """
+        response = self.client.post("/purchaseBatch", json=payload)
+        assert response.status_code == 400
+        assert "error" in response.get_json()
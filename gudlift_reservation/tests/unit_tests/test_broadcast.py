@@ -0,0 +1,91 @@
+import json
+
+from gudlift_reservation.broadcast import BroadcastHub
+
+from .. import TestSetup
+
+
+class TestBroadcast(TestSetup):
+    """
+    Classe de tests du hub de diffusion et du flux des places disponibles.
+    """
+
+    def test_publish_to_subscribers(self):
+        """
+        Vérifie que chaque abonné reçoit les événements publiés après son abonnement.
+        """
+        hub = BroadcastHub()
+        first = hub.subscribe()
+        hub.publish("a")
+        second = hub.subscribe()
+        hub.publish("b")
+
+        assert first.get(0) == ([(1, "a"), (2, "b")], 0)
+        assert second.get(0) == ([(2, "b")], 0)
+        assert second.get(0) == ([], 0)
+
+    def test_slow_subscriber_drops_oldest(self):
+        """
+        Vérifie que la file d'un abonné lent reste bornée en supprimant les événements les plus anciens.
+        """
+        hub = BroadcastHub(max_events=3)
+        subscription = hub.subscribe()
+        for event in range(10):
+            hub.publish(event)
+
+        events, dropped = subscription.get(0)
+        assert [data for _, data in events] == [7, 8, 9]
+        assert dropped == 7
+
+    def test_unsubscribe_and_close(self):
+        """
+        Vérifie qu'un abonné supprimé ne reçoit plus d'événements et que close ferme tous les abonnements.
+        """
+        hub = BroadcastHub()
+        removed = hub.subscribe()
+        kept = hub.subscribe()
+        hub.unsubscribe(removed)
+        hub.publish("a")
+        assert removed.get(0) == ([], 0)
+        assert len(hub) == 1
+
+        hub.close()
+        assert kept.closed
+        assert len(hub) == 0
+
+    def test_availability_stream(self):
+        """
+        Vérifie que le flux /availability envoie les places restantes après purchase_places.
+        """
+        response = self.client.get("/availability")
+        assert response.mimetype == "text/event-stream"
+        chunks = response.iter_encoded()
+        assert next(chunks) == b"retry: 3000\n\n"
+
+        self.client.post("/purchasePlaces", data={"club": "Club_test", "competition": "Competition_test", "places": 2})
+        event = next(chunks).decode()
+        assert event.startswith("id: 1\nevent: availability\n")
+        data = json.loads(event.split("data: ", 1)[1])
+        assert data == {
+            "competition": "Competition_test",
+            "numberOfPlaces": 8,
+            "club": "Club_test",
+            "reserved_places": 2,
+        }
+
+        hub = self.app.extensions["gudlft"]["hub"]
+        assert len(hub) == 1
+        response.close()
+        assert len(hub) == 0
+
+    def test_unstarted_stream_does_not_subscribe(self):
+        """
+        Vérifie qu'une réponse /availability fermée sans avoir été parcourue ne laisse pas d'abonné.
+        """
+        hub = self.app.extensions["gudlft"]["hub"]
+        # le client de test lit le premier envoi : la vue est appelée directement
+        with self.app.test_request_context("/availability"):
+            response = self.app.view_functions["main.availability"]()
+        assert len(hub) == 0
+        response.close()
+        assert len(hub) == 0
@@ -0,0 +1,219 @@
+import json
+import os
+import threading
+
+import pytest
+
+from gudlift_reservation.bulk import import_records, read_rows, validate_club, validate_competition
+
+from .. import TestSetup
+
+
+class TestBulk(TestSetup):
+    """
+    Classe de tests de l'import et de l'export par lots des clubs et des compétitions.
+    """
+
+    def write(self, file_name, content):
+        """
+        Écrit un fichier d'import dans le dossier des données du test et retourne son chemin.
+        """
+        path = os.path.join(self.data_dir, file_name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+        return path
+
+    def invoke(self, *args):
+        """
+        Exécute une commande de l'application.
+        """
+        return self.app.test_cli_runner().invoke(args=list(args))
+
+    def test_validation(self):
+        """
+        Vérifie la validation des emails, des dates et des nombres des lignes importées.
+        """
+        assert validate_club({"name": "New", "email": "new@club.fr", "points": "4"}).points == 4
+        competition = validate_competition({"name": "New", "date": "2031-01-01 10:00:00", "numberOfPlaces": "8"})
+        assert competition.number_of_places == 8
+
+        for row in (
+            {"name": "New", "email": "not-an-email", "points": 4},
+            {"name": "New", "email": "new@club.fr", "points": -1},
+            {"name": "New", "email": "new@club.fr", "points": "four"},
+            {"name": "New", "email": "new@club.fr", "points": 12.7},
+            None,
+        ):
+            with pytest.raises(ValueError):
+                validate_club(row)
+
+    def test_import_clubs_csv(self):
+        """
+        Vérifie l'import par lots d'un fichier CSV : lignes invalides signalées avec leur numéro,
+        doublons (nom ou email déjà connu, ou répété dans le fichier) ignorés et progression par lot.
+        """
+        path = self.write(
+            "clubs.csv",
+            "name,email,points\n"
+            "New 1,new1@club.fr,5\n"
+            "New 2,not-an-email,5\n"
+            "Club_test,other@club.fr,5\n"
+            "New 3,club_test@email.fr,5\n"
+            "New 1,new1bis@club.fr,5\n"
+            "New 4,new4@club.fr,\n"
+            "New 5,new5@club.fr,7\n",
+        )
+
+        result = self.invoke("import-clubs", path, "--chunk-size", "3")
+
+        assert result.exit_code == 0
+        assert "clubs.csv:3: Invalid email: 'not-an-email'" in result.output
+        assert "clubs.csv:7: Invalid points: ''" in result.output
+        assert "3 row(s) read: 1 clubs to import" in result.output
+        assert "6 row(s) read" in result.output
+        assert "2 clubs imported, 3 duplicate(s), 2 invalid" in result.output
+        clubs = {club["name"]: club for club in self.storage.load_clubs()}
+        assert clubs["New 5"] == {"name": "New 5", "email": "new5@club.fr", "points": 7}
+        assert "New 2" not in clubs
+        assert self.repository.get_club_by_email("new1@club.fr")["name"] == "New 1"
+
+    def test_import_competitions_ndjson(self):
+        """
+        Vérifie l'import NDJSON des compétitions avec leurs places réservées, et le calendrier mis à jour.
+        """
+        path = self.write(
+            "competitions.ndjson",
+            json.dumps({"name": "Late", "date": "2031-06-01 10:00:00", "numberOfPlaces": 20}) + "\n"
+            "\n"
+            "{not json\n"
+            + json.dumps({"name": "Bad date", "date": "01/06/2031", "numberOfPlaces": 20})
+            + "\n"
+            + json.dumps(
+                {
+                    "name": "Early",
+                    "date": "2030-01-01 10:00:00",
+                    "numberOfPlaces": 18,
+                    "reserved_places": [{"club_name": "Club_test", "reserved_places": 2}],
+                }
+            )
+            + "\n",
+        )
+
+        result = self.invoke("import-competitions", path)
+
+        assert result.exit_code == 0
+        assert "competitions.ndjson:3: Invalid row: expected an object" in result.output
+        assert "competitions.ndjson:4: Invalid date: '01/06/2031'" in result.output
+        assert "2 competitions imported, 0 duplicate(s), 2 invalid" in result.output
+        assert self.repository.ledger.reserved("Early", "Club_test") == 2
+        names = [competition["name"] for competition in self.repository.upcoming_competitions()]
+        assert names.index("Early") < names.index("Late")
+        assert "Late" in {competition["name"] for competition in self.storage.load_competitions()}
+
+    def test_dry_run(self):
+        """
+        Vérifie qu'avec --dry-run le fichier est validé sans rien importer.
+        """
+        path = self.write("clubs.ndjson", json.dumps({"name": "New", "email": "new@club.fr", "points": 1}) + "\n")
+
+        result = self.invoke("import-clubs", path, "--dry-run")
+
+        assert "1 clubs validated" in result.output
+        assert self.repository.get_club_by_email("new@club.fr") is None
+
+    def test_import_rows_are_streamed(self):
+        """
+        Vérifie que les lignes sont lues au fur et à mesure des lots, sans lire tout le fichier d'abord.
+        """
+        read = []
+
+        def lines():
+            for i in range(10):
+                read.append(i)
+                yield json.dumps({"name": f"New {i}", "email": f"new{i}@club.fr", "points": 1})
+
+        progress = []
+
+        def on_chunk(counts):
+            # seules les lignes du lot sont lues à la fin d'un lot
+            assert len(read) == counts["read"]
+            progress.append(counts["read"])
+
+        counts = import_records(self.repository, "clubs", read_rows(lines(), "ndjson"), 4, on_chunk=on_chunk)
+
+        assert counts["imported"] == 10
+        assert progress == [4, 8, 10]
+
+    def test_validation_outside_write_lock(self):
+        """
+        Vérifie que les réservations ne sont pas bloquées pendant la validation d'un import
+        et que les doublons ajoutés entre-temps par un autre worker sont détectés à l'ajout.
+        """
+        rows = read_rows(
+            [json.dumps({"name": f"New {i}", "email": f"new{i}@club.fr", "points": 1}) for i in range(3)], "ndjson"
+        )
+        booked = []
+
+        def on_chunk(counts):
+            # une réservation d'un autre thread aboutit pendant la validation
+            thread = threading.Thread(
+                target=lambda: booked.append(
+                    self.app.extensions["gudlft"]["booking_service"].purchase_places(
+                        {"club": "Club_test", "competition": "Competition_test", "places": 1}
+                    )[0]
+                )
+            )
+            thread.start()
+            thread.join(timeout=5)
+            # club ajouté par un autre worker avant l'ajout des clubs importés
+            self.repository.add_club({"name": "New 1", "email": "other@club.fr", "points": 1})
+
+        counts = import_records(self.repository, "clubs", rows, chunk_size=10, on_chunk=on_chunk)
+
+        assert booked == [True]
+        assert counts == {"read": 3, "imported": 2, "duplicates": 1, "invalid": 0}
+        assert self.repository.clubs_by_name["New 1"]["email"] == "other@club.fr"
+
+    def test_add_competitions_returns_added(self):
+        """
+        Vérifie que add_competitions renvoie seulement les compétitions ajoutées, sans les doublons de nom.
+        """
+        added = self.repository.add_competitions(
+            [
+                {"name": "Competition_test", "date": "2031-01-01 10:00:00", "numberOfPlaces": 1},
+                {"name": "Competition_new", "date": "2031-01-01 10:00:00", "numberOfPlaces": 1},
+            ]
+        )
+        assert [competition["name"] for competition in added] == ["Competition_new"]
+
+    def test_export_round_trip(self):
+        """
+        Vérifie l'export CSV et NDJSON, et qu'un export NDJSON réimporté ne crée que des doublons.
+        """
+        csv_path = os.path.join(self.data_dir, "export.csv")
+        ndjson_path = os.path.join(self.data_dir, "export.ndjson")
+
+        result = self.invoke("export-clubs", csv_path)
+        assert result.exit_code == 0
+        with open(csv_path, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        assert lines[0] == "name,email,points"
+        assert "Club_test,club_test@email.fr,15" in lines
+        assert len(lines) == len(self.clubs) + 1
+
+        result = self.invoke("export-competitions", ndjson_path)
+        assert result.exit_code == 0
+        with open(ndjson_path, encoding="utf-8") as f:
+            exported = [json.loads(line) for line in f]
+        assert exported == self.competitions
+
+        result = self.invoke("import-competitions", ndjson_path)
+        assert f"0 competitions imported, {len(self.competitions)} duplicate(s), 0 invalid" in result.output
+
+    def test_unknown_format(self):
+        """
+        Vérifie qu'un fichier sans extension connue demande l'option --format.
+        """
+        result = self.invoke("export-clubs", os.path.join(self.data_dir, "clubs.txt"))
+        assert result.exit_code != 0
+        assert "--format" in result.output
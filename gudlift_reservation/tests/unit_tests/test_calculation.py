@@ -2,8 +2,6 @@ from datetime import datetime, timedelta
 
 import pytest
 
-from gudlift_reservation.json_handler import (load_clubs, load_competitions,
-                                              save_competitions)
 from gudlift_reservation.utils import (reserv_places_competition,
                                        valid_club_and_competition)
 
@@ -66,7 +64,7 @@ class TestCalculation(TestSetup):
 
         # verification du bon calcul des points du club
         if expected_value == "Great-booking complete!":
-            self.clubs = load_clubs()
+            self.clubs = self.storage.load_clubs()
             club = next(club for club in self.clubs if club["name"] == club_name)
             club_points_after = club["points"]
             expected_points = club_points_before - places
@@ -90,7 +88,7 @@ class TestCalculation(TestSetup):
         # modification de la date de la competition
         date_test = datetime.now() - timedelta(days=50)
         self.competition["date"] = date_test.strftime("%Y-%m-%d %H:%M:%S")
-        save_competitions(self.competitions)
+        self.storage.save_competitions(self.competitions)
 
         response = self.client.get(f"/book/{competition_name}/{club_name}")
 
@@ -115,9 +113,7 @@ class TestCalculation(TestSetup):
         # modification de la date de la competition
         date_test = datetime.now() - timedelta(days=50)
         self.competition["date"] = date_test.strftime("%Y-%m-%d %H:%M:%S")
-        save_competitions(self.competitions)
-
-        self.competitions = load_competitions()
+        self.storage.save_competitions(self.competitions)
 
         rv = self.client.post(
             "/purchasePlaces",
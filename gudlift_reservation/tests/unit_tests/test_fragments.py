@@ -0,0 +1,79 @@
+from gudlift_reservation.fragments import FragmentCache
+
+from .. import TestSetup
+
+
+class TestFragmentCache(TestSetup):
+    """
+    Classe de tests du cache des fragments de la page welcome.
+    """
+
+    def summary(self, email="club_test@email.fr"):
+        """
+        Retourne la page welcome d'un club.
+        """
+        response = self.client.post("/showSummary", data={"email": email})
+        assert response.status_code == 200
+        return response.data.decode()
+
+    def test_cache_versions(self):
+        """
+        Vérifie qu'un fragment est rendu une seule fois par version.
+        """
+        cache = FragmentCache()
+        renders = []
+
+        def render():
+            renders.append(1)
+            return f"fragment {len(renders)}"
+
+        assert cache.get("competition", 1, render) == "fragment 1"
+        assert cache.get("competition", 1, render) == "fragment 1"
+        assert cache.get("competition", 2, render) == "fragment 2"
+        assert len(renders) == 2
+        assert len(cache) == 1
+
+    def test_fragments_cached_between_requests(self):
+        """
+        Vérifie que les fragments des compétitions sont rendus une seule fois pour tous les clubs,
+        le lien de réservation restant propre à chaque club.
+        """
+        fragments = self.app.extensions["gudlft"]["fragments"]
+        first = self.summary()
+        cached = len(fragments)
+        assert cached > 0
+
+        second = self.summary("club_test_2@email.fr")
+        assert len(fragments) == cached
+        assert "/book/Competition_test/Club_test_2" in second
+        assert "/book/Competition_test/Club_test_2" not in first
+        assert first.count("Number of Places") == second.count("Number of Places")
+
+    def test_cache_invalidated_after_purchase_places(self):
+        """
+        Vérifie que seule la compétition réservée est rendue à nouveau après purchase_places.
+        """
+        assert "Number of Places: 10" in self.summary()
+        versions = dict(self.repository.competition_versions)
+
+        response = self.client.post(
+            "/purchasePlaces", data={"club": "Club_test", "competition": "Competition_test", "places": 2}
+        )
+        assert response.status_code == 200
+        page = response.data.decode()
+        assert "Number of Places: 8" in page
+        assert "Club : Club_test - Reserved places : 2" in page
+
+        changed = {name for name, version in self.repository.competition_versions.items() if versions[name] != version}
+        assert changed == {"Competition_test"}
+        assert "Number of Places: 8" in self.summary("club_test_2@email.fr")
+
+    def test_cache_invalidated_after_journal_replay(self):
+        """
+        Vérifie qu'une réservation rejouée depuis le journal change la version de la compétition.
+        """
+        version = self.repository.competition_versions["Competition_test_2"]
+        self.repository._apply_booking("Club_test", "Competition_test_2", 3)
+
+        assert self.repository.competition_versions["Competition_test_2"] != version
+        assert "Number of Places: 12" in self.summary()
@@ -0,0 +1,140 @@
+import os
+
+import pytest
+
+from gudlift_reservation.idempotency import IdempotencyCache, idempotency_lookups
+from gudlift_reservation.json_handler import load_clubs
+from gudlift_reservation.server import create_app
+from gudlift_reservation.storage import JsonStorage, MemoryStorage, SqliteStorage
+
+from .. import TestSetup
+
+
+class TestIdempotency(TestSetup):
+    """
+    Classe de tests des clés d'idempotence de /purchasePlaces.
+    """
+
+    def purchase(self, client, key=None, places=2, competition="Competition_test", as_field=False):
+        """
+        Réserve des places pour Club_test avec une clé d'idempotence en en-tête ou dans le formulaire.
+        """
+        data = {"club": "Club_test", "competition": competition, "places": places}
+        headers = {}
+        if key and as_field:
+            data["idempotency_key"] = key
+        elif key:
+            headers["Idempotency-Key"] = key
+        return client.post("/purchasePlaces", data=data, headers=headers)
+
+    def points(self):
+        return self.repository.clubs_by_name["Club_test"]["points"]
+
+    @pytest.mark.parametrize("as_field", [False, True])
+    def test_replayed_booking(self, as_field):
+        """
+        Vérifie qu'une réservation rejouée avec la même clé n'est appliquée qu'une fois.
+        """
+        hits = idempotency_lookups._series.get(("hit",), 0)
+
+        first = self.purchase(self.client, "key-1", as_field=as_field)
+        second = self.purchase(self.client, "key-1", as_field=as_field)
+
+        assert first.status_code == second.status_code == 200
+        assert b"Great-booking complete!" in second.data
+        assert self.points() == 13
+        assert self.repository.ledger.reserved("Competition_test", "Club_test") == 2
+        assert idempotency_lookups._series[("hit",)] == hits + 1
+
+        self.purchase(self.client, "key-2")
+        assert self.points() == 11
+
+    def test_replayed_rejection(self):
+        """
+        Vérifie qu'un refus est aussi rejoué, sans nouvelle validation.
+        """
+        assert self.purchase(self.client, "key-1", places=100).status_code == 302
+        self.repository.clubs_by_name["Club_test"]["points"] = 200
+        self.repository.competitions_by_name["Competition_test"]["numberOfPlaces"] = 200
+
+        response = self.purchase(self.client, "key-1", places=100)
+        assert response.status_code == 302
+        assert self.points() == 200
+
+    def test_key_reused_for_another_booking(self):
+        """
+        Vérifie qu'une clé utilisée pour une autre réservation est refusée.
+        """
+        self.purchase(self.client, "key-1")
+        response = self.purchase(self.client, "key-1", competition="Competition_test_2")
+
+        assert response.status_code == 302
+        assert self.points() == 13
+        with self.client.session_transaction() as session:
+            assert ("error", "Idempotency key already used for another booking") in session["_flashes"]
+
+    def test_replay_after_archive(self):
+        """
+        Vérifie qu'une requête rejouée après l'archivage de sa compétition est refusée (400) sans erreur serveur,
+        et qu'une clé réutilisée pour une autre réservation reste refusée.
+        """
+        self.purchase(self.client, "key-1")
+        self.repository.set_competitions(
+            [competition for competition in self.repository.competitions if competition["name"] != "Competition_test"]
+        )
+
+        assert self.purchase(self.client, "key-1").status_code == 400
+        assert self.purchase(self.client, "key-1", competition="Competition_test_2").status_code == 302
+        with self.client.session_transaction() as session:
+            assert ("error", "Idempotency key already used for another booking") in session["_flashes"]
+        assert self.points() == 13
+
+    def test_shared_between_workers(self):
+        """
+        Vérifie qu'une requête rejouée sur un autre worker retrouve le résultat par le stockage.
+        """
+        config = {"TESTING": True, "DATA_DIR": self.data_dir, "STORAGE_BACKEND": "json"}
+        first_worker = create_app(config).test_client()
+        second_worker = create_app(config).test_client()
+
+        self.purchase(first_worker, "key-1")
+        self.purchase(second_worker, "key-1")
+
+        club = next(club for club in load_clubs(self.data_dir) if club["name"] == "Club_test")
+        assert club["points"] == 13
+
+    def test_cache_ttl_and_bound(self):
+        """
+        Vérifie l'expiration des résultats et la taille bornée du cache local.
+        """
+        cache = IdempotencyCache(MemoryStorage(), ttl_seconds=10, max_entries=2)
+        cache.put("a", {"booked": True}, now=100)
+        assert cache.get("a", now=105) == {"booked": True}
+        assert cache.get("a", now=111) is None
+
+        for key in "bcd":
+            cache.put(key, {"key": key}, now=100)
+        assert len(cache._results) == 2
+        # au plus max_entries résultats dans le cache local et dans le stockage
+        assert cache.get("b", now=101) is None
+        assert cache.get("d", now=101) == {"key": "d"}
+
+    @pytest.mark.parametrize("backend", ["json", "sqlite"])
+    def test_storage_results(self, backend):
+        """
+        Vérifie l'enregistrement, l'expiration et la suppression des résultats dans les stockages partagés.
+        """
+        if backend == "json":
+            storage = JsonStorage(self.data_dir)
+        else:
+            storage = SqliteStorage(os.path.join(self.data_dir, "test.sqlite3"))
+
+        storage.save_result("key", {"booked": True}, expires_at=2e9, max_results=10)
+        assert storage.load_result("key", now=1e9) == (2e9, {"booked": True})
+        assert storage.load_result("key", now=3e9) is None
+        assert storage.load_result("other", now=1e9) is None
+
+        for index in range(20):
+            storage.save_result(f"key-{index}", {"index": index}, expires_at=2e9 + index, max_results=10)
+        assert storage.load_result("key-19", now=1e9) == (2e9 + 19, {"index": 19})
+        assert storage.load_result("key-0", now=1e9) is None
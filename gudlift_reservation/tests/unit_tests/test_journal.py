@@ -0,0 +1,130 @@
+import pytest
+
+from gudlift_reservation.booking import BookingService
+from gudlift_reservation.journal import BookingJournal
+from gudlift_reservation.json_handler import load_clubs, load_competitions
+from gudlift_reservation.repository import DataRepository
+from gudlift_reservation.storage import JsonStorage
+
+from .. import TestSetup
+
+
+class TestJournal(TestSetup):
+    """
+    Classe de tests du journal des réservations et de sa compaction.
+    """
+
+    @pytest.fixture(autouse=True)
+    def journal_repository(self, isolated_store):
+        """
+        Dépôt des fichiers JSON du dossier de données du test avec un journal des réservations.
+        """
+        self.journal = BookingJournal(data_dir=self.data_dir)
+        self.repository = DataRepository(JsonStorage(self.data_dir, self.journal))
+        self.booking_service = BookingService(self.repository)
+
+    def new_repository(self):
+        """
+        Retourne un nouveau dépôt des mêmes fichiers JSON et du même journal, comme dans un autre processus.
+        """
+        repository = DataRepository(JsonStorage(self.data_dir, BookingJournal(data_dir=self.data_dir)))
+        repository.refresh()
+        return repository
+
+    def book(self, club_name, competition_name, places):
+        """
+        Réserve des places avec le service de réservation du dépôt de test.
+        """
+        return self.booking_service.purchase_places(
+            {"club": club_name, "competition": competition_name, "places": places}
+        )
+
+    def test_booking_appends_to_journal(self):
+        """
+        Vérifie qu'une réservation est ajoutée au journal sans réécrire les fichiers JSON.
+        """
+        booked, _ = self.book("Club_test", "Competition_test", 3)
+
+        assert booked
+        events, _ = self.journal.read()
+        assert [(e["club"], e["competition"], e["places"]) for e in events] == [("Club_test", "Competition_test", 3)]
+        assert "timestamp" in events[0]
+        assert load_clubs(self.data_dir) == self.clubs
+        assert self.repository.clubs_by_name["Club_test"]["points"] == 12
+
+    def test_state_rebuilt_from_snapshot_and_journal(self):
+        """
+        Vérifie qu'un nouveau dépôt reconstruit l'état à partir des fichiers JSON et du journal.
+        """
+        self.book("Club_test", "Competition_test", 3)
+        self.book("Club_test", "Competition_test", 2)
+        self.book("Club_test_2", "Competition_test_2", 4)
+
+        repository = self.new_repository()
+
+        assert repository.clubs_by_name["Club_test"]["points"] == 10
+        assert repository.clubs_by_name["Club_test_2"]["points"] == 6
+        assert repository.competitions_by_name["Competition_test"]["numberOfPlaces"] == 5
+        assert repository.ledger.reserved("Competition_test", "Club_test") == 5
+        assert repository.ledger.total("Competition_test_2") == 4
+
+        # les réservations d'un autre processus sont rejouées de manière incrémentale
+        self.book("Club_test", "Competition_test", 1)
+        repository.refresh()
+        assert repository.clubs_by_name["Club_test"]["points"] == 9
+
+    def test_compaction_folds_journal_into_json_files(self):
+        """
+        Vérifie que la compaction intègre le journal dans les fichiers JSON et vide le journal.
+        """
+        self.book("Club_test", "Competition_test", 3)
+        self.book("Club_test_2", "Competition_test", 2)
+
+        assert self.repository.compact() == 2
+        assert self.journal.size() == 0
+
+        club = next(club for club in load_clubs(self.data_dir) if club["name"] == "Club_test")
+        competition = next(comp for comp in load_competitions(self.data_dir) if comp["name"] == "Competition_test")
+        assert club["points"] == 12
+        assert competition["numberOfPlaces"] == 5
+        assert competition["reserved_places"] == [
+            {"club_name": "Club_test", "reserved_places": 3},
+            {"club_name": "Club_test_2", "reserved_places": 2},
+        ]
+
+        # l'état reconstruit après compaction ne rejoue pas deux fois les réservations
+        repository = self.new_repository()
+        assert repository.clubs_by_name["Club_test"]["points"] == 12
+
+    @pytest.mark.parametrize("interrupted", ["save_competitions", "truncate"])
+    def test_interrupted_compaction(self, monkeypatch, interrupted):
+        """
+        Vérifie qu'une compaction interrompue après l'écriture de clubs.json, ou avant que le journal
+        soit vidé, ne fait pas rejouer une seconde fois les réservations déjà intégrées.
+        """
+        self.book("Club_test", "Competition_test", 3)
+        self.book("Club_test_2", "Competition_test", 2)
+
+        def crash(*args):
+            raise OSError("crash")
+
+        target = self.journal if interrupted == "truncate" else self.repository.storage
+        monkeypatch.setattr(target, interrupted, crash)
+        with pytest.raises(OSError):
+            self.repository.compact()
+        monkeypatch.undo()
+
+        repository = self.new_repository()
+        assert repository.clubs_by_name["Club_test"]["points"] == 12
+        assert repository.clubs_by_name["Club_test_2"]["points"] == 8
+        assert repository.competitions_by_name["Competition_test"]["numberOfPlaces"] == 5
+        assert repository.ledger.reserved("Competition_test", "Club_test") == 3
+
+        # la compaction suivante et les réservations de la génération suivante restent correctes
+        assert repository.compact() == 2
+        BookingService(repository).purchase_places(
+            {"club": "Club_test", "competition": "Competition_test", "places": 1}
+        )
+        repository = self.new_repository()
+        assert repository.clubs_by_name["Club_test"]["points"] == 11
+        assert repository.competitions_by_name["Competition_test"]["numberOfPlaces"] == 4
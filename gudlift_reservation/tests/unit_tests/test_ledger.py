@@ -0,0 +1,46 @@
+from gudlift_reservation.ledger import ReservationLedger
+from gudlift_reservation.utils import reserv_places_competition
+
+from .. import TestSetup
+
+
+class TestLedger(TestSetup):
+    """
+    Classe de tests du registre des réservations.
+    """
+
+    def test_reserve_updates_quota_and_totals(self):
+        """
+        Vérifie que le registre tient à jour le quota par club, le total par compétition
+        et la liste reserved_places enregistrée sur le disque.
+        """
+        club, club_2 = self.clubs[-2:]
+        competition = self.competitions[-1]
+        ledger = ReservationLedger([competition])
+
+        assert ledger.remaining_quota(competition["name"], club["name"]) == 12
+        assert reserv_places_competition(club, competition, 5, ledger)
+        assert reserv_places_competition(club, competition, 5, ledger)
+        assert not reserv_places_competition(club, competition, 5, ledger)
+        assert reserv_places_competition(club_2, competition, 3, ledger)
+
+        assert ledger.reserved(competition["name"], club["name"]) == 10
+        assert ledger.remaining_quota(competition["name"], club["name"]) == 2
+        assert ledger.total(competition["name"]) == 13
+        assert competition["reserved_places"] == [
+            {"club_name": club["name"], "reserved_places": 10},
+            {"club_name": club_2["name"], "reserved_places": 3},
+        ]
+
+    def test_book_max_places_uses_ledger(self):
+        """
+        Vérifie que la page de réservation limite le nombre de places au quota restant du club.
+        """
+        self.client.post(
+            "/purchasePlaces", data={"competition": "Competition_test_2", "club": "Club_test", "places": 8}
+        )
+
+        response = self.client.get("/book/Competition_test_2/Club_test")
+
+        assert response.status_code == 200
+        assert b'max="4"' in response.data
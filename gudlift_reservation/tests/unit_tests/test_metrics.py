@@ -0,0 +1,48 @@
+from gudlift_reservation.metrics import MetricsRegistry
+
+from .. import TestSetup
+
+
+class TestMetrics(TestSetup):
+    """
+    Classe de tests de l'instrumentation des requêtes et de l'exposition des métriques.
+    """
+
+    def test_histogram_text_format(self):
+        """
+        Vérifie le format texte de Prometheus d'un histogramme : intervalles cumulés, somme et nombre.
+        """
+        registry = MetricsRegistry()
+        histogram = registry.histogram("test_seconds", "Test histogram.", ("route",), buckets=(0.1, 1.0))
+        histogram.observe(0.05, "index")
+        histogram.observe(0.1, "index")
+        histogram.observe(3, "index")
+
+        text = registry.render()
+
+        assert "# TYPE test_seconds histogram" in text
+        assert 'test_seconds_bucket{route="index",le="0.1"} 2' in text
+        assert 'test_seconds_bucket{route="index",le="1.0"} 2' in text
+        assert 'test_seconds_bucket{route="index",le="+Inf"} 3' in text
+        assert 'test_seconds_count{route="index"} 3' in text
+
+    def test_metrics_endpoint(self):
+        """
+        Vérifie que /metrics expose la durée des requêtes par route, les codes de statut,
+        les requêtes en cours et la durée des phases internes d'une réservation.
+        """
+        self.client.get("/")
+        self.client.post(
+            "/purchasePlaces", data={"competition": "Competition_test", "club": "Club_test", "places": 1}
+        )
+
+        response = self.client.get("/metrics")
+        text = response.data.decode("utf-8")
+
+        assert response.status_code == 200
+        assert response.content_type.startswith("text/plain")
+        assert 'gudlft_request_duration_seconds_count{endpoint="main.index",method="GET"}' in text
+        assert 'gudlft_requests_total{endpoint="main.purchase_places",method="POST",status="200"}' in text
+        assert "gudlft_requests_in_flight 1" in text
+        for phase in ("load_data", "validation", "persistence", "render"):
+            assert f'gudlft_phase_duration_seconds_count{{phase="{phase}"}}' in text
@@ -0,0 +1,92 @@
+import pytest
+
+from gudlift_reservation.json_handler import load_competitions, save_competitions
+from gudlift_reservation.models import Club, Competition, Reservation
+
+from .. import TestSetup
+
+
+class TestModels(TestSetup):
+    """
+    Classe de tests des enregistrements compacts des clubs, compétitions et réservations.
+    """
+
+    def test_from_dict_validates_and_converts(self):
+        """
+        Vérifie que les nombres écrits en texte sont convertis et que les champs invalides sont refusés.
+        """
+        club = Club.from_dict({"name": "Club_test", "email": "club_test@email.fr", "points": "13"})
+        assert club.points == 13
+        assert Club.from_dict({"name": "Club_test", "email": "club_test@email.fr", "points": 13.0}).points == 13
+
+        for points in ("many", 12.7, float("nan"), True, None):
+            with pytest.raises(ValueError):
+                Club.from_dict({"name": "Club_test", "email": "club_test@email.fr", "points": points})
+        with pytest.raises(ValueError):
+            Competition.from_dict({"name": "Old", "date": "2030-03-27 10:00:00", "numberOfPlaces": 2.5})
+        with pytest.raises(ValueError):
+            Competition.from_dict({"name": 3, "date": "2030-03-27 10:00:00", "numberOfPlaces": 10})
+
+    def test_old_competition_format(self):
+        """
+        Vérifie la migration des anciens formats de reserved_places.
+        """
+        competition = {"name": "Old", "date": "2030-03-27 10:00:00", "numberOfPlaces": 10}
+        assert Competition.from_dict(competition).reserved_places == []
+
+        competition["reserved_places"] = [
+            {"club_name": "Club_test", "reserved_places": "2"},
+            {"club_name": "Club_test_2", "reserved_places": 1},
+            {"club_name": "Club_test", "reserved_places": 3},
+        ]
+        assert Competition.from_dict(competition).reserved_places == [
+            Reservation("Club_test", 5),
+            Reservation("Club_test_2", 1),
+        ]
+
+    def test_mapping_access(self):
+        """
+        Vérifie l'accès aux champs par leur clé JSON, comme pour le dict d'origine.
+        """
+        competition = Competition.from_dict(self.competitions[-1])
+
+        competition["numberOfPlaces"] -= 2
+        assert competition.number_of_places == 13
+        assert competition.get("numberOfPlaces") == 13
+        assert competition.get("unknown", 0) == 0
+        assert "reserved_places" in competition
+        assert dict(competition) == dict(self.competitions[-1], numberOfPlaces=13)
+        with pytest.raises(KeyError):
+            competition["unknown"]
+        # pas de __dict__ par enregistrement
+        assert not hasattr(competition, "__dict__")
+
+    def test_json_round_trip(self):
+        """
+        Vérifie que les enregistrements sont écrits dans les fichiers JSON au format d'origine.
+        """
+        competitions = [Competition.coerce(competition) for competition in self.competitions]
+        competitions[-1].reserved_places.append(Reservation("Club_test", 2))
+        save_competitions(competitions, self.data_dir)
+
+        loaded = load_competitions(self.data_dir)
+        assert loaded[-1]["reserved_places"] == [{"club_name": "Club_test", "reserved_places": 2}]
+        assert [Competition.from_dict(competition) for competition in loaded] == competitions
+
+    def test_repository_holds_records(self):
+        """
+        Vérifie que le dépôt sert des enregistrements, affichés par les templates.
+        """
+        club = self.repository.get_club_by_email("club_test@email.fr")
+        assert isinstance(club, Club)
+        assert all(isinstance(competition, Competition) for competition in self.repository.competitions)
+
+        self.client.post("/showSummary", data={"email": "club_test@email.fr"})
+        response = self.client.post(
+            "/purchasePlaces", data={"club": "Club_test", "competition": "Competition_test", "places": 2}
+        )
+        assert response.status_code == 200
+        assert b"Points available: 13" in response.data
+        assert self.repository.competitions_by_name["Competition_test"].reserved_places == [
+            Reservation("Club_test", 2)
+        ]
@@ -0,0 +1,158 @@
+import multiprocessing
+import time
+
+import pytest
+
+from gudlift_reservation.booking import BookingService
+from gudlift_reservation.journal import BookingJournal
+from gudlift_reservation.persistence import GroupCommitWriter
+from gudlift_reservation.repository import DataRepository
+from gudlift_reservation.server import create_app
+from gudlift_reservation.storage import JsonStorage
+
+from .. import TestSetup
+
+def wait_for(condition, timeout=2):
+    """
+    Attend qu'une condition soit vraie, au plus timeout secondes.
+    """
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+class TestGroupCommit(TestSetup):
+    """
+    Classe de tests de l'écriture groupée des réservations.
+    """
+
+    def book(self, repository, club_name, competition_name, places):
+        """
+        Réserve des places avec le service de réservation d'un dépôt.
+        """
+        return BookingService(repository).purchase_places(
+            {"club": club_name, "competition": competition_name, "places": places}
+        )
+
+    def test_flush_when_batch_is_full(self):
+        """
+        Vérifie que le thread d'écriture enregistre un lot dès qu'il atteint max_bookings réservations.
+        """
+        batches = []
+        writer = GroupCommitWriter(batches.append, self.repository.write_lock, interval_ms=10_000, max_bookings=3)
+        for booking in range(3):
+            writer.submit(booking)
+
+        assert wait_for(lambda: batches)
+        assert batches == [[0, 1, 2]]
+        stats = writer.stats()
+        assert stats["flushes"] == 1
+        assert stats["last_batch_size"] == stats["max_batch_size"] == 3
+        writer.stop()
+
+    def test_flush_after_interval(self):
+        """
+        Vérifie que le thread d'écriture enregistre les réservations en attente après interval_ms.
+        """
+        batches = []
+        writer = GroupCommitWriter(batches.append, self.repository.write_lock, interval_ms=50, max_bookings=100)
+        writer.submit("a")
+        writer.submit("b")
+
+        assert wait_for(lambda: batches)
+        assert batches == [["a", "b"]]
+        stats = writer.stats()
+        assert stats["pending"] == 0
+        assert stats["avg_batch_size"] == 2
+        assert stats["last_flush_seconds"] >= 0
+        writer.stop()
+
+    def test_writer_restarted_after_fork(self):
+        """
+        Vérifie que le thread d'écriture est recréé dans un processus créé par fork,
+        sans les réservations en attente du processus parent.
+        """
+        batches = []
+        writer = GroupCommitWriter(batches.append, self.repository.write_lock, interval_ms=10_000, max_bookings=2)
+        writer.submit("parent")
+
+        def child():
+            assert writer.pending == 0
+            writer.submit("a")
+            writer.submit("b")
+            assert wait_for(lambda: batches)
+            assert batches == [["a", "b"]]
+
+        process = multiprocessing.get_context("fork").Process(target=child)
+        process.start()
+        process.join()
+        assert process.exitcode == 0
+        writer.stop()
+        assert batches == [["parent"]]
+
+    def test_grouped_requires_journal(self):
+        """
+        Vérifie que l'écriture groupée est refusée sans journal (fichiers JSON en mode snapshot, SQLite) :
+        une réservation acquittée ne serait visible d'aucun autre processus avant l'écriture groupée.
+        """
+        with pytest.raises(ValueError, match="journal"):
+            DataRepository(JsonStorage(self.data_dir), durability="grouped")
+        with pytest.raises(ValueError, match="journal"):
+            create_app(
+                {"TESTING": True, "DATA_DIR": self.data_dir, "STORAGE_BACKEND": "sqlite", "DURABILITY": "grouped"}
+            )
+
+    def test_grouped_journal_storage(self):
+        """
+        Vérifie qu'avec un journal les réservations sont journalisées immédiatement
+        et synchronisées sur le disque par lot.
+        """
+        journal = BookingJournal(data_dir=self.data_dir)
+        repository = DataRepository(
+            JsonStorage(self.data_dir, journal), durability="grouped", group_commit_interval_ms=10_000
+        )
+
+        self.book(repository, "Club_test", "Competition_test", 2)
+        self.book(repository, "Club_test", "Competition_test", 1)
+
+        events, _ = journal.read()
+        assert len(events) == 2
+        assert journal._unsynced == 2
+
+        # les réservations acquittées sont visibles d'un autre worker avant l'écriture groupée
+        other = DataRepository(JsonStorage(self.data_dir, BookingJournal(data_dir=self.data_dir)))
+        other.refresh()
+        assert other.clubs_by_name["Club_test"]["points"] == 12
+        assert other.competitions_by_name["Competition_test"]["numberOfPlaces"] == 7
+
+        repository.flush()
+        assert journal._unsynced == 0
+        assert repository.writer.stats()["bookings"] == 2
+        repository.writer.stop()
+
+    def test_grouped_flush_keeps_other_workers_bookings(self):
+        """
+        Vérifie que l'écriture groupée ne saute pas les réservations journalisées entre-temps
+        par un autre worker : elles sont rejouées au refresh() suivant.
+        """
+        first, second = (
+            DataRepository(
+                JsonStorage(self.data_dir, BookingJournal(data_dir=self.data_dir)),
+                durability="grouped",
+                group_commit_interval_ms=10_000,
+            )
+            for _ in range(2)
+        )
+
+        self.book(first, "Club_test", "Competition_test", 3)
+        self.book(second, "Club_test_2", "Competition_test", 5)
+        first.flush()
+        first.refresh()
+
+        for repository in (first, second):
+            assert repository.competitions_by_name["Competition_test"]["numberOfPlaces"] == 2
+            assert repository.clubs_by_name["Club_test"]["points"] == 12
+            assert repository.clubs_by_name["Club_test_2"]["points"] == 5
+        first.writer.stop()
+        second.writer.stop()
@@ -0,0 +1,69 @@
+from flask import Flask
+
+from gudlift_reservation.profiling import PROFILE_HEADER, RequestProfiler, hot_functions, profile_files, sign
+
+from .. import TestSetup
+
+
+def profiled_app(profiler):
+    """
+    Application de test avec une route instrumentée par le profileur.
+    """
+    test_app = Flask(__name__)
+
+    @test_app.route("/slow")
+    def slow():
+        return str(sum(i * i for i in range(10000)))
+
+    profiler.init_app(test_app)
+    return test_app.test_client()
+
+
+class TestProfiling(TestSetup):
+    """
+    Classe de tests du profilage des requêtes.
+    """
+
+    def test_sampled_requests_are_profiled(self, tmp_path):
+        """
+        Vérifie que les requêtes échantillonnées sont profilées et que seuls les profils récents sont conservés.
+        """
+        client = profiled_app(RequestProfiler(str(tmp_path), sample_rate=1.0, max_files=2))
+        for _ in range(3):
+            assert client.get("/slow").status_code == 200
+
+        files = profile_files(str(tmp_path))
+        assert len(files) == 2
+        assert all("-slow-" in file_name for file_name in files)
+        assert profile_files(str(tmp_path), "other") == []
+
+    def test_signed_header(self, tmp_path):
+        """
+        Vérifie que seule une signature valide du chemin déclenche le profilage.
+        """
+        client = profiled_app(RequestProfiler(str(tmp_path), secret="secret"))
+
+        client.get("/slow")
+        client.get("/slow", headers={PROFILE_HEADER: sign("other", "/slow")})
+        assert profile_files(str(tmp_path)) == []
+
+        client.get("/slow", headers={PROFILE_HEADER: sign("secret", "/slow")})
+        assert len(profile_files(str(tmp_path))) == 1
+
+    def test_profile_report(self, tmp_path):
+        """
+        Vérifie l'agrégation des fonctions les plus coûteuses des profils enregistrés.
+        """
+        client = profiled_app(RequestProfiler(str(tmp_path), sample_rate=1.0))
+        client.get("/slow")
+        client.get("/slow")
+
+        rows = hot_functions(profile_files(str(tmp_path)), top=5)
+        assert len(rows) == 5
+        assert rows[0][2] >= rows[-1][2]
+
+        self.app.config["PROFILING_DIR"] = str(tmp_path)
+        result = self.app.test_cli_runner().invoke(args=["profile-report", "--top", "3", "--route", "slow"])
+        assert result.exit_code == 0
+        assert "2 profile(s)" in result.output
+        assert len(result.output.strip().splitlines()) == 4
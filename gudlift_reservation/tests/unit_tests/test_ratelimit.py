@@ -0,0 +1,118 @@
+import os
+import threading
+
+import pytest
+
+from gudlift_reservation.server import create_app
+from gudlift_reservation.storage import SqliteStorage
+from gudlift_reservation.storage.base import consume_token
+
+from .. import TestSetup
+
+
+class TestRateLimit(TestSetup):
+    """
+    Classe de tests du contrôle d'admission des routes de réservation.
+    """
+
+    def limited_app(self, **config):
+        """
+        Crée une application de test avec les limites données.
+        """
+        return create_app(
+            {"TESTING": True, "DATA_DIR": self.data_dir, "STORAGE_BACKEND": "memory", "RATE_LIMIT_ENABLED": True}
+            | config
+        )
+
+    def test_consume_token(self):
+        """
+        Vérifie le calcul du seau à jetons.
+        """
+        assert consume_token(2, 0, rate=1, burst=2, now=0) == (1, 0)
+        assert consume_token(0, 0, rate=2, burst=2, now=0) == (0, 0.5)
+        # les jetons accumulés sont plafonnés à burst
+        assert consume_token(0, 0, rate=1, burst=2, now=100) == (1, 0)
+
+    def test_rate_limited_per_club(self):
+        """
+        Vérifie qu'au-delà de la rafale un club reçoit 429 avec Retry-After,
+        sans limiter les autres clubs ni les routes de lecture.
+        """
+        client = self.limited_app(RATE_LIMIT_PER_SECOND=0.01, RATE_LIMIT_BURST=3).test_client()
+        for _ in range(3):
+            assert client.get("/book/Competition_test/Club_test").status_code == 200
+
+        response = client.get("/book/Competition_test/Club_test")
+        assert response.status_code == 429
+        assert int(response.headers["Retry-After"]) == 100
+
+        form = {"club": "Club_test", "competition": "Competition_test", "places": 1}
+        assert client.post("/purchasePlaces", data=form).status_code == 429
+        assert client.get("/book/Competition_test/Club_test_2").status_code == 200
+        assert client.get("/").status_code == 200
+        assert client.get("/login").status_code == 200
+
+    def test_rate_limited_per_user(self):
+        """
+        Vérifie que les seaux sont distincts par utilisateur de la session.
+        """
+        app = self.limited_app(RATE_LIMIT_PER_SECOND=0.01, RATE_LIMIT_BURST=1)
+        anonymous = app.test_client()
+        logged_in = app.test_client()
+        logged_in.post("/showSummary", data={"email": "club_test@email.fr"})
+
+        assert anonymous.get("/book/Competition_test/Club_test").status_code == 200
+        assert anonymous.get("/book/Competition_test/Club_test").status_code == 429
+        assert logged_in.get("/book/Competition_test/Club_test").status_code == 200
+
+    def test_concurrency_cap(self):
+        """
+        Vérifie qu'une réservation au-delà du nombre de réservations simultanées reçoit 429 immédiatement.
+        """
+        app = self.limited_app(BOOKING_MAX_CONCURRENCY=1)
+        booking_service = app.extensions["gudlft"]["booking_service"]
+        started, release = threading.Event(), threading.Event()
+        purchase_places = booking_service.purchase_places
+
+        def slow_purchase(*args):
+            started.set()
+            release.wait(5)
+            return purchase_places(*args)
+
+        booking_service.purchase_places = slow_purchase
+        form = {"club": "Club_test", "competition": "Competition_test", "places": 1}
+        in_flight = threading.Thread(target=lambda: app.test_client().post("/purchasePlaces", data=form))
+        in_flight.start()
+        try:
+            assert started.wait(5)
+            response = app.test_client().post("/purchasePlaces", data=form)
+            assert response.status_code == 429
+            assert response.headers["Retry-After"] == "1"
+            assert app.test_client().get("/").status_code == 200
+        finally:
+            release.set()
+            in_flight.join()
+
+        assert app.test_client().post("/purchasePlaces", data=form).status_code == 200
+
+    def test_shared_buckets(self):
+        """
+        Vérifie que les seaux du stockage SQLite sont partagés entre les processus
+        et que le mode partagé exige le stockage SQLite.
+        """
+        path = os.path.join(self.data_dir, "limits.sqlite3")
+        first_worker, second_worker = SqliteStorage(path), SqliteStorage(path)
+
+        first_worker.load_clubs()
+        signature = first_worker.signature()
+        assert first_worker.take_token("key", 1, 2, now=1000) == 0
+        assert second_worker.take_token("key", 1, 2, now=1000) == 0
+        # les seaux sont dans une base séparée : les données ne sont pas rechargées
+        assert first_worker.signature() == signature
+        assert first_worker.take_token("key", 1, 2, now=1000) == 1
+        assert second_worker.take_token("key", 1, 2, now=1001) == 0
+
+        # le stockage en mémoire est propre à chaque processus : ses seaux ne sont pas partagés
+        for backend in ("json", "memory"):
+            with pytest.raises(ValueError, match="sqlite"):
+                self.limited_app(STORAGE_BACKEND=backend, RATE_LIMIT_SHARED=True)
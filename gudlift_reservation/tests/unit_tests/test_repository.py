@@ -0,0 +1,178 @@
+import re
+from datetime import datetime
+
+import pytest
+
+from gudlift_reservation import json_handler
+from gudlift_reservation.booking import BookingService
+from gudlift_reservation.json_handler import load_clubs, load_competitions, save_clubs
+from gudlift_reservation.repository import DataRepository
+from gudlift_reservation.storage import JsonStorage
+
+from .. import TestSetup
+
+
+class TestRepository(TestSetup):
+    """
+    Classe de tests du dépôt de données en mémoire.
+    """
+
+    def test_data_loaded_once(self, monkeypatch):
+        """
+        Vérifie que les fichiers JSON ne sont lus qu'une seule fois tant qu'ils ne changent pas.
+        """
+        calls = []
+        load_data = json_handler.load_data
+
+        def counting(file_name, data_dir=None):
+            calls.append(file_name)
+            return load_data(file_name, data_dir)
+
+        monkeypatch.setattr(json_handler, "load_data", counting)
+
+        data_repository = DataRepository(JsonStorage(self.data_dir))
+        for _ in range(5):
+            clubs, competitions = data_repository.get_data()
+
+        assert calls == ["clubs.json", "competitions.json"]
+        assert clubs == self.clubs
+        assert competitions == self.competitions
+
+    def test_reload_when_file_changes(self):
+        """
+        Vérifie que le dépôt recharge un fichier modifié sur le disque.
+        """
+        data_repository = DataRepository(JsonStorage(self.data_dir))
+        clubs, _ = data_repository.get_data()
+        assert clubs[-1]["points"] == 10
+
+        self.clubs[-1]["points"] = 3
+        save_clubs(self.clubs, self.data_dir)
+
+        clubs, _ = data_repository.get_data()
+        assert clubs[-1]["points"] == 3
+
+    def test_save_write_through(self):
+        """
+        Vérifie que les modifications en mémoire sont enregistrées dans les fichiers JSON.
+        """
+        data_repository = DataRepository(JsonStorage(self.data_dir))
+        clubs, _ = data_repository.get_data()
+        clubs[-1]["points"] = 7
+        data_repository.save()
+
+        assert load_clubs(self.data_dir)[-1]["points"] == 7
+        # la sauvegarde ne provoque pas de rechargement
+        assert data_repository.get_data()[0] is clubs
+
+    def test_indexes_follow_data(self):
+        """
+        Vérifie que les index sont construits au chargement et maintenus lors des ajouts.
+        """
+        data_repository = DataRepository(JsonStorage(self.data_dir))
+        data_repository.get_data()
+
+        assert data_repository.get_club_by_email("club_test@email.fr")["name"] == "Club_test"
+        assert data_repository.clubs_by_name["Club_test_2"]["email"] == "club_test_2@email.fr"
+        assert data_repository.competitions_by_name["Competition_test"]["numberOfPlaces"] == 10
+
+        club = {"name": "Club_index", "email": "club_index@email.fr", "points": 4}
+        competition = {"name": "Competition_index", "date": "2030-03-27 10:00:00", "numberOfPlaces": 3}
+        added_club = data_repository.add_club(club)
+        added_competition = data_repository.add_competition(competition)
+
+        # les dict ajoutés sont convertis en enregistrements égaux
+        assert added_club == club
+        assert added_competition == dict(competition, reserved_places=[])
+        assert data_repository.get_club_by_email("club_index@email.fr") is added_club
+        assert data_repository.clubs_by_name["Club_index"] is added_club
+        assert data_repository.competitions_by_name["Competition_index"] is added_competition
+        assert data_repository.get_club_by_email("unknown@email.fr") is None
+
+    def test_competitions_sorted_by_date(self):
+        """
+        Vérifie que les dates sont converties au chargement et que les compétitions
+        à venir et passées sont séparées selon la date courante, y compris après un ajout.
+        """
+        data_repository = DataRepository(JsonStorage(self.data_dir))
+        data_repository.set_competitions(
+            [
+                {"name": "Late", "date": "2031-01-01 10:00:00", "numberOfPlaces": 3},
+                {"name": "Early", "date": "2020-01-01 10:00:00", "numberOfPlaces": 3},
+                {"name": "Middle", "date": "2025-01-01 10:00:00", "numberOfPlaces": 3},
+            ]
+        )
+        now = datetime(2024, 1, 1)
+
+        assert data_repository.competition_dates["Late"] == datetime(2031, 1, 1, 10)
+        assert [c["name"] for c in data_repository.upcoming_competitions(now)] == ["Middle", "Late"]
+        assert [c["name"] for c in data_repository.past_competitions(now)] == ["Early"]
+        assert data_repository.is_past(data_repository.competitions_by_name["Early"], now)
+        assert not data_repository.is_past(data_repository.competitions_by_name["Middle"], now)
+
+        data_repository.add_competition({"name": "Added", "date": "2024-06-01 10:00:00", "numberOfPlaces": 3})
+        assert [c["name"] for c in data_repository.upcoming_competitions(now)] == ["Added", "Middle", "Late"]
+
+    def test_page_cache_after_failed_commit(self, monkeypatch):
+        """
+        Vérifie que la page d'accueil rendue pendant une écriture qui échoue, avec les points déduits,
+        n'est plus servie après l'annulation de la réservation.
+        """
+        pages = []
+
+        def failing_commit(*args, **kwargs):
+            pages.append(self.client.get("/").data)
+            raise OSError("disk full")
+
+        monkeypatch.setattr(self.storage, "commit_bookings", failing_commit)
+        with pytest.raises(OSError):
+            self.client.post(
+                "/purchasePlaces", data={"club": "Club_test", "competition": "Competition_test", "places": 5}
+            )
+        points = re.compile(rb"club_test@email\.fr</br>\s*Number of Points: (\d+)")
+        assert points.search(pages[0]).group(1) == b"10"
+
+        assert self.repository.clubs_by_name["Club_test"]["points"] == 15
+        assert points.search(self.client.get("/").data).group(1) == b"15"
+
+    def test_failed_commit_rolled_back(self, monkeypatch):
+        """
+        Vérifie qu'une réservation dont l'enregistrement échoue est annulée en mémoire
+        et n'est pas enregistrée par la réservation suivante.
+        """
+        data_repository = DataRepository(JsonStorage(self.data_dir))
+        data_repository.refresh()
+        service = BookingService(data_repository)
+        version = data_repository.competition_versions["Competition_test"]
+
+        def failing_save(*args, **kwargs):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(json_handler, "save_data", failing_save)
+        with pytest.raises(OSError):
+            service.purchase_places({"club": "Club_test", "competition": "Competition_test", "places": 6})
+        with pytest.raises(OSError):
+            service.purchase_batch(
+                "Club_test_2",
+                [{"competition": "Competition_test", "places": 1}, {"competition": "Competition_test_2", "places": 2}],
+            )
+
+        club = data_repository.clubs_by_name["Club_test"]
+        competition = data_repository.competitions_by_name["Competition_test"]
+        assert club["points"] == 15
+        assert data_repository.clubs_by_name["Club_test_2"]["points"] == 10
+        assert competition["numberOfPlaces"] == 10
+        assert competition["reserved_places"] == []
+        assert data_repository.ledger.total("Competition_test") == 0
+        # les rendus faits pendant l'écriture échouée ne sont plus servis depuis le cache
+        assert data_repository.competition_versions["Competition_test"] != version
+
+        monkeypatch.undo()
+        assert service.purchase_places({"club": "Club_test", "competition": "Competition_test", "places": 1})[0]
+        clubs = {club["name"]: club for club in load_clubs(self.data_dir)}
+        competitions = {competition["name"]: competition for competition in load_competitions(self.data_dir)}
+        assert clubs["Club_test"]["points"] == 14
+        assert clubs["Club_test_2"]["points"] == 10
+        reserved_places = competitions["Competition_test"]["reserved_places"]
+        assert reserved_places == [{"club_name": "Club_test", "reserved_places": 1}]
+        assert competitions["Competition_test_2"]["numberOfPlaces"] == 15
@@ -1,4 +1,7 @@
+import multiprocessing
+
 import pytest
+from flask import template_rendered
 
 from .. import TestSetup
 
@@ -18,6 +21,65 @@ class TestServerRoutes(TestSetup):
         assert response.status_code == 200
         assert b"Welcome to the GUDLFT Home page !" in response.data
 
+    def test_index_conditional_get(self):
+        """
+        Test des requêtes conditionnelles de la route index "/".
+        Vérifie la réponse 304 tant que les points des clubs ne changent pas,
+        puis une nouvelle page après une réservation.
+        """
+        response = self.client.get("/")
+        etag, _ = response.get_etag()
+        assert etag and response.last_modified is not None
+
+        response = self.client.get("/", headers={"If-None-Match": f'"{etag}"'})
+        assert response.status_code == 304
+        assert response.data == b""
+
+        self.client.post("/purchasePlaces", data={"club": "Club_test", "competition": "Competition_test", "places": 2})
+        response = self.client.get("/", headers={"If-None-Match": f'"{etag}"'})
+        assert response.status_code == 200
+        assert response.get_etag()[0] != etag
+        assert b"Number of Points: 13" in response.data
+
+    def test_etag_differs_in_forked_worker(self):
+        """
+        Test des ETag de la route index "/" dans un worker créé par fork (gunicorn --preload).
+        Vérifie que l'identifiant du dépôt est tiré à nouveau : les versions de chaque worker avancent
+        séparément, un ETag d'un autre worker ne donne pas de réponse 304.
+        """
+        etag, _ = self.client.get("/").get_etag()
+        queue = multiprocessing.get_context("fork").SimpleQueue()
+
+        def child():
+            response = self.client.get("/", headers={"If-None-Match": f'"{etag}"'})
+            queue.put((response.status_code, response.get_etag()[0]))
+
+        process = multiprocessing.get_context("fork").Process(target=child)
+        process.start()
+        process.join()
+        status_code, child_etag = queue.get()
+        assert status_code == 200
+        assert child_etag != etag
+
+    def test_index_page_cache(self):
+        """
+        Test du cache de la page index "/".
+        Vérifie que la page est rendue une seule fois par version des clubs.
+        """
+        renders = []
+
+        def record(sender, template, context, **extra):
+            renders.append(template.name)
+
+        with template_rendered.connected_to(record, self.app):
+            first = self.client.get("/").data
+            assert self.client.get("/").data == first
+            assert renders == ["index.html"]
+
+            self.repository.touch_clubs()
+            self.client.get("/")
+            assert renders == ["index.html", "index.html"]
+
     def test_login_route(self):
         """
         Test de la route "/login".
@@ -50,6 +112,19 @@ class TestServerRoutes(TestSetup):
         assert rv.status_code == 200
         assert expected_value.encode("utf-8") in rv.data
 
+    def test_show_summary_lists_upcoming_competitions(self):
+        """
+        Vérifie que la page welcome n'affiche que les compétitions à venir par défaut,
+        et toutes les compétitions avec show_past.
+        """
+        rv = self.client.post("/showSummary", data={"email": "club_test@email.fr"})
+        assert b"Competition_test" in rv.data
+        assert b"Spring Festival" not in rv.data
+
+        rv = self.client.post("/showSummary", data={"email": "club_test@email.fr", "show_past": "1"})
+        assert b"Competition_test" in rv.data
+        assert b"Spring Festival" in rv.data
+
     @pytest.mark.parametrize(
         "club, competition, expected_value, status_code",
         [
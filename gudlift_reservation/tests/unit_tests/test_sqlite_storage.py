@@ -0,0 +1,94 @@
+import pytest
+
+from gudlift_reservation.booking import BookingService
+from gudlift_reservation.repository import DataRepository
+from gudlift_reservation.storage import JsonStorage, MemoryStorage, SqliteStorage, create_storage
+
+from .. import TestSetup
+
+
+class TestSqliteStorage(TestSetup):
+    """
+    Classe de tests du stockage SQLite et de la migration depuis les fichiers JSON.
+    """
+
+    @pytest.fixture
+    def sqlite_path(self, tmp_path):
+        """
+        Base SQLite de test importée depuis les fichiers JSON avec la commande import-json.
+        """
+        path = str(tmp_path / "gudlft.sqlite3")
+        result = self.app.test_cli_runner().invoke(args=["import-json", "--sqlite-path", path])
+        assert result.exit_code == 0
+        assert f"{len(self.clubs)} club(s) and {len(self.competitions)} competition(s) imported" in result.output
+        return path
+
+    def test_import_json(self, sqlite_path):
+        """
+        Vérifie que la base importée contient les mêmes clubs et compétitions que les fichiers JSON.
+        """
+        storage = SqliteStorage(sqlite_path)
+
+        assert storage.load_clubs() == self.clubs
+        assert storage.load_competitions() == self.competitions
+
+    def test_wal_mode_and_indexes(self, sqlite_path):
+        """
+        Vérifie le mode WAL et l'indexation des colonnes email, nom et date.
+        """
+        connection = SqliteStorage(sqlite_path)._connection()
+
+        assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        indexed = {
+            (table, column)
+            for table in ("clubs", "competitions")
+            for (_, index_name, *_) in connection.execute(f"PRAGMA index_list({table})")
+            for (_, _, column) in connection.execute(f"PRAGMA index_info({index_name})")
+        }
+        assert {("clubs", "email"), ("clubs", "name"), ("competitions", "name"), ("competitions", "date")} <= indexed
+
+    def test_booking_transaction(self, sqlite_path):
+        """
+        Vérifie qu'une réservation met à jour les points, les places et la réservation dans la base,
+        et qu'un autre dépôt sur la même base voit la modification.
+        """
+        repository = DataRepository(SqliteStorage(sqlite_path))
+        other_repository = DataRepository(SqliteStorage(sqlite_path))
+        other_repository.refresh()
+
+        booked, _ = BookingService(repository).purchase_places(
+            {"club": "Club_test", "competition": "Competition_test", "places": 3}
+        )
+        booked, _ = BookingService(repository).purchase_places(
+            {"club": "Club_test", "competition": "Competition_test", "places": 2}
+        )
+        assert booked
+
+        connection = SqliteStorage(sqlite_path)._connection()
+        assert connection.execute("SELECT points FROM clubs WHERE name = 'Club_test'").fetchone() == (10,)
+        assert connection.execute(
+            "SELECT number_of_places FROM competitions WHERE name = 'Competition_test'"
+        ).fetchone() == (5,)
+        assert connection.execute(
+            "SELECT club_name, reserved_places FROM reservations WHERE competition_name = 'Competition_test'"
+        ).fetchall() == [("Club_test", 5)]
+
+        other_repository.refresh()
+        assert other_repository.clubs_by_name["Club_test"]["points"] == 10
+        assert other_repository.ledger.reserved("Competition_test", "Club_test") == 5
+
+    def test_create_storage_from_config(self, tmp_path):
+        """
+        Vérifie la sélection du stockage par la configuration.
+        """
+        assert isinstance(create_storage({"STORAGE_BACKEND": "json"}), JsonStorage)
+
+        storage = create_storage({"STORAGE_BACKEND": "sqlite", "SQLITE_PATH": str(tmp_path / "db.sqlite3")})
+        assert isinstance(storage, SqliteStorage)
+
+        storage = create_storage({"STORAGE_BACKEND": "memory", "DATA_DIR": self.data_dir})
+        assert isinstance(storage, MemoryStorage)
+        assert storage.load_clubs() == self.clubs
+
+        with pytest.raises(ValueError):
+            create_storage({"STORAGE_BACKEND": "xxx"})
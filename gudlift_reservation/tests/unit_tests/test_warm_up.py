@@ -0,0 +1,46 @@
+import os
+
+from gudlift_reservation.server import WARM_UP_TEMPLATES, create_app, warm_up
+
+from .. import TestSetup
+
+
+class TestWarmUp(TestSetup):
+    """
+    Classe de tests du préchauffage de l'application et du cache du bytecode des templates.
+    """
+
+    def test_warm_up_compiles_templates(self):
+        """
+        Vérifie que le préchauffage compile les templates dans le cache du bytecode sans modifier les données.
+        """
+        cache_dir = os.path.join(self.data_dir, "template_cache")
+        clubs = self.storage.load_clubs()
+        competitions = self.storage.load_competitions()
+
+        assert warm_up(self.app) is self.app
+
+        assert len(os.listdir(cache_dir)) >= len(WARM_UP_TEMPLATES)
+        assert self.storage.load_clubs() == clubs
+        assert self.storage.load_competitions() == competitions
+
+    def test_templates_loaded_from_cache(self):
+        """
+        Vérifie qu'une nouvelle application charge les templates depuis le cache du bytecode.
+        """
+        warm_up(self.app)
+        cached_app = create_app({"TESTING": True, "DATA_DIR": self.data_dir, "STORAGE_BACKEND": "memory"})
+        cache = cached_app.jinja_env.bytecode_cache
+        source, file_name, _ = cached_app.jinja_env.loader.get_source(cached_app.jinja_env, "index.html")
+        bucket = cache.get_bucket(cached_app.jinja_env, "index.html", file_name, source)
+
+        assert bucket.code is not None
+
+    def test_template_cache_disabled(self):
+        """
+        Vérifie que le cache du bytecode peut être désactivé.
+        """
+        test_app = create_app(
+            {"TESTING": True, "DATA_DIR": self.data_dir, "STORAGE_BACKEND": "memory", "TEMPLATE_CACHE_ENABLED": False}
+        )
+        assert test_app.jinja_env.bytecode_cache is None
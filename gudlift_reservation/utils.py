@@ -1,16 +1,44 @@
+from collections.abc import Mapping
 from datetime import datetime
 
-from flask import abort, request
+from flask import abort
+
+from .ledger import MAX_PLACES_PER_CLUB
+
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def find_by_name(items, name):
+    """
+    Recherche un élément par son nom.
+    items peut être un index (dict nom -> élément) pour une recherche en temps constant,
+    ou une liste parcourue séquentiellement.
+
+    Renvoie l'élément trouvé ou None.
+    """
+    if isinstance(items, Mapping):
+        return items.get(name)
+    return next((item for item in items if item["name"] == name), None)
+
+
+def parse_date(object_date):
+    """
+    Convertit une date au format "%Y-%m-%d %H:%M:%S" en datetime.
+    Le format est un sous-ensemble d'ISO 8601 : fromisoformat est bien plus rapide que strptime
+    pour convertir les dates de toutes les compétitions au chargement.
+    """
+    return datetime.fromisoformat(object_date)
 
 
 def verif_date_in_past(object_date):
     """
     Vérifie si une date est dans le passé ou non.
+    object_date est une date au format "%Y-%m-%d %H:%M:%S" ou un datetime déjà converti.
 
     Renvoie True si la date est dans le passé.
 
     """
-    date = datetime.strptime(object_date, "%Y-%m-%d %H:%M:%S")
+    date = object_date if isinstance(object_date, datetime) else parse_date(object_date)
     current_date = datetime.now()
     if date < current_date:
         return True
@@ -20,34 +48,37 @@ def verif_date_in_past(object_date):
 def valid_club_and_competition(club_name, clubs, competition_name, competitions):
     """
     Valide si les noms du club et de la competition fournis sont valides.
+    clubs et competitions sont des listes ou des index par nom.
 
     Renvoie le club et la competition trouvés dans la base ou un abort avec une erreur.
     """
 
-    try:
-        found_club = next(c for c in clubs if c["name"] == club_name)
-    except StopIteration:
+    found_club = find_by_name(clubs, club_name)
+    if found_club is None:
         abort(400, "Invalid club")
 
-    try:
-        found_competition = next(c for c in competitions if c["name"] == competition_name)
-    except StopIteration:
+    found_competition = find_by_name(competitions, competition_name)
+    if found_competition is None:
         abort(400, "Invalid competition")
 
     return found_club, found_competition
 
 
-def reserv_places_competition(club, competition, places_required):
+def reserv_places_competition(club, competition, places_required, ledger=None):
     """
     Réserve les places dans une compétition et crée ou complète le champ reserved_places
     Vérifie que le nombre de place réservées par club ne dépasse pas 12
+    Si un registre des réservations est fourni, la vérification se fait sans parcourir reserved_places.
 
     Renvoie True ou False si la reservation ne s'est pas bien passée.
     """
 
-    if places_required > 12:
+    if places_required > MAX_PLACES_PER_CLUB:
         return False
 
+    if ledger is not None:
+        return ledger.reserve(club, competition, places_required)
+
     reserved_places_entry = {
         "club_name": club["name"],
         "reserved_places": places_required,
@@ -55,7 +86,7 @@ def reserv_places_competition(club, competition, places_required):
 
     for entry in competition["reserved_places"]:
         if entry["club_name"] == club["name"]:
-            if entry["reserved_places"] + places_required > 12:
+            if entry["reserved_places"] + places_required > MAX_PLACES_PER_CLUB:
                 return False
             entry["reserved_places"] += places_required
             break
@@ -64,9 +95,11 @@ def reserv_places_competition(club, competition, places_required):
     return True
 
 
-def valid_form_purchase_places(clubs, competitions, form):
+def valid_form_purchase_places(clubs, competitions, form, competition_dates=None):
     """
     Validation du formulaire pour la reservation de places dans une competition.
+    clubs et competitions sont des listes ou des index par nom.
+    competition_dates est un index optionnel des dates déjà converties par nom de compétition.
     Verifie si le club et la competition sont valides.
     Verifie si la date de competition n'est pas passée.
     Verifie si le nombre de places demandées est valide.
@@ -79,12 +112,13 @@ def valid_form_purchase_places(clubs, competitions, form):
     data = {"club": club, "competition": competition, "places_required": 0, "error_message": "", "error_type": "error"}
 
     # Vérifie si la date de la compétition est déjà passée
-    if verif_date_in_past(competition["date"]):
+    competition_date = (competition_dates or {}).get(competition["name"], competition["date"])
+    if verif_date_in_past(competition_date):
         data["error_message"] = "Competition date has already passed"
         return False, data
 
     try:
-        places_required = int(request.form["places"])
+        places_required = int(form["places"])
         if places_required <= 0:
             data["error_message"] = "Number of places required must be positive"
             return False, data
@@ -0,0 +1,5 @@
+from gudlift_reservation import create_app, warm_up
+
+# point d'entrée de production : les données, leurs index et les templates sont chargés
+# avant le fork des workers (gunicorn --preload wsgi:app)
+app = warm_up(create_app())